@@ -0,0 +1,143 @@
+"""Per-request overhead of HttpClient outside of the network.
+
+Run: python -m benchmarks.bench_request_overhead [--n 20000]
+
+``session.request`` is replaced with a stub returning a canned 200 response, so the
+numbers are the framework's own cost per call (retry wrapper, Allure hooks, metrics, URL build).
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import logging
+import time
+import timeit
+from typing import Callable, Iterable, Optional, Type
+
+import requests
+
+from framework.config import RetryConfig, ServiceConfig
+from framework.http_client import HttpClient
+from framework.metrics import inc_retry, path_template
+from framework.retry import RetryableHttpError
+
+logger = logging.getLogger("framework.retry")
+
+
+def _canned_response() -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = b'{"ok": true}'
+    resp.headers["Content-Type"] = "application/json"
+    resp.url = "http://bench.local/anything"
+    return resp
+
+
+def _legacy_retry(
+    *,
+    attempts: int,
+    backoff_s: float,
+    backoff_multiplier: float,
+    retry_on_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+    retry_on_exceptions: tuple[Type[BaseException], ...] = (requests.RequestException, RetryableHttpError),
+) -> Callable:
+    """The retry decorator as it was before RetryPolicy, kept verbatim as the baseline.
+
+    framework.retry.retry now builds a RetryPolicy, so calling it here would measure the new
+    code on both sides.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            delay = backoff_s
+            last_exc: Optional[BaseException] = None
+            for attempt in range(1, attempts + 1):
+                t0 = time.perf_counter()
+                try:
+                    resp = fn(*args, **kwargs)
+
+                    if isinstance(resp, requests.Response) and resp.status_code in set(retry_on_statuses):
+                        try:
+                            body_preview = resp.text
+                        except Exception:
+                            body_preview = "<unreadable>"
+                        raise RetryableHttpError(resp.status_code, resp.url, body_preview)
+
+                    dt_ms = (time.perf_counter() - t0) * 1000
+                    logger.info("Attempt %s/%s succeeded in %.1f ms", attempt, attempts, dt_ms)
+                    return resp
+                except retry_on_exceptions as exc:
+                    dt_ms = (time.perf_counter() - t0) * 1000
+                    last_exc = exc
+                    if attempt >= attempts:
+                        logger.error("Attempt %s/%s failed in %.1f ms (giving up): %s", attempt, attempts, dt_ms, exc)
+                        raise
+                    inc_retry(n=1)
+                    logger.warning(
+                        "Attempt %s/%s failed in %.1f ms: %s | next retry in %.2f s",
+                        attempt,
+                        attempts,
+                        dt_ms,
+                        exc,
+                        delay,
+                    )
+                    time.sleep(delay)
+                    delay *= backoff_multiplier
+            if last_exc:
+                raise last_exc
+            raise RuntimeError("retry wrapper reached unreachable state")
+
+        return wrapper
+
+    return decorator
+
+
+def _legacy_request(client: HttpClient, method: str, path: str, **kwargs) -> requests.Response:
+    """The pre-policy request path: decorator, closure and lazy imports rebuilt per call.
+
+    Each attempt goes through the same ``_send`` as ``client.request`` (attachments, metrics,
+    transport), so the two cases differ only in the retry machinery.
+    """
+    url = f"{client.service.base_url.rstrip('/')}/{path.lstrip('/')}"
+    endpoint = path_template(path)
+
+    @_legacy_retry(
+        attempts=client.retry_cfg.attempts,
+        backoff_s=client.retry_cfg.backoff_s,
+        backoff_multiplier=client.retry_cfg.backoff_multiplier,
+        retry_on_statuses=tuple(client.retry_cfg.retry_on_statuses),
+    )
+    def _do() -> requests.Response:
+        from framework.reporting.allure_helpers import attach_request, attach_response  # noqa: F401
+
+        return client._send(method, url, kwargs, endpoint)
+
+    resp: requests.Response = _do()  # the verbatim decorator is typed as a bare Callable
+    return resp
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=20_000, help="requests per measurement")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    client = HttpClient(
+        service=ServiceConfig(base_url="http://bench.local", timeout_s=1),
+        retry_cfg=RetryConfig(attempts=3, backoff_s=0.4, backoff_multiplier=2.0, retry_on_statuses=[429, 500, 503]),
+    )
+    canned = _canned_response()
+    client.session.request = lambda **_: canned  # type: ignore[method-assign]
+
+    cases = {
+        "legacy (per-call retry decorator)": lambda: _legacy_request(client, "GET", "/anything", params={"a": "1"}),
+        "policy (compiled once per client)": lambda: client.request("GET", "/anything", params={"a": "1"}),
+    }
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=args.n, repeat=args.repeat))
+        print(f"{name:<36} {best / args.n * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
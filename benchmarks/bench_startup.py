@@ -0,0 +1,107 @@
+"""Session startup cost: module import times, load_config() and pytest collection.
+
+Run: python -m benchmarks.bench_startup [--repeat 5] [--json artifacts/startup.json]
+
+Every import is timed in a fresh interpreter (best of ``--repeat``), together with the heavy
+third-party modules it dragged in. ``pytest --collect-only`` is the floor of any targeted
+rerun (``-k``, ``-m smoke``): collection imports conftest and every test module.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import timeit
+from pathlib import Path
+from typing import Dict, List, TypedDict
+
+MODULES = (
+    "framework.config",
+    "framework.http_client",
+    "framework.data_gen",
+    "framework.api.httpbin_api",
+    "tests.conftest",
+)
+HEAVY = ("faker", "pydantic", "httpx", "h2", "zstandard", "pika", "prometheus_client", "allure", "yaml")
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(elapsed, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+class ImportTime(TypedDict):
+    seconds: float
+    loaded: List[str]
+
+
+def _import_time(module: str, repeat: int) -> ImportTime:
+    best, loaded = float("inf"), ""
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", _PROBE.format(module=module, heavy=HEAVY)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        best = min(best, float(out[0]))
+        loaded = out[1] if len(out) > 1 else ""
+    return {"seconds": best, "loaded": loaded.split(",") if loaded else []}
+
+
+def _collect_time(args: List[str], repeat: int) -> float:
+    cmd = [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", *args]
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, capture_output=True, check=False)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _load_config_times(n: int) -> Dict[str, float]:
+    from framework.config import _load_config, load_config
+
+    load_config()
+    return {
+        "parse_us": min(timeit.repeat(lambda: _load_config("config/config.yaml", ".env"), number=n, repeat=3))
+        / n
+        * 1e6,
+        "memoised_us": min(timeit.repeat(load_config, number=n, repeat=3)) / n * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--json", help="write the results here as well")
+    args = parser.parse_args()
+
+    results: Dict[str, object] = {"imports": {}, "collect": {}}
+    print("import (fresh interpreter)            best      heavy modules loaded")
+    for module in MODULES:
+        r = _import_time(module, args.repeat)
+        results["imports"][module] = r  # type: ignore[index]
+        print(f"  {module:<34} {r['seconds'] * 1e3:7.1f} ms  {', '.join(r['loaded']) or '-'}")
+
+    cfg = _load_config_times(200)
+    results["load_config"] = cfg
+    print(f"load_config(): parse {cfg['parse_us']:.0f} us, memoised {cfg['memoised_us']:.1f} us")
+
+    for label, extra in {"all": [], "-m smoke": ["-m", "smoke"]}.items():
+        seconds = _collect_time(extra, max(1, args.repeat // 2))
+        results["collect"][label] = seconds  # type: ignore[index]
+        print(f"pytest --collect-only {label:<10} {seconds:6.2f} s")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Response parsing cost: resp.json() + model_validate vs validate_json on raw bytes.
+
+Run: python -m benchmarks.bench_validation [--n 2000]
+
+Bodies are httpbin /anything echoes with a small (~0.5 KB) and a 256 KB JSON payload,
+parsed from the bytes a requests.Response would hold; no network involved.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+import requests
+
+from framework.models import HttpBinAnythingResponse, validate_json
+
+
+def _anything_body(payload: dict) -> bytes:
+    data = json.dumps(payload)
+    return json.dumps(
+        {
+            "args": {},
+            "data": data,
+            "files": {},
+            "form": {},
+            "headers": {"Content-Type": "application/json", "Host": "httpbin.org", "User-Agent": "bench"},
+            "json": payload,
+            "method": "POST",
+            "origin": "127.0.0.1",
+            "url": "https://httpbin.org/anything",
+        }
+    ).encode()
+
+
+def _response(body: bytes) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.headers["Content-Type"] = "application/json"
+    return resp
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=2000, help="parses per measurement (small body)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bodies = {
+        "small": _anything_body({"name": "Jane", "city": "Oslo", "user_id": 42}),
+        "256KB": _anything_body({"blob": "x" * (128 * 1024)}),
+    }
+    for label, body in bodies.items():
+        resp = _response(body)
+        n = args.n if label == "small" else max(1, args.n // 100)
+        cases = {
+            "model_validate(resp.json())": lambda: HttpBinAnythingResponse.model_validate(resp.json()),
+            "validate_json(resp.content)": lambda: validate_json(HttpBinAnythingResponse, resp.content),
+            "validate_json(..., trusted=True)": lambda: validate_json(HttpBinAnythingResponse, resp.content, trusted=True),
+        }
+        print(f"{label} body ({len(body) / 1024:.1f} KB)")
+        for name, fn in cases.items():
+            best = min(timeit.repeat(fn, number=n, repeat=args.repeat))
+            print(f"  {name:<34} {best / n * 1e6:10.2f} us/parse")
+
+
+if __name__ == "__main__":
+    main()
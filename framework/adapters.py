@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import functools
+import io
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPHeaderDict, HTTPResponse
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from framework.metrics import inc_pool_connection, track_pool_checkout
+
+
+if TYPE_CHECKING:
+    # The mixins are only ever combined with these; tell mypy what super() resolves to.
+    _ConnectionBase = HTTPConnection
+    _PoolBase = HTTPConnectionPool
+else:
+    _ConnectionBase = _PoolBase = object
+
+
+# Seconds spent in connect() (DNS + TCP + TLS) by the current request, if it opened one.
+_CONNECT_S: ContextVar[float] = ContextVar("_CONNECT_S", default=0.0)
+
+
+def pop_connect_time() -> float:
+    """Return and reset the connect time recorded on this thread/task."""
+    value = _CONNECT_S.get()
+    if value:
+        _CONNECT_S.set(0.0)
+    return value
+
+
+class _TimedConnectMixin(_ConnectionBase):
+    def connect(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _CONNECT_S.set(_CONNECT_S.get() + time.perf_counter() - t0)
+
+
+class TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _InstrumentedPoolMixin(_PoolBase):
+    """Counts opened/reused/discarded connections and expires idle keep-alive sockets.
+
+    urllib3 has no idle timeout of its own: a pooled socket is reused however long it
+    sat in the queue, which is exactly when servers/load balancers tend to have closed it.
+    """
+
+    host: str
+
+    def __init__(self, *args, keepalive_idle_s: Optional[float] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.keepalive_idle_s = keepalive_idle_s
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        inc_pool_connection("opened", self.host)
+        return conn
+
+    def _get_conn(self, timeout: Optional[float] = None):
+        conn = super()._get_conn(timeout)
+        track_pool_checkout(self.host, 1)
+
+        last_used = getattr(conn, "_pool_last_used", None)
+        if last_used is None:
+            # Fresh connection from _new_conn (already counted as opened).
+            return conn
+
+        if getattr(conn, "sock", None) is None:
+            # urllib3 reset a dropped socket or the server sent "Connection: close".
+            inc_pool_connection("discarded", self.host, reason="closed")
+            inc_pool_connection("opened", self.host)
+        elif self.keepalive_idle_s is not None and time.monotonic() - last_used > self.keepalive_idle_s:
+            conn.close()
+            inc_pool_connection("discarded", self.host, reason="idle")
+            inc_pool_connection("opened", self.host)
+        else:
+            inc_pool_connection("reused", self.host)
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        track_pool_checkout(self.host, -1)
+        if conn is None:
+            # urlopen releases None after closing a connection on error.
+            inc_pool_connection("discarded", self.host, reason="error")
+        else:
+            conn._pool_last_used = time.monotonic()
+            if self.pool is not None and self.pool.full():
+                inc_pool_connection("discarded", self.host, reason="pool_full")
+        super()._put_conn(conn)
+
+
+class InstrumentedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class InstrumentedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with instrumented, idle-aware connection pools.
+
+    Pool sizing is the stock HTTPAdapter contract: ``pool_connections`` per-host pools,
+    ``pool_maxsize`` keep-alive connections per host, ``pool_block`` to wait for a free
+    connection instead of opening (and later discarding) an extra one.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["keepalive_idle_s"]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keepalive_idle_s: Optional[float] = None,
+        max_retries: int = 0,
+    ) -> None:
+        # Must be set before HTTPAdapter.__init__ calls init_poolmanager().
+        self.keepalive_idle_s = keepalive_idle_s
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs) -> None:
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        # urllib3 only calls these as factories, though its stubs ask for classes.
+        pool_classes: Dict[str, Any] = {
+            "http": functools.partial(InstrumentedHTTPConnectionPool, keepalive_idle_s=self.keepalive_idle_s),
+            "https": functools.partial(InstrumentedHTTPSConnectionPool, keepalive_idle_s=self.keepalive_idle_s),
+        }
+        self.poolmanager.pool_classes_by_scheme = pool_classes
+
+
+@functools.lru_cache(maxsize=None)
+def _response_builder() -> HTTPAdapter:
+    # build_response() needs no pool or connection; this instance never sends anything.
+    return HTTPAdapter()
+
+
+def synthetic_response(
+    adapter: BaseAdapter,
+    request: requests.PreparedRequest,
+    status: int,
+    reason: Optional[str],
+    headers: Iterable[Tuple[str, str]],
+    body: bytes,
+) -> requests.Response:
+    """A response for a body that never crossed the network (cassette replays, cache hits, faults).
+
+    Built by requests' own HTTPAdapter.build_response, so encoding, cookies, ``url`` and a
+    readable ``raw`` behave as for a real response.
+    """
+    header_dict = HTTPHeaderDict(list(headers))
+    header_dict["Content-Length"] = str(len(body))
+    raw = HTTPResponse(
+        body=io.BytesIO(body),
+        headers=header_dict,
+        status=status,
+        reason=reason,
+        preload_content=False,
+        decode_content=False,
+        request_method=request.method,
+    )
+    resp = _response_builder().build_response(request, raw)
+    # Auth handlers re-send through resp.connection: that must be the adapter chain, not the builder.
+    resp.connection = adapter  # type: ignore[assignment]
+    return resp
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from framework.async_http_client import AsyncHttpClient
+from framework.models import (
+    HttpBinAnythingResponse,
+    HttpBinHeadersResponse,
+    HttpBinUuidResponse,
+    validate_json,
+)
+
+
+@dataclass(frozen=True)
+class AsyncHttpBinApi:
+    client: AsyncHttpClient
+    # Skip pydantic validation of responses (load runs against a known-good server).
+    trusted: bool = False
+
+    async def uuid(self) -> HttpBinUuidResponse:
+        r = await self.client.get("/uuid", headers={"Accept": "application/json"})
+        r.raise_for_status()
+        return validate_json(HttpBinUuidResponse, r.content, trusted=self.trusted)
+
+    async def anything_get(
+        self,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        accept: Optional[str] = None,
+    ):
+        hdrs = dict(headers or {})
+        if accept:
+            hdrs["Accept"] = accept
+        return await self.client.get("/anything", params=params, headers=hdrs or None)
+
+    async def anything_post_json(
+        self,
+        payload: Dict[str, Any],
+        *,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> HttpBinAnythingResponse:
+        hdrs = {"Content-Type": "application/json"}
+        if headers:
+            hdrs.update(headers)
+        r = await self.client.post("/anything", json=payload, headers=hdrs)
+        r.raise_for_status()
+        return validate_json(HttpBinAnythingResponse, r.content, trusted=self.trusted)
+
+    async def anything_post_form(self, form: Dict[str, Any]) -> HttpBinAnythingResponse:
+        r = await self.client.post("/anything", data=form)
+        r.raise_for_status()
+        return validate_json(HttpBinAnythingResponse, r.content, trusted=self.trusted)
+
+    async def headers(self) -> HttpBinHeadersResponse:
+        r = await self.client.get("/headers", headers={"Accept": "application/json"})
+        r.raise_for_status()
+        return validate_json(HttpBinHeadersResponse, r.content, trusted=self.trusted)
@@ -1,20 +1,32 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
 
+from framework.batch import BatchResult, map_concurrent
 from framework.http_client import HttpClient
-from framework.models import HttpBinAnythingResponse, HttpBinHeadersResponse, HttpBinUuidResponse
+from framework.models import (
+    HttpBinAnythingResponse,
+    HttpBinHeadersResponse,
+    HttpBinUuidResponse,
+    validate_json,
+)
+from framework.streaming import StreamedBody, consume, iter_json_lines, read_body
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 @dataclass(frozen=True)
 class HttpBinApi:
     client: HttpClient
+    # Skip pydantic validation of responses (load runs against a known-good server).
+    trusted: bool = False
 
     def uuid(self) -> HttpBinUuidResponse:
         r = self.client.get("/uuid", headers={"Accept": "application/json"})
         r.raise_for_status()
-        return HttpBinUuidResponse.model_validate(r.json())
+        return validate_json(HttpBinUuidResponse, r.content, trusted=self.trusted)
 
     def anything_get(
         self,
@@ -39,14 +51,57 @@ class HttpBinApi:
             hdrs.update(headers)
         r = self.client.post("/anything", json=payload, headers=hdrs)
         r.raise_for_status()
-        return HttpBinAnythingResponse.model_validate(r.json())
+        return validate_json(HttpBinAnythingResponse, r.content, trusted=self.trusted)
 
     def anything_post_form(self, form: Dict[str, Any]) -> HttpBinAnythingResponse:
         r = self.client.post("/anything", data=form)
         r.raise_for_status()
-        return HttpBinAnythingResponse.model_validate(r.json())
+        return validate_json(HttpBinAnythingResponse, r.content, trusted=self.trusted)
 
     def headers(self) -> HttpBinHeadersResponse:
         r = self.client.get("/headers", headers={"Accept": "application/json"})
         r.raise_for_status()
-        return HttpBinHeadersResponse.model_validate(r.json())
+        return validate_json(HttpBinHeadersResponse, r.content, trusted=self.trusted)
+
+    def batch(
+        self,
+        call: Callable[["HttpBinApi", T], R],
+        items: Iterable[T],
+        *,
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult[R]]:
+        """``call(self, item)`` for every item on the client's pool, e.g.
+        ``api.batch(HttpBinApi.anything_post_json, payloads)``; see ``HttpClient.request_many``.
+        """
+        return map_concurrent(
+            lambda item: call(self, item),
+            items,
+            concurrency=concurrency or self.client.service.pool_maxsize,
+            ordered=ordered,
+        )
+
+    # Streaming variants: bodies are read in chunks and never held twice in memory.
+
+    def anything_post_json_streamed(
+        self,
+        payload: Dict[str, Any],
+        *,
+        max_bytes: Optional[int] = None,
+    ) -> HttpBinAnythingResponse:
+        hdrs = {"Content-Type": "application/json", "Accept": "application/json"}
+        with self.client.stream("POST", "/anything", json=payload, headers=hdrs) as r:
+            r.raise_for_status()
+            body = read_body(r, max_bytes=max_bytes)
+        return validate_json(HttpBinAnythingResponse, body, trusted=self.trusted)
+
+    def stream_bytes(self, n: int, *, seed: Optional[int] = None, chunk_size: Optional[int] = None) -> StreamedBody:
+        params = {k: v for k, v in {"seed": seed, "chunk_size": chunk_size}.items() if v is not None}
+        with self.client.stream("GET", f"/stream-bytes/{n}", params=params or None) as r:
+            r.raise_for_status()
+            return consume(r)
+
+    def stream_json(self, n: int) -> Iterator[Dict[str, Any]]:
+        with self.client.stream("GET", f"/stream/{n}", headers={"Accept": "application/json"}) as r:
+            r.raise_for_status()
+            yield from iter_json_lines(r)
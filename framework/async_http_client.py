@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+from typing import Any, Dict, Optional
+
+from framework.retry import SYSTEM_CLOCK, Clock, RetryableHttpError, RetryPolicy, get_current_attempt
+from framework.circuit_breaker import get_breaker
+from framework.http2 import check_http_version
+from framework.config import CassetteConfig, CircuitBreakerConfig, RateLimitConfig, RetryConfig, ServiceConfig
+from framework.metrics import observe_http_request, path_template
+from framework.rate_limit import get_limiter
+from framework.reporting.allure_helpers import attach_request, attach_response
+
+try:
+    import httpx
+except Exception:  # pragma: no cover
+    httpx = None  # type: ignore[assignment]
+
+logger = logging.getLogger("framework.async_http_client")
+
+
+@dataclass
+class AsyncHttpClient:
+    """asyncio flavour of :class:`framework.http_client.HttpClient`.
+
+    All requests share one ``httpx.AsyncClient`` whose keep-alive pool is bounded by
+    ``max_connections``; concurrent coroutines queue for a free connection instead of
+    opening a new socket per request.
+    """
+
+    service: ServiceConfig
+    retry_cfg: RetryConfig
+    rate_limit: Optional[RateLimitConfig] = None
+    circuit_breaker: Optional[CircuitBreakerConfig] = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_s: float = 30.0
+    cassette: Optional[CassetteConfig] = None
+    # Time source for retry backoff (a VirtualClock never really sleeps).
+    clock: Clock = SYSTEM_CLOCK
+
+    def __post_init__(self) -> None:
+        if httpx is None:
+            raise RuntimeError("httpx is not installed. Install requirements-async.txt to use AsyncHttpClient.")
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_s,
+        )
+        check_http_version(self.service.http_version)
+        transport: Optional["httpx.AsyncBaseTransport"] = None
+        if self.service.http_version != "1.1" or self.service.request_compression:
+            transport = httpx.AsyncHTTPTransport(
+                limits=limits,
+                http1=self.service.http_version != "h2c",
+                http2=self.service.http_version != "1.1",
+            )
+            if self.service.request_compression:
+                from framework.compression import AsyncCompressingTransport
+
+                transport = AsyncCompressingTransport(
+                    transport, self.service.request_compression, min_bytes=self.service.compression_min_bytes
+                )
+        if self.cassette is not None and self.cassette.mode != "off":
+            from framework.cassette import AsyncCassetteTransport
+
+            transport = AsyncCassetteTransport.from_config(
+                transport or httpx.AsyncHTTPTransport(limits=limits), self.cassette
+            )
+        self.session = httpx.AsyncClient(
+            headers={"User-Agent": "testtaskbs01/0.3"},
+            timeout=self.service.timeout_s,
+            limits=limits,
+            transport=transport,
+        )
+        self._policy = RetryPolicy.from_config(
+            self.retry_cfg, retry_on_exceptions=(httpx.TransportError, RetryableHttpError), clock=self.clock
+        )
+        self._host = urlsplit(self.service.base_url).netloc
+        self._limiter = get_limiter(self._host, self.rate_limit, self.clock) if self.rate_limit else None
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.session.aclose()
+
+    async def request(self, method: str, path: str, **kwargs) -> "httpx.Response":
+        url = f"{self.service.base_url.rstrip('/')}/{path.lstrip('/')}"
+        endpoint = path_template(path)
+        breaker = None
+        if self.circuit_breaker is not None:
+            breaker = get_breaker(self._host, endpoint, self.circuit_breaker, self.clock)
+        return await self._policy.acall(self._send, method, url, kwargs, endpoint, breaker)
+
+    async def _send(
+        self, method: str, url: str, kwargs: Dict[str, Any], endpoint: str, breaker=None
+    ) -> "httpx.Response":
+        # Fails fast (not retryable) instead of spending attempts and backoff on a dead endpoint.
+        probe = breaker.before_call() if breaker is not None else None
+        try:
+            logger.info("HTTP %s %s", method.upper(), url)
+
+            # Allure attachments (best-effort)
+            try:
+                attach_request(
+                    method=method,
+                    url=url,
+                    headers={**self.session.headers, **(kwargs.get("headers") or {})},
+                    params=kwargs.get("params"),
+                    body=kwargs.get("json") if "json" in kwargs else kwargs.get("data"),
+                )
+            except Exception:
+                pass
+
+            if self._limiter is not None:
+                await self._limiter.acquire_async()
+
+            t0 = time.perf_counter()
+            try:
+                resp = await self.session.request(method=method, url=url, **kwargs)
+            except httpx.TransportError:
+                observe_http_request(method, endpoint, None, get_current_attempt(), time.perf_counter() - t0)
+                if breaker is not None:
+                    breaker.record(False)
+                raise
+            observe_http_request(method, endpoint, resp.status_code, get_current_attempt(), time.perf_counter() - t0)
+            if breaker is not None:
+                breaker.record(resp.status_code < 500)
+
+            if self._limiter is not None:
+                self._limiter.on_response(resp.status_code, resp.headers.get("Retry-After"))
+
+            try:
+                attach_response(resp)
+            except Exception:
+                pass
+
+            return resp
+        finally:
+            if breaker is not None:
+                # No-op when the outcome was recorded; otherwise (cassette miss, unserialisable
+                # body, limiter error) a half-open probe slot would leak and pin the circuit.
+                breaker.release(probe)
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> "httpx.Response":
+        return await self.request("GET", path, params=params, **kwargs)
+
+    async def post(
+        self, path: str, json: Optional[Dict[str, Any]] = None, data: Any = None, **kwargs
+    ) -> "httpx.Response":
+        return await self.request("POST", path, json=json, data=data, **kwargs)
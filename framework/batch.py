@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Generic, Iterable, Iterator, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    """One ``HttpClient.request(method, path, **kwargs)`` call of a batch."""
+
+    method: str
+    path: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def get(cls, path: str, **kwargs: Any) -> "RequestSpec":
+        return cls("GET", path, kwargs)
+
+    @classmethod
+    def post(cls, path: str, **kwargs: Any) -> "RequestSpec":
+        return cls("POST", path, kwargs)
+
+
+@dataclass(frozen=True)
+class BatchResult(Generic[T]):
+    """Outcome of one batch item; a failed item carries its exception instead of a value."""
+
+    index: int
+    item: Any
+    value: Optional[T] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> T:
+        if self.error is not None:
+            raise self.error
+        return self.value  # type: ignore[return-value]
+
+
+def _run(fn: Callable[[T], R], index: int, item: T) -> BatchResult[R]:
+    try:
+        return BatchResult(index, item, value=fn(item))
+    except Exception as exc:
+        return BatchResult(index, item, error=exc)
+
+
+def map_concurrent(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    concurrency: int,
+    ordered: bool = True,
+    window: Optional[int] = None,
+) -> Iterator[BatchResult[R]]:
+    """Run ``fn`` over ``items`` on ``concurrency`` threads, yielding a BatchResult per item.
+
+    ``items`` is consumed lazily: at most ``window`` (default ``4 * concurrency``) calls are
+    submitted ahead of the consumer, so a generator of a million specs never materialises.
+    ``ordered=False`` yields results as they complete. Each call runs in a copy of the
+    caller's context, so contextvars (current test name for metrics and Allure, retry
+    attempt) behave as if the call were made inline. Stopping the iteration early cancels
+    calls that have not started.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    window = window or 4 * concurrency
+    source = enumerate(items)
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+
+    def submit() -> Optional[Future]:
+        nxt: Optional[Tuple[int, T]] = next(source, None)
+        if nxt is None:
+            return None
+        # One context copy per call: a Context can only be entered by one thread at a time.
+        ctx = contextvars.copy_context()
+        index, item = nxt
+        return pool.submit(ctx.run, _run, fn, index, item)
+
+    try:
+        if ordered:
+            queue: Deque[Future] = deque()
+            while True:
+                while len(queue) < window:
+                    fut = submit()
+                    if fut is None:
+                        break
+                    queue.append(fut)
+                if not queue:
+                    return
+                yield queue.popleft().result()
+        else:
+            pending: Set[Future] = set()
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < window:
+                    fut = submit()
+                    if fut is None:
+                        exhausted = True
+                    else:
+                        pending.add(fut)
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
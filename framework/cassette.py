@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import random
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from framework.adapters import synthetic_response
+from framework.config import CassetteConfig
+from framework.metrics import inc_cassette
+
+try:
+    import httpx
+except Exception:  # pragma: no cover
+    httpx = None  # type: ignore[assignment]
+
+logger = logging.getLogger("framework.cassette")
+
+CASSETTE_MODES = ("off", "record", "replay", "verify")
+
+# Request headers that change what httpbin answers (``/html`` vs ``/json`` under one path,
+# compressed or not), so they are part of the key; trace ids and user agents are not.
+KEY_HEADERS: Tuple[str, ...] = ("accept", "accept-encoding", "content-type")
+
+# Recorded bodies are stored decoded, so transfer-level headers no longer apply on replay.
+_DROP_RESPONSE_HEADERS = frozenset({"content-encoding", "transfer-encoding", "content-length", "date", "set-cookie"})
+
+
+class CassetteMissError(Exception):
+    """Replay found no recording for the request (re-record with CASSETTE_MODE=record)."""
+
+    def __init__(self, method: str, url: str, key: str) -> None:
+        super().__init__(f"No cassette recording for {method} {url} (key {key})")
+        self.method = method
+        self.url = url
+        self.key = key
+
+
+class CassetteMismatchError(AssertionError):
+    """Verify mode: the live service no longer answers the way the cassette says it does."""
+
+
+def _canonical_body(body: Any) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, (bytes, bytearray)):
+        # Streaming uploads (generators, files) can't be keyed by content.
+        return b"<stream>"
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        return bytes(body)
+
+
+def _keyed_headers(headers: Optional[Mapping[str, str]], names: Iterable[str]) -> List[List[str]]:
+    present = {k.lower(): v for k, v in (headers or {}).items()}
+    keyed = []
+    for name in sorted({n.lower() for n in names}):
+        if name in present:
+            # Header values are lists: "gzip, deflate" and "deflate,gzip" ask for the same thing.
+            items = sorted(item.strip().lower() for item in present[name].split(",") if item.strip())
+            keyed.append([name, ",".join(items)])
+    return keyed
+
+
+def request_key(
+    method: str,
+    url: str,
+    body: Any = None,
+    headers: Optional[Mapping[str, str]] = None,
+    key_headers: Iterable[str] = KEY_HEADERS,
+) -> str:
+    """Stable key for a request: method, path, sorted query, ``key_headers`` and (canonical JSON) body.
+
+    The scheme and host are left out so a cassette recorded against one httpbin serves
+    runs against another (local container vs httpbin.org).
+    """
+    parts = urlsplit(url)
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    body_hash = hashlib.sha256(_canonical_body(body)).hexdigest()
+    material = json.dumps([method.upper(), parts.path or "/", query, _keyed_headers(headers, key_headers), body_hash])
+    return hashlib.sha256(material.encode()).hexdigest()[:32]
+
+
+class CassetteStore:
+    """One JSON file per request key (``<root>/<k[:2]>/<key>.json``): lookup is a path join.
+
+    A file holds every response recorded for that key in order, so repeated identical
+    requests (``/uuid``) replay the same sequence they were recorded with.
+    """
+
+    META_FILE = "cassette.json"
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, List[Dict[str, Any]]] = {}
+        self._reset: set = set()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def responses(self, key: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            if key not in self._loaded:
+                path = self._path(key)
+                self._loaded[key] = json.loads(path.read_text("utf-8"))["responses"] if path.exists() else []
+            return self._loaded[key]
+
+    def append(self, key: str, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """Add a response; the first append of a run replaces what an older recording had."""
+        with self._lock:
+            if key not in self._reset:
+                self._reset.add(key)
+                self._loaded[key] = []
+            self._loaded[key].append(response)
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            doc = {"request": request, "responses": self._loaded[key]}
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(doc, indent=1, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+
+    def read_meta(self) -> Dict[str, Any]:
+        path = self.root / self.META_FILE
+        return json.loads(path.read_text("utf-8")) if path.exists() else {}
+
+    def write_meta(self, **values: Any) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta = {**self.read_meta(), **values}
+        (self.root / self.META_FILE).write_text(json.dumps(meta, indent=1, sort_keys=True), encoding="utf-8")
+
+
+def _encode_body(body: bytes) -> Dict[str, str]:
+    try:
+        return {"body": body.decode("utf-8"), "body_encoding": "utf-8"}
+    except UnicodeDecodeError:
+        return {"body": base64.b64encode(body).decode("ascii"), "body_encoding": "base64"}
+
+
+def _decode_body(record: Dict[str, Any]) -> bytes:
+    if record.get("body_encoding") == "base64":
+        return base64.b64decode(record["body"])
+    text: str = record["body"]
+    return text.encode("utf-8")
+
+
+def _json_shape(content_type: str, body: bytes) -> Optional[List[str]]:
+    if "json" not in content_type:
+        return None
+    try:
+        doc = json.loads(body)
+    except ValueError:
+        return None
+    return sorted(doc) if isinstance(doc, dict) else None
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(";")[0].strip()
+
+
+class _Player:
+    """Record/replay state shared by the requests adapter and the httpx transport."""
+
+    def __init__(
+        self,
+        store: CassetteStore,
+        mode: str,
+        verify_ratio: float,
+        rng: Optional[random.Random],
+        key_headers: Sequence[str],
+    ) -> None:
+        if mode not in CASSETTE_MODES or mode == "off":
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {CASSETTE_MODES[1:]}")
+        self.store = store
+        self.mode = mode
+        self.verify_ratio = verify_ratio
+        self.key_headers = tuple(key_headers)
+        # Own RNG: sampling must not consume the seeded global stream used for test data.
+        self._rng = rng or random.Random()
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def key(self, method: str, url: str, body: Any, headers: Mapping[str, str]) -> str:
+        return request_key(method, url, body, headers, self.key_headers)
+
+    def record(self, key: str, method: str, url: str, status: int, reason: str, headers, body: bytes) -> None:
+        kept = [[k, v] for k, v in headers if k.lower() not in _DROP_RESPONSE_HEADERS]
+        response = {"status": status, "reason": reason, "headers": kept, **_encode_body(body)}
+        self.store.append(key, {"method": method, "url": url}, response)
+        inc_cassette(self.mode, "recorded")
+
+    def next_recorded(self, key: str, method: str, url: str) -> Dict[str, Any]:
+        responses = self.store.responses(key)
+        if not responses:
+            inc_cassette(self.mode, "miss")
+            raise CassetteMissError(method, url, key)
+        with self._lock:
+            recorded = responses[self._cursor[key] % len(responses)]
+            self._cursor[key] += 1
+        return recorded
+
+    def should_verify(self) -> bool:
+        return self.mode == "verify" and self._rng.random() < self.verify_ratio
+
+    def verify(
+        self,
+        recorded: Dict[str, Any],
+        key: str,
+        method: str,
+        url: str,
+        status: int,
+        content_type: str,
+        body: bytes,
+    ) -> None:
+        problem = None
+        rec_type = _media_type({k.lower(): v for k, v in recorded["headers"]}.get("content-type", ""))
+        live_type = _media_type(content_type)
+        if recorded["status"] != status:
+            problem = f"status {recorded['status']} recorded, {status} live"
+        elif rec_type != live_type:
+            problem = f"content type {rec_type!r} recorded, {live_type!r} live"
+        else:
+            rec_shape, live_shape = _json_shape(rec_type, _decode_body(recorded)), _json_shape(live_type, body)
+            if rec_shape != live_shape:
+                problem = f"JSON keys {rec_shape} recorded, {live_shape} live"
+        if problem:
+            inc_cassette(self.mode, "mismatch")
+            raise CassetteMismatchError(f"{method} {url}: {problem} (key {key})")
+        inc_cassette(self.mode, "verified")
+
+
+class CassetteAdapter(BaseAdapter):
+    """Transport that records to / replays from a CassetteStore instead of (or besides) the network.
+
+    - record: send through ``inner`` and store the response
+    - replay: answer from the store only; a missing recording raises CassetteMissError
+    - verify: replay, but re-send ``verify_ratio`` of requests live and raise
+      CassetteMismatchError when status, content type or top-level JSON keys drifted
+    """
+
+    def __init__(
+        self,
+        inner: BaseAdapter,
+        store: CassetteStore,
+        mode: str,
+        *,
+        verify_ratio: float = 0.1,
+        rng: Optional[random.Random] = None,
+        key_headers: Sequence[str] = KEY_HEADERS,
+    ) -> None:
+        super().__init__()
+        self.inner = inner
+        self.player = _Player(store, mode, verify_ratio, rng, key_headers)
+
+    @classmethod
+    def from_config(cls, inner: BaseAdapter, cfg: CassetteConfig) -> "CassetteAdapter":
+        return cls(
+            inner, CassetteStore(cfg.dir), cfg.mode, verify_ratio=cfg.verify_ratio, key_headers=cfg.key_headers
+        )
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = self.player.key(request.method, request.url, request.body, request.headers)
+        send_kwargs = dict(stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        if self.player.mode == "record":
+            resp = self.inner.send(request, **send_kwargs)
+            self.player.record(
+                key, request.method, request.url, resp.status_code, resp.reason, resp.headers.items(), resp.content
+            )
+            return resp
+
+        recorded = self.player.next_recorded(key, request.method, request.url)
+        if self.player.should_verify():
+            live = self.inner.send(request, **{**send_kwargs, "stream": False})
+            try:
+                content_type = live.headers.get("Content-Type", "")
+                self.player.verify(
+                    recorded, key, request.method, request.url, live.status_code, content_type, live.content
+                )
+            finally:
+                live.close()
+        inc_cassette(self.player.mode, "hit")
+        return self._build_response(request, recorded)
+
+    def _build_response(self, request, recorded: Dict[str, Any]) -> requests.Response:
+        return synthetic_response(
+            self, request, recorded["status"], recorded.get("reason"), recorded["headers"], _decode_body(recorded)
+        )
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+if httpx is not None:
+
+    class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+        """httpx counterpart of CassetteAdapter for AsyncHttpClient; same store and keys."""
+
+        def __init__(
+            self,
+            inner: "httpx.AsyncBaseTransport",
+            store: CassetteStore,
+            mode: str,
+            *,
+            verify_ratio: float = 0.1,
+            rng: Optional[random.Random] = None,
+            key_headers: Sequence[str] = KEY_HEADERS,
+        ) -> None:
+            self.inner = inner
+            self.player = _Player(store, mode, verify_ratio, rng, key_headers)
+
+        @classmethod
+        def from_config(cls, inner: "httpx.AsyncBaseTransport", cfg: CassetteConfig) -> "AsyncCassetteTransport":
+            return cls(
+                inner, CassetteStore(cfg.dir), cfg.mode, verify_ratio=cfg.verify_ratio, key_headers=cfg.key_headers
+            )
+
+        async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+            body = await request.aread()
+            method, url = request.method, str(request.url)
+            key = self.player.key(method, url, body, request.headers)
+
+            if self.player.mode == "record":
+                resp = await self.inner.handle_async_request(request)
+                content = await resp.aread()
+                self.player.record(key, method, url, resp.status_code, resp.reason_phrase, resp.headers.items(), content)
+                return resp
+
+            recorded = self.player.next_recorded(key, method, url)
+            if self.player.should_verify():
+                live = await self.inner.handle_async_request(request)
+                try:
+                    content = await live.aread()
+                    self.player.verify(
+                        recorded, key, method, url, live.status_code, live.headers.get("Content-Type", ""), content
+                    )
+                finally:
+                    await live.aclose()
+            inc_cassette(self.player.mode, "hit")
+            return httpx.Response(
+                recorded["status"],
+                headers=recorded["headers"],
+                content=_decode_body(recorded),
+                request=request,
+            )
+
+        async def aclose(self) -> None:
+            await self.inner.aclose()
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from framework.clock import SYSTEM_CLOCK, Clock
+from framework.config import CircuitBreakerConfig
+from framework.metrics import observe_circuit_transition
+
+logger = logging.getLogger("framework.circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the endpoint's circuit is open."""
+
+    def __init__(self, host: str, endpoint: str, retry_in_s: float) -> None:
+        super().__init__(f"Circuit open for {host}{endpoint}; next probe in {retry_in_s:.1f} s")
+        self.host = host
+        self.endpoint = endpoint
+        self.retry_in_s = retry_in_s
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a sliding window of the last ``window_size`` calls.
+
+    - closed: calls pass; once ``min_calls`` are recorded and the failure rate reaches
+      ``failure_rate_threshold`` the circuit opens
+    - open: calls fail fast with CircuitOpenError for ``open_duration_s``
+    - half_open: up to ``half_open_max_calls`` probes pass; one success closes the circuit,
+      one failure re-opens it
+
+    ``before_call`` returns a probe token in half-open state. A probe that ends without an
+    outcome (the request was never answered, e.g. a cassette miss or an unserialisable body)
+    must hand it back with ``release`` or the circuit would stay half-open for good.
+    ``open_duration_s`` is measured on ``clock``.
+    """
+
+    def __init__(
+        self, host: str, endpoint: str, cfg: CircuitBreakerConfig, clock: Clock = SYSTEM_CLOCK
+    ) -> None:
+        self.host = host
+        self.endpoint = endpoint
+        self.cfg = cfg
+        self.clock = clock
+        self.state = CLOSED
+        self._window: Deque[bool] = deque(maxlen=cfg.window_size)
+        self._opened_at = 0.0
+        self._probes = 0
+        # Bumped on every transition, so a stale probe token can't release a newer probe's slot.
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, to_state: str) -> None:
+        from_state, self.state = self.state, to_state
+        if to_state == OPEN:
+            self._opened_at = self.clock.now()
+        self._probes = 0
+        self._generation += 1
+        self._window.clear()
+        logger.warning("Circuit %s%s: %s -> %s", self.host, self.endpoint, from_state, to_state)
+        observe_circuit_transition(self.host, self.endpoint, from_state, to_state)
+
+    def before_call(self) -> Optional[int]:
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._opened_at + self.cfg.open_duration_s - self.clock.now()
+                if remaining > 0:
+                    raise CircuitOpenError(self.host, self.endpoint, remaining)
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probes >= self.cfg.half_open_max_calls:
+                    raise CircuitOpenError(self.host, self.endpoint, 0.0)
+                self._probes += 1
+                return self._generation
+            return None
+
+    def release(self, probe: Optional[int]) -> None:
+        """Give back a probe slot that was never recorded; a no-op once ``record`` moved the circuit on."""
+        if probe is None:
+            return
+        with self._lock:
+            if self.state == HALF_OPEN and self._generation == probe and self._probes > 0:
+                self._probes -= 1
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._transition(CLOSED if success else OPEN)
+                return
+            if self.state == OPEN:
+                return
+            self._window.append(success)
+            if len(self._window) < self.cfg.min_calls:
+                return
+            failures = self._window.count(False)
+            if failures / len(self._window) >= self.cfg.failure_rate_threshold:
+                self._transition(OPEN)
+
+
+# (host, endpoint, breaker settings, id(clock)): clients configured differently never share state.
+_BreakerKey = Tuple[str, str, float, int, int, float, int, int]
+_BREAKERS: Dict[_BreakerKey, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(
+    host: str, endpoint: str, cfg: CircuitBreakerConfig, clock: Clock = SYSTEM_CLOCK
+) -> Optional[CircuitBreaker]:
+    """Process-wide breaker for (host, path template); shared by every client with the same
+    thresholds, window and open duration on the same ``clock``.
+
+    Endpoints in ``cfg.exclude_paths`` get none: on /status/{n} the caller picks the status,
+    so a test asking for 500 on purpose must not open the circuit for one asking for 200.
+    A client on a VirtualClock gets its own breaker: virtual time must not reopen real circuits.
+    """
+    if not cfg.enabled or endpoint in cfg.exclude_paths:
+        return None
+    key = (
+        host,
+        endpoint,
+        cfg.failure_rate_threshold,
+        cfg.min_calls,
+        cfg.window_size,
+        cfg.open_duration_s,
+        cfg.half_open_max_calls,
+        id(clock),
+    )
+    breaker = _BREAKERS.get(key)
+    if breaker is None:
+        with _BREAKERS_LOCK:
+            breaker = _BREAKERS.setdefault(key, CircuitBreaker(host, endpoint, cfg, clock))
+    return breaker
+
+
+def reset_breakers() -> None:
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
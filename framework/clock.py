@@ -0,0 +1,68 @@
+"""Injectable time source shared by retry backoff, rate limiting and fault injection."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import List, Protocol
+
+
+class Clock(Protocol):
+    """Time source and sleeper for retry backoff, budgets and rate limiting."""
+
+    def now(self) -> float: ...
+
+    def sleep(self, seconds: float) -> None: ...
+
+    async def asleep(self, seconds: float) -> None: ...
+
+
+class SystemClock:
+    """``time.perf_counter`` plus real ``time.sleep`` / ``asyncio.sleep``."""
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    async def asleep(self, seconds: float) -> None:
+        # asyncio.sleep keeps other in-flight requests running during backoff.
+        await asyncio.sleep(seconds)
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class VirtualClock:
+    """Clock whose sleeps return at once and only move ``now()`` forward.
+
+    Backoff, retry budgets and injected latency (framework.fault_injection) all read it, so
+    a resilience test exercises the real retry path in milliseconds. ``sleeps`` records
+    every sleep in order.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = start
+        self._lock = threading.Lock()
+        self.sleeps: List[float] = []
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        with self._lock:
+            self._now += seconds
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.sleeps.append(seconds)
+            self._now += seconds
+
+    async def asleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+        await asyncio.sleep(0)  # still yield, like a real sleep would
+
+    @property
+    def slept(self) -> float:
+        return sum(self.sleeps)
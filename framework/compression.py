@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gzip
+import logging
+from typing import Mapping
+
+from requests.adapters import BaseAdapter
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import httpx
+except Exception:  # pragma: no cover
+    httpx = None  # type: ignore[assignment]
+
+logger = logging.getLogger("framework.compression")
+
+REQUEST_ENCODINGS = ("gzip", "zstd")
+
+
+def check_encoding(encoding: str) -> None:
+    """Fail at client construction, not on the first large request body."""
+    if encoding not in REQUEST_ENCODINGS:
+        raise ValueError(f"Unknown request compression {encoding!r}; expected one of {REQUEST_ENCODINGS}")
+    if encoding == "zstd" and zstandard is None:
+        raise RuntimeError("zstandard is not installed. Install requirements-async.txt to use zstd compression.")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0: identical payloads compress to identical bytes (cassette keys, cache keys).
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == "zstd":
+        # Compressor objects are not thread-safe; one per body is cheap next to the network call.
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    raise ValueError(f"Unknown request compression {encoding!r}")
+
+
+def _should_compress(body, headers: Mapping[str, str], min_bytes: int) -> bool:
+    # Streams and generators keep their framing; already-encoded bodies are left alone.
+    return isinstance(body, (bytes, bytearray)) and len(body) >= min_bytes and "Content-Encoding" not in headers
+
+
+class CompressingAdapter(BaseAdapter):
+    """Compresses request bodies of at least ``min_bytes`` before ``inner`` sends them.
+
+    Sits directly on the transport, so cassettes, faults and the response cache above it
+    see (and key on) the plain body. The server must accept ``Content-Encoding`` on
+    requests: httpbin.org does not inflate them, framework.local_httpbin does.
+    """
+
+    def __init__(self, inner: BaseAdapter, encoding: str, *, min_bytes: int = 1024) -> None:
+        super().__init__()
+        check_encoding(encoding)
+        self.inner = inner
+        self.encoding = encoding
+        self.min_bytes = min_bytes
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        if _should_compress(body, request.headers, self.min_bytes):
+            compressed = compress(bytes(body), self.encoding)
+            logger.debug("Compressed %s body %d -> %d bytes", self.encoding, len(body), len(compressed))
+            request = request.copy()
+            request.body = compressed
+            request.headers["Content-Encoding"] = self.encoding
+            request.headers["Content-Length"] = str(len(compressed))
+        return self.inner.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+if httpx is not None:
+
+    class AsyncCompressingTransport(httpx.AsyncBaseTransport):
+        """httpx counterpart of CompressingAdapter for AsyncHttpClient."""
+
+        def __init__(self, inner: "httpx.AsyncBaseTransport", encoding: str, *, min_bytes: int = 1024) -> None:
+            check_encoding(encoding)
+            self.inner = inner
+            self.encoding = encoding
+            self.min_bytes = min_bytes
+
+        async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+            body = await request.aread()
+            if _should_compress(body, request.headers, self.min_bytes):
+                compressed = compress(body, self.encoding)
+                headers = request.headers.copy()
+                headers["Content-Encoding"] = self.encoding
+                headers["Content-Length"] = str(len(compressed))
+                request = httpx.Request(
+                    request.method, request.url, headers=headers, content=compressed, extensions=request.extensions
+                )
+            return await self.inner.handle_async_request(request)
+
+        async def aclose(self) -> None:
+            await self.inner.aclose()
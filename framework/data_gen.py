@@ -1,17 +1,70 @@
 from __future__ import annotations
 
 import random
+import re
 import string
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Sequence, Tuple
 
-from faker import Faker
+from framework.dataset_cache import DatasetCache
 
-fake = Faker()
+if TYPE_CHECKING:
+    from faker import Faker
+
+# Importing Faker (it loads every locale's providers) costs ~0.1 s: done on first use, so
+# collecting or running tests that never generate data does not pay for it.
+_fake: Optional["Faker"] = None
+_fake_seed: Optional[int] = None
+_fake_lock = threading.Lock()
+
+
+def get_fake() -> "Faker":
+    """The shared Faker instance (``data_gen.fake``), created and seeded on first use."""
+    global _fake
+    if _fake is None:
+        with _fake_lock:
+            if _fake is None:
+                from faker import Faker
+
+                instance = Faker()
+                if _fake_seed is not None:
+                    instance.seed_instance(_fake_seed)
+                _fake = instance
+    return _fake
+
+
+def seed_fake(seed: int) -> None:
+    """Seed the shared Faker instance now, or when it is first created."""
+    global _fake_seed
+    with _fake_lock:
+        _fake_seed = seed
+        if _fake is not None:
+            _fake.seed_instance(seed)
+
+
+def __getattr__(name: str) -> Any:
+    if name == "fake":
+        return get_fake()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+ALPHABET = string.ascii_letters + string.digits
+
+# Bump whenever a bulk generator's output changes for the same seed: it is part of the
+# dataset cache key, so stale cached datasets stop matching.
+GENERATOR_VERSION = 1
+
+# Distinct Faker values drawn per pool; bulk payloads sample from these instead of calling
+# Faker per field per user.
+POOL_SIZE = 2048
 
 
 def rand_string(min_len: int = 5, max_len: int = 15) -> str:
     n = random.randint(min_len, max_len)
-    return "".join(random.choice(string.ascii_letters + string.digits) for _ in range(n))
+    return "".join(random.choices(ALPHABET, k=n))
 
 
 def rand_int(min_v: int = 0, max_v: int = 10_000) -> int:
@@ -31,8 +84,127 @@ class UserPayload:
 
 def make_user_payload() -> UserPayload:
     return UserPayload(
-        name=fake.name(),
-        email=fake.email(),
-        city=fake.city(),
+        name=get_fake().name(),
+        email=get_fake().email(),
+        city=get_fake().city(),
         user_id=rand_int(1, 10_000_000),
     )
+
+
+# --- Bulk generation -------------------------------------------------------------------
+#
+# Batch helpers take an explicit ``seed``; without one they draw it from the global
+# ``random`` stream, which the ``test_seed`` fixture seeds from TEST_SEED, so a run is
+# reproducible either way. Each batch uses its own Random/Faker instance and leaves the
+# global streams (and ``fake``) untouched apart from that one draw.
+
+
+def _resolve_seed(seed: Optional[int]) -> int:
+    return seed if seed is not None else random.getrandbits(64)
+
+
+def _iter_strings(rng: random.Random, min_len: int, max_len: int, batch_size: int) -> Iterator[str]:
+    while True:
+        lengths = [rng.randint(min_len, max_len) for _ in range(batch_size)]
+        # One choices() call for the whole batch, then slice: no per-character Python call.
+        chars = "".join(rng.choices(ALPHABET, k=sum(lengths)))
+        pos = 0
+        for n in lengths:
+            yield chars[pos : pos + n]
+            pos += n
+
+
+def iter_rand_strings(
+    min_len: int = 5,
+    max_len: int = 15,
+    *,
+    seed: Optional[int] = None,
+    batch_size: int = 4096,
+) -> Iterator[str]:
+    """Endless stream of random alphanumeric strings, generated ``batch_size`` at a time."""
+    return _iter_strings(random.Random(_resolve_seed(seed)), min_len, max_len, batch_size)
+
+
+def rand_strings(n: int, min_len: int = 5, max_len: int = 15, *, seed: Optional[int] = None) -> List[str]:
+    """``n`` random strings; the same (n, seed) always gives the same list."""
+    return list(islice(iter_rand_strings(min_len, max_len, seed=seed, batch_size=max(1, min(n, 4096))), n))
+
+
+@lru_cache(maxsize=8)
+def _faker_pools(seed: int, size: int) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """(names, cities, email domains) drawn once per seed from a dedicated Faker instance."""
+    from faker import Faker
+
+    pool_fake = Faker()
+    pool_fake.seed_instance(seed)
+    names = tuple(pool_fake.name() for _ in range(size))
+    cities = tuple(pool_fake.city() for _ in range(size))
+    domains = tuple(pool_fake.free_email_domain() for _ in range(max(1, size // 64)))
+    return names, cities, domains
+
+
+_NON_LOCAL_PART = re.compile(r"[^a-z0-9]+")
+
+
+def iter_user_payloads(
+    n: Optional[int] = None,
+    *,
+    seed: Optional[int] = None,
+    pool_size: int = POOL_SIZE,
+    batch_size: int = 4096,
+) -> Iterator[UserPayload]:
+    """Lazily yield ``n`` payloads (endless when ``n`` is None); memory stays O(batch_size).
+
+    Names and cities are sampled from per-seed Faker pools; emails are built from the
+    sampled name plus the user id, so they stay unique-looking without another Faker call.
+    """
+    seed = _resolve_seed(seed)
+    rng = random.Random(seed)
+    names, cities, domains = _faker_pools(seed, pool_size)
+    produced = 0
+    while n is None or produced < n:
+        k = batch_size if n is None else min(batch_size, n - produced)
+        batch_names = rng.choices(names, k=k)
+        batch_cities = rng.choices(cities, k=k)
+        batch_domains = rng.choices(domains, k=k)
+        for name, city, domain in zip(batch_names, batch_cities, batch_domains):
+            user_id = rng.randint(1, 10_000_000)
+            local = _NON_LOCAL_PART.sub(".", name.lower()).strip(".")
+            yield UserPayload(name=name, email=f"{local}{user_id}@{domain}", city=city, user_id=user_id)
+        produced += k
+
+
+def make_user_payloads(n: int, *, seed: Optional[int] = None, pool_size: int = POOL_SIZE) -> List[UserPayload]:
+    """``n`` payloads; the same (n, seed) always gives the same list.
+
+    Small batches shrink the Faker pools to ``n`` (building a full pool costs far more than
+    a handful of payloads), so different ``n`` are not prefixes of each other.
+    """
+    return list(iter_user_payloads(n, seed=seed, pool_size=min(pool_size, max(1, n))))
+
+
+def cached_user_payloads(
+    n: int,
+    *,
+    seed: Optional[int] = None,
+    cache: Optional[DatasetCache] = None,
+) -> Sequence[UserPayload]:
+    """``make_user_payloads(n, seed=...)``, persisted in ``cache`` and memory-mapped on reuse.
+
+    The key covers the seed, ``n``, ``GENERATOR_VERSION``, the Faker version and the
+    UserPayload schema. Without a cache this is plain generation.
+    """
+    seed = _resolve_seed(seed)
+    if cache is None:
+        return make_user_payloads(n, seed=seed)
+    from faker import VERSION as faker_version
+
+    return cache.get_or_create(
+        "user_payloads",
+        UserPayload,
+        lambda: iter_user_payloads(n, seed=seed, pool_size=min(POOL_SIZE, max(1, n))),
+        seed=seed,
+        n=n,
+        version=GENERATOR_VERSION,
+        faker=faker_version,
+    )
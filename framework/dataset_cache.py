@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    overload,
+)
+
+logger = logging.getLogger("framework.dataset_cache")
+
+T = TypeVar("T")
+
+_MAGIC = b"QADSET01"
+_ALIGN = 8
+_SUFFIX = ".qads"
+# Column kinds: fixed-width int64, or UTF-8 blob + int64 end offsets.
+_KINDS = {int: "i64", str: "utf8"}
+
+
+def _pad(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def record_schema(record_type: type) -> List[List[str]]:
+    """``[[field, kind], ...]`` of a flat dataclass with int/str fields; part of the cache key."""
+    schema = []
+    for f in dataclasses.fields(record_type):
+        tp = f.type if isinstance(f.type, type) else {"int": int, "str": str}.get(str(f.type))
+        if tp not in _KINDS:
+            raise TypeError(f"{record_type.__name__}.{f.name}: only int and str fields can be cached, got {f.type!r}")
+        schema.append([f.name, _KINDS[tp]])
+    return schema
+
+
+class Dataset(Sequence[T], Generic[T]):
+    """Read-only rows over a memory-mapped columnar file.
+
+    Opening maps the file without reading it; int columns are ``memoryview`` casts of the
+    mapping and strings are decoded only when a row is accessed, so load time does not
+    grow with the dataset size.
+    """
+
+    def __init__(self, path: Path, record_type: Type[T]) -> None:
+        self.path = path
+        self.record_type = record_type
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _view(self, offset: int, length: int, fmt: Optional[Literal["q"]] = None) -> memoryview:
+        view = self._buf[offset : offset + length]
+        if fmt is not None:
+            view = view.cast(fmt)
+        self._views.append(view)
+        return view
+
+    def _open(self) -> None:
+        self._buf = memoryview(self._mm)
+        if bytes(self._buf[: len(_MAGIC)]) != _MAGIC:
+            raise ValueError(f"{self.path} is not a dataset file")
+        (header_len,) = struct.unpack_from("<I", self._buf, len(_MAGIC))
+        start = len(_MAGIC) + 4
+        self.header: Dict[str, Any] = json.loads(bytes(self._buf[start : start + header_len]))
+        base = _pad(start + header_len)
+        if self.header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{self.path} was written on a {self.header['byteorder']}-endian machine")
+        if self.header["schema"] != record_schema(self.record_type):
+            raise ValueError(f"{self.path} does not match the {self.record_type.__name__} schema")
+        self._rows = int(self.header["rows"])
+        self._columns: List[Any] = []
+        for col in self.header["columns"]:
+            if col["kind"] == "i64":
+                self._columns.append(("i64", self._view(base + col["offset"], 8 * self._rows, "q"), None))
+            else:
+                ends = self._view(base + col["offsets"], 8 * self._rows, "q")
+                self._columns.append(("utf8", ends, self._view(base + col["offset"], col["length"])))
+        self._names = [name for name, _ in self.header["schema"]]
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _value(self, column: Any, i: int) -> Any:
+        kind, values, blob = column
+        if kind == "i64":
+            return values[i]
+        start = values[i - 1] if i else 0
+        return str(blob[start : values[i]], "utf-8")
+
+    def _row(self, i: int) -> T:
+        return self.record_type(**{name: self._value(col, i) for name, col in zip(self._names, self._columns)})
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("dataset index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(self._rows):
+            yield self._row(i)
+
+    def column(self, name: str) -> List[Any]:
+        col = self._columns[self._names.index(name)]
+        return [self._value(col, i) for i in range(self._rows)]
+
+    def close(self) -> None:
+        # Exported memoryviews pin the mapping; release them before closing it.
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if getattr(self, "_buf", None) is not None:
+            self._buf.release()
+            self._buf = None  # type: ignore[assignment]
+        self._mm.close()
+
+    def __enter__(self) -> "Dataset[T]":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def write_dataset(path: Path, record_type: type, rows: Iterable[Any], meta: Dict[str, Any]) -> int:
+    """Write ``rows`` column by column (values are packed as they stream in); returns the row count."""
+    schema = record_schema(record_type)
+    ints: Dict[str, array] = {name: array("q") for name, kind in schema if kind == "i64"}
+    blobs: Dict[str, bytearray] = {name: bytearray() for name, kind in schema if kind == "utf8"}
+    ends: Dict[str, array] = {name: array("q") for name in blobs}
+    rows_n = 0
+    for row in rows:
+        for name, kind in schema:
+            value = getattr(row, name)
+            if kind == "i64":
+                ints[name].append(value)
+            else:
+                blobs[name] += value.encode("utf-8")
+                ends[name].append(len(blobs[name]))
+        rows_n += 1
+
+    # Column offsets are relative to the (8-byte aligned) end of the header.
+    columns: List[Dict[str, Any]] = []
+    buffers: List[bytes | bytearray] = []
+    pos = 0
+    for name, kind in schema:
+        col: Dict[str, Any] = {"name": name, "kind": kind}
+        if kind == "utf8":
+            col["offsets"] = pos
+            buffers.append(ends[name].tobytes())
+            pos = _pad(pos + len(buffers[-1]))
+            data: bytes | bytearray = blobs[name]
+        else:
+            data = ints[name].tobytes()
+        col["offset"], col["length"] = pos, len(data)
+        buffers.append(data)
+        pos = _pad(pos + len(data))
+        columns.append(col)
+    header = {**meta, "schema": schema, "rows": rows_n, "byteorder": sys.byteorder, "columns": columns}
+    encoded = json.dumps(header, separators=(",", ":")).encode()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_MAGIC + struct.pack("<I", len(encoded)) + encoded)
+            for buf in buffers:
+                fh.write(b"\0" * (_pad(fh.tell()) - fh.tell()))
+                fh.write(buf)
+        # Atomic: parallel workers generating the same dataset just race to an identical file.
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return rows_n
+
+
+class DatasetCache:
+    """Seed-keyed on-disk cache of generated datasets with LRU eviction by size and count."""
+
+    def __init__(self, root: str | Path, *, max_bytes: int = 512 * 1024 * 1024, max_entries: int = 64) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(record_type: type, **parts: Any) -> str:
+        material = json.dumps(
+            {"record": record_type.__qualname__, "schema": record_schema(record_type), **parts},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode()).hexdigest()[:24]
+
+    def path_for(self, name: str, key: str) -> Path:
+        return self.root / f"{name}-{key}{_SUFFIX}"
+
+    def load(self, name: str, key: str, record_type: Type[T]) -> Optional[Dataset[T]]:
+        path = self.path_for(name, key)
+        try:
+            dataset = Dataset(path, record_type)
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, struct.error, OSError):
+            logger.warning("Discarding unreadable dataset %s", path, exc_info=True)
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)  # mtime doubles as the LRU "last used" stamp
+        return dataset
+
+    def get_or_create(
+        self,
+        name: str,
+        record_type: Type[T],
+        factory: Callable[[], Iterable[T]],
+        **key_parts: Any,
+    ) -> Dataset[T]:
+        key = self.key(record_type, name=name, **key_parts)
+        dataset = self.load(name, key, record_type)
+        if dataset is not None:
+            return dataset
+        path = self.path_for(name, key)
+        write_dataset(path, record_type, factory(), {"name": name, "key": key, "parts": key_parts})
+        self.evict(keep=path)
+        return Dataset(path, record_type)
+
+    def evict(self, keep: Optional[Path] = None) -> List[Path]:
+        entries = []
+        for path in self.root.glob(f"*{_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort(reverse=True)  # most recently used first
+        total, kept, removed = 0, 0, []
+        for _, size, path in entries:
+            if path == keep or (kept < self.max_entries and total + size <= self.max_bytes):
+                total += size
+                kept += 1
+                continue
+            path.unlink(missing_ok=True)
+            removed.append(path)
+        return removed
+
+    def clear(self) -> None:
+        for path in self.root.glob(f"*{_SUFFIX}"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from http.client import responses as _REASONS
+from typing import Any, List, Optional, Sequence, Tuple, cast
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from urllib3.exceptions import ProtocolError
+
+from framework.adapters import synthetic_response
+from framework.retry import SYSTEM_CLOCK, Clock
+
+FAULT_ERRORS = ("reset", "timeout", "connect_timeout")
+
+
+@dataclass(frozen=True)
+class Fault:
+    """One scripted outcome for a request.
+
+    ``latency_s`` is spent on the adapter's clock first; if it exceeds the request's read
+    timeout the call ends in ``ReadTimeout`` after exactly that timeout. Then ``error``
+    raises the matching requests exception, ``status`` answers with a synthetic response,
+    and neither forwards the request to the real transport.
+    """
+
+    status: Optional[int] = None
+    latency_s: float = 0.0
+    error: Optional[str] = None
+    headers: Tuple[Tuple[str, str], ...] = ()
+    body: bytes = b""
+
+    def __post_init__(self) -> None:
+        if self.error is not None and self.error not in FAULT_ERRORS:
+            raise ValueError(f"Unknown fault {self.error!r}; expected one of {FAULT_ERRORS}")
+
+    @classmethod
+    def respond(
+        cls, status: int, *, json_body: Any = None, retry_after: Optional[float] = None, latency_s: float = 0.0
+    ) -> "Fault":
+        headers: List[Tuple[str, str]] = []
+        body = b""
+        if json_body is not None:
+            headers.append(("Content-Type", "application/json"))
+            body = json.dumps(json_body).encode()
+        if retry_after is not None:
+            headers.append(("Retry-After", f"{retry_after:g}"))
+        return cls(status=status, latency_s=latency_s, headers=tuple(headers), body=body)
+
+    @classmethod
+    def delay(cls, seconds: float) -> "Fault":
+        """Forward to the real transport after ``seconds`` of (possibly virtual) latency."""
+        return cls(latency_s=seconds)
+
+    @classmethod
+    def reset(cls) -> "Fault":
+        return cls(error="reset")
+
+    @classmethod
+    def timeout(cls) -> "Fault":
+        return cls(error="timeout")
+
+    @classmethod
+    def connect_timeout(cls) -> "Fault":
+        return cls(error="connect_timeout")
+
+
+PASS_THROUGH = Fault()
+
+
+@dataclass
+class FaultRule:
+    """Faults for requests whose method and path match, consumed in order.
+
+    After the sequence ``then`` answers every further call (``cycle=True`` repeats the
+    sequence instead). ``path`` is an fnmatch pattern: ``/status/*``, ``/anything*``.
+    """
+
+    method: str
+    path: str
+    faults: Sequence[Fault]
+    then: Fault = PASS_THROUGH
+    cycle: bool = False
+    calls: int = 0
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method == "*" or self.method == method) and fnmatchcase(path, self.path)
+
+    def next_fault(self) -> Fault:
+        i = self.calls
+        self.calls += 1
+        if i < len(self.faults):
+            return self.faults[i]
+        if self.cycle and self.faults:
+            return self.faults[i % len(self.faults)]
+        return self.then
+
+
+@dataclass
+class FaultPlan:
+    """Ordered per-route fault rules; the first matching rule decides.
+
+    Requests no rule matches go to ``default`` (the real transport unless set otherwise).
+    ``calls`` counts every request the adapter saw by ``"METHOD /path"``, so tests can
+    assert on attempts without wrapping ``session.request``.
+    """
+
+    rules: List[FaultRule] = field(default_factory=list)
+    default: Fault = PASS_THROUGH
+    calls: Counter = field(default_factory=Counter)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def route(
+        self,
+        path: str,
+        *faults: Fault,
+        method: str = "*",
+        then: Fault = PASS_THROUGH,
+        cycle: bool = False,
+    ) -> "FaultPlan":
+        self.rules.append(FaultRule(method=method.upper(), path=path, faults=list(faults), then=then, cycle=cycle))
+        return self
+
+    def statuses(self, path: str, *codes: int, method: str = "*", then: Optional[int] = None) -> "FaultPlan":
+        """Shorthand: answer ``codes`` in order, then ``then`` (or the real transport)."""
+        return self.route(
+            path,
+            *(Fault.respond(code) for code in codes),
+            method=method,
+            then=Fault.respond(then) if then is not None else PASS_THROUGH,
+        )
+
+    def next_fault(self, method: str, path: str) -> Fault:
+        with self._lock:
+            self.calls[f"{method} {path}"] += 1
+            for rule in self.rules:
+                if rule.matches(method, path):
+                    return rule.next_fault()
+            return self.default
+
+    def count(self, path: str, method: str = "*") -> int:
+        return sum(n for key, n in self.calls.items() if fnmatchcase(key, f"{method.upper()} {path}"))
+
+
+def _read_timeout(timeout: Any) -> Optional[float]:
+    # requests passes the (connect, read) tuple or a single number through to the adapter.
+    return cast(Optional[float], timeout[1] if isinstance(timeout, tuple) else timeout)
+
+
+class FaultInjectionAdapter(BaseAdapter):
+    """Transport that applies a FaultPlan in front of ``inner`` (usually the pooled adapter).
+
+    Latency and timeouts are spent on ``clock``: with a ``VirtualClock`` shared with the
+    client's RetryPolicy nothing really sleeps, yet the retry loop sees the same exceptions,
+    statuses and elapsed time as against a slow or flaky server.
+    """
+
+    def __init__(self, inner: BaseAdapter, plan: FaultPlan, clock: Clock = SYSTEM_CLOCK) -> None:
+        super().__init__()
+        self.inner = inner
+        self.plan = plan
+        self.clock = clock
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        fault = self.plan.next_fault(request.method, urlsplit(request.url).path or "/")
+        read_timeout = _read_timeout(timeout)
+
+        if fault.latency_s:
+            if read_timeout is not None and fault.latency_s >= read_timeout:
+                self.clock.sleep(read_timeout)
+                raise requests.exceptions.ReadTimeout(f"Injected read timeout ({read_timeout}s)", request=request)
+            self.clock.sleep(fault.latency_s)
+
+        if fault.error == "reset":
+            reset = ProtocolError("Connection aborted.", ConnectionResetError(104, "Connection reset by peer"))
+            raise requests.exceptions.ConnectionError(reset, request=request)
+        if fault.error == "timeout":
+            if read_timeout is not None:
+                self.clock.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(f"Injected read timeout ({read_timeout}s)", request=request)
+        if fault.error == "connect_timeout":
+            connect_timeout = timeout[0] if isinstance(timeout, tuple) else timeout
+            if connect_timeout is not None:
+                self.clock.sleep(connect_timeout)
+            raise requests.exceptions.ConnectTimeout(f"Injected connect timeout ({connect_timeout}s)", request=request)
+
+        if fault.status is not None:
+            return self._build_response(request, fault, fault.status)
+        return self.inner.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+    def _build_response(self, request, fault: Fault, status: int) -> requests.Response:
+        return synthetic_response(self, request, status, _REASONS.get(status, ""), fault.headers, fault.body)
+
+    def close(self) -> None:
+        self.inner.close()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import threading
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_ACCEPT_ENCODING, get_encoding_from_headers
+from urllib3 import HTTPHeaderDict
+
+try:
+    import httpx
+except Exception:  # pragma: no cover
+    httpx = None  # type: ignore[assignment]
+
+try:
+    import h2  # httpx imports it lazily, on the first HTTP/2 connection
+except Exception:  # pragma: no cover
+    h2 = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+HTTP_VERSIONS = ("1.1", "2", "h2c")
+# Connection-specific headers are illegal in HTTP/2 (RFC 9113 8.2.2); httpx sets its own framing.
+_HOP_BY_HOP = frozenset({"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"})
+
+
+def check_http_version(version: str) -> None:
+    if version not in HTTP_VERSIONS:
+        raise ValueError(f"Unknown http_version {version!r}; expected one of {HTTP_VERSIONS}")
+    if version != "1.1" and (httpx is None or h2 is None):
+        raise RuntimeError("httpx[http2] is not installed. Install requirements-async.txt to use HTTP/2.")
+
+
+class _LoopThread:
+    """One event loop in a daemon thread that every Http2Adapter runs its I/O on."""
+
+    _lock = threading.Lock()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def run(cls, coro: Awaitable[T]) -> T:
+        with cls._lock:
+            if cls._loop is None:
+                cls._loop = asyncio.new_event_loop()
+                threading.Thread(target=cls._loop.run_forever, name="http2-transport", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, cls._loop).result()  # type: ignore[arg-type]
+
+
+def _timeout(timeout: Any) -> "httpx.Timeout":
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _translate(exc: Exception, request) -> requests.RequestException:
+    """The requests exception HttpClient's retry policy and callers already handle."""
+    # Timeouts raised from the asyncio backend carry no message of their own.
+    message = str(exc) or type(exc).__name__
+    if isinstance(exc, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(message, request=request)
+    if isinstance(exc, httpx.TimeoutException):
+        return requests.exceptions.ReadTimeout(message, request=request)
+    return requests.exceptions.ConnectionError(message, request=request)
+
+
+async def _next_chunk(chunks: AsyncIterator[bytes]) -> Optional[bytes]:
+    try:
+        return await chunks.__anext__()
+    except (StopAsyncIteration, httpx.StreamError):  # exhausted, consumed or closed
+        return None
+
+
+class _HeadersOnly:
+    """Stands in for ``http.client.HTTPResponse`` where requests' cookie handling reads headers."""
+
+    def __init__(self, headers: HTTPHeaderDict) -> None:
+        self.msg = http.client.HTTPMessage()
+        for name, value in headers.iteritems():
+            self.msg[name] = value
+
+
+class _RawBody:
+    """``Response.raw`` over an httpx response: the read/stream/close surface requests uses.
+
+    Bytes are already decoded (httpx undoes ``Content-Encoding``), so ``decode_content``
+    is accepted and ignored.
+    """
+
+    def __init__(self, response: "httpx.Response", headers: HTTPHeaderDict) -> None:
+        self._response = response
+        self._chunks: Optional[AsyncIterator[bytes]] = None
+        self._buffer = b""
+        self._original_response = _HeadersOnly(headers)
+
+    def read(self, amt: Optional[int] = None, decode_content: bool = True) -> bytes:
+        if self._chunks is None:
+            self._chunks = self._response.aiter_bytes()
+        try:
+            while amt is None or len(self._buffer) < amt:
+                chunk = _LoopThread.run(_next_chunk(self._chunks))
+                if chunk is None:
+                    break
+                self._buffer += chunk
+        except httpx.TimeoutException as exc:
+            raise requests.exceptions.ConnectionError(exc) from exc
+        except httpx.TransportError as exc:
+            raise requests.exceptions.ChunkedEncodingError(exc) from exc
+        if amt is None:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def stream(self, amt: int = 2**16, decode_content: bool = True) -> Iterator[bytes]:
+        while True:
+            data = self.read(amt)
+            if not data:
+                return
+            yield data
+
+    def close(self) -> None:
+        if not self._response.is_closed:
+            _LoopThread.run(self._response.aclose())
+
+    release_conn = close
+
+
+class Http2Adapter(BaseAdapter):
+    """requests transport over httpx, multiplexing concurrent requests on one connection per origin.
+
+    ``prior_knowledge=True`` speaks HTTP/2 from the first byte (h2c over plain http);
+    otherwise HTTP/2 is negotiated through TLS ALPN and plain http stays on HTTP/1.1.
+    Responses carry ``http_version`` ("HTTP/2" or "HTTP/1.1"). TLS verification and proxies
+    are fixed when the adapter is built, not per request.
+
+    The calling threads hand their requests to one background event loop: httpcore's sync
+    HTTP/2 connection is not thread-safe (two threads can open streams out of id order,
+    which the server answers with GOAWAY), its asyncio one is.
+    """
+
+    def __init__(
+        self,
+        *,
+        prior_knowledge: bool = False,
+        max_connections: int = 10,
+        keepalive_expiry: Optional[float] = None,
+    ) -> None:
+        super().__init__()
+        check_http_version("h2c" if prior_knowledge else "2")
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.client = httpx.AsyncClient(http1=not prior_knowledge, http2=True, limits=limits, follow_redirects=False)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in _HOP_BY_HOP}
+        if headers.get("Accept-Encoding") == DEFAULT_ACCEPT_ENCODING:
+            # requests' default lists what urllib3 can decode; advertise what httpx can (zstd, br).
+            headers["Accept-Encoding"] = self.client.headers["Accept-Encoding"]
+        outgoing = self.client.build_request(
+            request.method, request.url, headers=headers, content=request.body, timeout=_timeout(timeout)
+        )
+        try:
+            r = _LoopThread.run(self.client.send(outgoing, stream=True))
+        except httpx.TransportError as exc:
+            raise _translate(exc, request) from exc
+        return self._build_response(request, r)
+
+    def _build_response(self, request, r: "httpx.Response") -> requests.Response:
+        headers = HTTPHeaderDict()
+        for name, value in r.headers.raw:
+            headers.add(name.decode("latin-1"), value.decode("latin-1"))
+
+        resp = requests.Response()
+        resp.status_code = r.status_code
+        resp.headers = CaseInsensitiveDict(headers)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.reason = r.reason_phrase
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self  # type: ignore[assignment]
+        resp.raw = _RawBody(r, headers)
+        resp.http_version = r.http_version  # type: ignore[attr-defined]
+        extract_cookies_to_jar(resp.cookies, request, resp.raw)
+        return resp
+
+    def close(self) -> None:
+        _LoopThread.run(self.client.aclose())
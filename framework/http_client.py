@@ -1,13 +1,32 @@
 from __future__ import annotations
 
 import logging
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 import requests
-
-from framework.retry import retry
-from framework.config import RetryConfig, ServiceConfig
+from requests.adapters import BaseAdapter
+
+from framework.adapters import PooledHTTPAdapter, pop_connect_time
+from framework.batch import BatchResult, RequestSpec, map_concurrent
+from framework.fault_injection import FaultInjectionAdapter, FaultPlan
+from framework.retry import SYSTEM_CLOCK, Clock, RetryPolicy, get_current_attempt
+from framework.circuit_breaker import get_breaker
+from framework.config import (
+    CassetteConfig,
+    CircuitBreakerConfig,
+    RateLimitConfig,
+    ResponseCacheConfig,
+    RetryConfig,
+    ServiceConfig,
+)
+from framework.metrics import observe_http_request, path_template
+from framework.rate_limit import get_limiter
+from framework.response_cache import CachingAdapter
+from framework.reporting.allure_helpers import attach_request, attach_response
 
 logger = logging.getLogger("framework.http_client")
 
@@ -16,31 +35,84 @@ logger = logging.getLogger("framework.http_client")
 class HttpClient:
     service: ServiceConfig
     retry_cfg: RetryConfig
+    rate_limit: Optional[RateLimitConfig] = None
+    circuit_breaker: Optional[CircuitBreakerConfig] = None
+    # Split each request into connect / ttfb / download in http_request_phase_duration_seconds.
+    record_phases: bool = True
+    # Record/replay transport; None or mode "off" talks to the network directly.
+    cassette: Optional[CassetteConfig] = None
+    # Scripted latency / resets / timeouts / statuses per route, in front of the transport.
+    faults: Optional[FaultPlan] = None
+    # Time source for retry backoff and injected latency (a VirtualClock never really sleeps).
+    clock: Clock = SYSTEM_CLOCK
+    # In-memory cache + single flight for idempotent GET/HEAD; None or disabled sends every request.
+    response_cache: Optional[ResponseCacheConfig] = None
 
     def __post_init__(self) -> None:
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "testtaskbs01/0.3"})
 
+        # Optional transports import httpx / h2 / zstandard: only when configured.
+        adapter: BaseAdapter
+        if self.service.http_version == "1.1":
+            adapter = PooledHTTPAdapter(
+                pool_connections=self.service.pool_connections,
+                pool_maxsize=self.service.pool_maxsize,
+                pool_block=self.service.pool_block,
+                keepalive_idle_s=self.service.keepalive_idle_s,
+            )
+        else:
+            from framework.http2 import Http2Adapter, check_http_version
+
+            check_http_version(self.service.http_version)
+            # Streams multiplex over one connection per origin; pool_maxsize caps extra connections.
+            adapter = Http2Adapter(
+                prior_knowledge=self.service.http_version == "h2c",
+                max_connections=self.service.pool_maxsize,
+                keepalive_expiry=self.service.keepalive_idle_s,
+            )
+        if self.service.request_compression:
+            from framework.compression import CompressingAdapter
+
+            # Directly on the transport: everything above sees and keys on the plain body.
+            adapter = CompressingAdapter(
+                adapter, self.service.request_compression, min_bytes=self.service.compression_min_bytes
+            )
+        if self.cassette is not None and self.cassette.mode != "off":
+            from framework.cassette import CassetteAdapter
+
+            adapter = CassetteAdapter.from_config(adapter, self.cassette)
+        if self.faults is not None:
+            adapter = FaultInjectionAdapter(adapter, self.faults, self.clock)
+        if self.response_cache is not None and self.response_cache.enabled:
+            # Outermost: a hit never reaches faults, cassettes or the pool.
+            adapter = CachingAdapter.from_config(adapter, self.response_cache, self.clock)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Compiled once: the request path only looks things up.
+        self._policy = RetryPolicy.from_config(self.retry_cfg, clock=self.clock)
+        self._host = urlsplit(self.service.base_url).netloc
+        self._limiter = get_limiter(self._host, self.rate_limit, self.clock) if self.rate_limit else None
+
     def request(self, method: str, path: str, **kwargs) -> requests.Response:
         url = f"{self.service.base_url.rstrip('/')}/{path.lstrip('/')}"
-        attempts = self.retry_cfg.attempts
-        backoff_s = self.retry_cfg.backoff_s
-        backoff_multiplier = self.retry_cfg.backoff_multiplier
-        statuses = tuple(self.retry_cfg.retry_on_statuses)
-
-        @retry(
-            attempts=attempts,
-            backoff_s=backoff_s,
-            backoff_multiplier=backoff_multiplier,
-            retry_on_statuses=statuses,
-        )
-        def _do() -> requests.Response:
+        endpoint = path_template(path)
+        breaker = None
+        if self.circuit_breaker is not None:
+            breaker = get_breaker(self._host, endpoint, self.circuit_breaker, self.clock)
+        return self._policy.call(self._send, method, url, kwargs, endpoint, breaker)
+
+    def _send(
+        self, method: str, url: str, kwargs: Dict[str, Any], endpoint: str, breaker=None
+    ) -> requests.Response:
+        # Fails fast (not retryable) instead of spending attempts and backoff on a dead endpoint.
+        probe = breaker.before_call() if breaker is not None else None
+        try:
             logger.info("HTTP %s %s", method.upper(), url)
 
             # Allure attachments (best-effort)
             try:
-                from framework.reporting.allure_helpers import attach_request, attach_response  # noqa
-
                 attach_request(
                     method=method,
                     url=url,
@@ -51,17 +123,86 @@ class HttpClient:
             except Exception:
                 pass
 
-            resp = self.session.request(method=method, url=url, timeout=self.service.timeout_s, **kwargs)
+            if self._limiter is not None:
+                self._limiter.acquire()
+
+            pop_connect_time()
+            t0 = time.perf_counter()
+            try:
+                resp = self.session.request(method=method, url=url, timeout=self.service.timeout_s, **kwargs)
+            except requests.RequestException:
+                observe_http_request(method, endpoint, None, get_current_attempt(), time.perf_counter() - t0)
+                if breaker is not None:
+                    breaker.record(False)
+                raise
+            total_s = time.perf_counter() - t0
+            phases = self._phases(resp, total_s, streamed=bool(kwargs.get("stream"))) if self.record_phases else None
+            observe_http_request(method, endpoint, resp.status_code, get_current_attempt(), total_s, phases)
+            if breaker is not None:
+                breaker.record(resp.status_code < 500)
+
+            if self._limiter is not None:
+                self._limiter.on_response(resp.status_code, resp.headers.get("Retry-After"))
 
             try:
-                from framework.reporting.allure_helpers import attach_response  # noqa
                 attach_response(resp)
             except Exception:
                 pass
 
             return resp
-
-        return _do()
+        finally:
+            if breaker is not None:
+                # No-op when the outcome was recorded; otherwise (cassette miss, unserialisable
+                # body, limiter error) a half-open probe slot would leak and pin the circuit.
+                breaker.release(probe)
+
+    @staticmethod
+    def _phases(resp: requests.Response, total_s: float, streamed: bool) -> Dict[str, float]:
+        # resp.elapsed covers connect + send + wait for headers; the body is read after it.
+        connect_s = pop_connect_time()
+        headers_s = resp.elapsed.total_seconds()
+        phases = {"ttfb": max(0.0, headers_s - connect_s)}
+        if connect_s:
+            phases["connect"] = connect_s
+        if not streamed:
+            phases["download"] = max(0.0, total_s - headers_s)
+        return phases
+
+    @contextmanager
+    def stream(self, method: str, path: str, **kwargs) -> Iterator[requests.Response]:
+        """``request(..., stream=True)`` that always releases the connection.
+
+        Read the body with ``framework.streaming`` helpers (or ``iter_content``), never
+        ``.content``/``.json()``, or the whole body is buffered after all.
+        """
+        resp = self.request(method, path, stream=True, **kwargs)
+        try:
+            yield resp
+        finally:
+            resp.close()
+
+    def request_many(
+        self,
+        specs: Iterable[Union[RequestSpec, Tuple[str, str], Tuple[str, str, Dict[str, Any]]]],
+        *,
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult[requests.Response]]:
+        """Send many requests over a thread pool; each item is retried like ``request``.
+
+        ``specs`` are RequestSpec or ``(method, path[, kwargs])`` tuples, consumed lazily.
+        ``concurrency`` defaults to ``service.pool_maxsize`` so every worker reuses a pooled
+        connection. Failures are returned in ``BatchResult.error``, not raised.
+        """
+
+        def send(spec) -> requests.Response:
+            if not isinstance(spec, RequestSpec):
+                spec = RequestSpec(*spec)
+            return self.request(spec.method, spec.path, **spec.kwargs)
+
+        return map_concurrent(
+            send, specs, concurrency=concurrency or self.service.pool_maxsize, ordered=ordered
+        )
 
     def get(self, path: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
         return self.request("GET", path, params=params, **kwargs)
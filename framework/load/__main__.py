@@ -0,0 +1,104 @@
+"""Load runner: drive HttpBinApi scenarios at a target rate or concurrency.
+
+Run: python -m framework.load --rps 200 --duration 60 --scenario uuid:3 --scenario anything_post_json
+     python -m framework.load --concurrency 32 --duration 60 --json artifacts/load.json
+
+Without --rps the runner is closed loop at --concurrency. Uses the same config as the suite
+(BASE_URL, pool, metrics); retries, rate limiting, the circuit breaker and Allure attachments
+are off so every failure is counted and nothing throttles the generator. --local-httpbin
+targets an in-process framework.local_httpbin instead (it shares the GIL with the generator;
+run ``python -m framework.local_httpbin`` separately to benchmark the client side alone).
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import logging
+import os
+import pathlib
+
+from framework.api.httpbin_api import HttpBinApi
+from framework.config import load_config
+from framework.http_client import HttpClient
+from framework.local_httpbin import LocalHttpBin
+from framework.load.runner import LoadProfile, LoadRunner, format_report, publish_report
+from framework.load.scenarios import SCENARIOS, parse_mix
+from framework.logging import setup_logging
+from framework.metrics import configure_series_budget, push_metrics
+from framework.reporting.attachment_pipeline import configure_attachments
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rps", type=float, default=None, help="open-loop target rate; omit for closed loop")
+    parser.add_argument("--concurrency", type=int, default=None, help="worker threads (default 16, or 64 with --rps)")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=0.0, help="seconds of load before measuring")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        default=[],
+        metavar="NAME[:WEIGHT]",
+        help=f"repeatable; one of {', '.join(SCENARIOS)} (default: all, equal weight)",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None, help="also write the report to this file")
+    parser.add_argument(
+        "--trusted", action="store_true", help="skip pydantic validation so schema drift is not counted as errors"
+    )
+    parser.add_argument("--no-push", action="store_true", help="skip the Pushgateway even if metrics are enabled")
+    parser.add_argument(
+        "--local-httpbin", action="store_true", help="start an in-process httpbin stand-in and target it"
+    )
+    args = parser.parse_args()
+
+    setup_logging(os.getenv("LOG_LEVEL", "WARNING"))
+    configure_attachments(mode="off")
+
+    cfg = load_config()
+    configure_series_budget(cfg.metrics.max_series)
+    server = LocalHttpBin().start() if args.local_httpbin or cfg.service.local_httpbin else None
+    if server is not None:
+        cfg = dataclasses.replace(cfg, service=dataclasses.replace(cfg.service, base_url=server.url))
+    concurrency = args.concurrency or (64 if args.rps else 16)
+    profile = LoadProfile(
+        duration_s=args.duration,
+        mix=parse_mix(args.scenario),
+        rps=args.rps,
+        concurrency=concurrency,
+        warmup_s=args.warmup,
+        seed=args.seed,
+    )
+    client = HttpClient(
+        service=dataclasses.replace(cfg.service, pool_maxsize=max(cfg.service.pool_maxsize, concurrency)),
+        retry_cfg=dataclasses.replace(cfg.retry, attempts=1),
+        record_phases=cfg.metrics.request_phases,
+    )
+    try:
+        report = LoadRunner(HttpBinApi(client, trusted=args.trusted), profile).run()
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(format_report(report))
+    if args.json_path:
+        path = pathlib.Path(args.json_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    publish_report(report)
+    if cfg.metrics.enabled and not args.no_push:
+        try:
+            push_metrics(
+                cfg.metrics.pushgateway_url,
+                f"{cfg.metrics.job_name}_load",
+                grouping_key={"instance": os.getenv("HOSTNAME", "local")},
+                mode="replace",
+            )
+        except Exception as exc:
+            logging.getLogger("framework.load").warning("Pushgateway push failed: %s", exc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, Iterable, Tuple
+
+# Reported by the load and messaging benchmarks.
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """HdrHistogram-style log-linear histogram of integer microsecond values.
+
+    Values below ``2 ** sub_bits`` are counted exactly; above that every power-of-two range
+    is split into ``2 ** (sub_bits - 1)`` linear sub-buckets, so any recorded value is
+    reported within ``10 ** -significant_figures`` of its true value no matter how long the
+    tail gets. Buckets are stored sparsely, recording is O(1) and histograms merge by
+    adding counts.
+    """
+
+    def __init__(self, significant_figures: int = 2) -> None:
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+        self._sub_bits = math.ceil(math.log2(2 * 10**significant_figures))
+        self._counts: Dict[Tuple[int, int], int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def _key(self, value_us: int) -> Tuple[int, int]:
+        shift = max(0, value_us.bit_length() - self._sub_bits)
+        return shift, value_us >> shift
+
+    @staticmethod
+    def _highest_equivalent(key: Tuple[int, int]) -> int:
+        shift, sub = key
+        return ((sub + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value_us = max(0, int(round(seconds * 1e6)))
+        key = self._key(value_us)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+            if self.count == 0 or value_us < self.min_us:
+                self.min_us = value_us
+            self.max_us = max(self.max_us, value_us)
+            self.count += 1
+            self.total_us += value_us
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        with other._lock:
+            counts = dict(other._counts)
+            count, total, lo, hi = other.count, other.total_us, other.min_us, other.max_us
+        if not count:
+            return
+        with self._lock:
+            for key, n in counts.items():
+                self._counts[key] = self._counts.get(key, 0) + n
+            self.min_us = lo if self.count == 0 else min(self.min_us, lo)
+            self.max_us = max(self.max_us, hi)
+            self.count += count
+            self.total_us += total
+
+    def percentile(self, q: float) -> float:
+        """Value (seconds) at or below which ``q`` percent of the recordings fall."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, math.ceil(q / 100.0 * self.count))
+            seen = 0
+            for key in sorted(self._counts):
+                seen += self._counts[key]
+                if seen >= rank:
+                    return min(self._highest_equivalent(key), self.max_us) / 1e6
+            return self.max_us / 1e6
+
+    def percentiles(self, qs: Iterable[float]) -> Dict[str, float]:
+        return {f"p{q:g}": self.percentile(q) for q in qs}
+
+    def summary_ms(self, qs: Iterable[float] = PERCENTILES) -> Dict[str, float]:
+        """Percentiles plus max and mean, in milliseconds rounded for reports."""
+        values = {k: round(v * 1000, 3) for k, v in self.percentiles(qs).items()}
+        values["max"] = round(self.max_us / 1000, 3)
+        values["mean"] = round(self.mean * 1000, 3)
+        return values
+
+    @property
+    def mean(self) -> float:
+        return self.total_us / self.count / 1e6 if self.count else 0.0
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter as CounterDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from framework.api.httpbin_api import HttpBinApi
+from framework.load.histogram import LatencyHistogram
+from framework.load.scenarios import SCENARIOS, prepare
+from framework.metrics import set_current_test_name, set_load_summary
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """What to run: open loop at ``rps`` when set, otherwise ``concurrency`` closed-loop workers."""
+
+    duration_s: float
+    mix: Dict[str, float]
+    rps: Optional[float] = None
+    concurrency: int = 16
+    warmup_s: float = 0.0
+    seed: Optional[int] = None
+
+    @property
+    def mode(self) -> str:
+        return "open" if self.rps else "closed"
+
+
+@dataclass
+class _ScenarioStats:
+    # Scheduled send -> response: includes time spent queued behind slow requests.
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # Actual send -> response: what the server and client took for this request alone.
+    service_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: CounterDict[str] = field(default_factory=CounterDict)
+
+
+def _error_kind(exc: BaseException) -> str:
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    return f"HTTP {status}" if status else type(exc).__name__
+
+
+class LoadRunner:
+    """Drives HttpBinApi scenarios and aggregates latency per scenario.
+
+    Open loop: a scheduler thread issues request *i* at ``start + i / rps`` regardless of how
+    many earlier requests are still in flight, and latency is measured from that scheduled
+    time. A stalled server therefore shows up as queueing latency for every request it
+    delayed, instead of silently lowering the send rate (coordinated omission). Requests
+    that find every worker busy wait in the executor queue, so keep ``concurrency`` above
+    ``rps * expected latency``.
+
+    Closed loop: ``concurrency`` workers send back-to-back; throughput is whatever the
+    server sustains at that concurrency.
+    """
+
+    def __init__(self, api: HttpBinApi, profile: LoadProfile) -> None:
+        unknown = set(profile.mix) - set(SCENARIOS)
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {sorted(unknown)}")
+        self.api = api
+        self.profile = profile
+        self._names = list(profile.mix)
+        self._weights = [profile.mix[n] for n in self._names]
+        self._stats: Dict[str, _ScenarioStats] = {n: _ScenarioStats() for n in self._names}
+        self._errors_lock = threading.Lock()
+        self._measure_from = 0.0
+        self._elapsed_s = 0.0
+
+    def _execute(self, name: str, scheduled: float) -> None:
+        set_current_test_name(f"load:{name}")
+        sent = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            SCENARIOS[name](self.api)
+        except Exception as exc:
+            error = _error_kind(exc)
+        done = time.perf_counter()
+        if scheduled < self._measure_from:
+            return
+        stats = self._stats[name]
+        stats.latency.record(done - scheduled)
+        stats.service_time.record(done - sent)
+        if error is not None:
+            with self._errors_lock:
+                stats.errors[error] += 1
+
+    def _run_open(self, rng: random.Random, start: float, end: float) -> None:
+        interval = 1.0 / float(self.profile.rps or 1)
+        with ThreadPoolExecutor(max_workers=self.profile.concurrency, thread_name_prefix="load") as pool:
+            i = 0
+            while True:
+                scheduled = start + i * interval
+                if scheduled >= end:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                name = rng.choices(self._names, self._weights)[0]
+                pool.submit(self._execute, name, scheduled)
+                i += 1
+
+    def _run_closed(self, rng: random.Random, end: float) -> None:
+        def worker(seed: int) -> None:
+            local = random.Random(seed)
+            while (now := time.perf_counter()) < end:
+                self._execute(local.choices(self._names, self._weights)[0], now)
+
+        with ThreadPoolExecutor(max_workers=self.profile.concurrency, thread_name_prefix="load") as pool:
+            for _ in range(self.profile.concurrency):
+                pool.submit(worker, rng.randrange(2**32))
+
+    def run(self) -> Dict[str, Any]:
+        prepare(self._names)
+        rng = random.Random(self.profile.seed)
+        start = time.perf_counter()
+        self._measure_from = start + self.profile.warmup_s
+        end = self._measure_from + self.profile.duration_s
+        if self.profile.mode == "open":
+            self._run_open(rng, start, end)
+        else:
+            self._run_closed(rng, end)
+        # Includes draining requests still in flight at the deadline.
+        self._elapsed_s = max(time.perf_counter() - self._measure_from, self.profile.duration_s, 1e-9)
+        return self.report()
+
+    def _summary(self, latency: LatencyHistogram, service_time: LatencyHistogram, errors: CounterDict[str]) -> Dict[str, Any]:
+        n_errors = sum(errors.values())
+        return {
+            "requests": latency.count,
+            "errors": n_errors,
+            "error_rate": n_errors / latency.count if latency.count else 0.0,
+            "throughput_rps": latency.count / self._elapsed_s if self._elapsed_s else 0.0,
+            "errors_by_kind": dict(errors),
+            "latency_ms": latency.summary_ms(),
+            "service_time_ms": service_time.summary_ms(),
+        }
+
+    def report(self) -> Dict[str, Any]:
+        total_latency, total_service = LatencyHistogram(), LatencyHistogram()
+        total_errors: CounterDict[str] = CounterDict()
+        scenarios = {}
+        for name, stats in self._stats.items():
+            total_latency.merge(stats.latency)
+            total_service.merge(stats.service_time)
+            total_errors.update(stats.errors)
+            scenarios[name] = self._summary(stats.latency, stats.service_time, stats.errors)
+        return {
+            "mode": self.profile.mode,
+            "target_rps": self.profile.rps,
+            "concurrency": self.profile.concurrency,
+            "duration_s": self.profile.duration_s,
+            "elapsed_s": round(self._elapsed_s, 3),
+            "scenarios": scenarios,
+            "total": self._summary(total_latency, total_service, total_errors),
+        }
+
+
+def publish_report(report: Dict[str, Any]) -> None:
+    """Copy the report into the load_* gauges so the next push carries it."""
+    for name, summary in [*report["scenarios"].items(), ("total", report["total"])]:
+        set_load_summary(
+            name,
+            throughput_rps=summary["throughput_rps"],
+            error_rate=summary["error_rate"],
+            latency_s={k: v / 1000 for k, v in summary["latency_ms"].items() if k.startswith("p")},
+        )
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    target = f"{report['target_rps']:g} rps open loop" if report["mode"] == "open" else "closed loop"
+    lines = [
+        f"{target}, concurrency {report['concurrency']}, {report['duration_s']:g} s (elapsed {report['elapsed_s']:g} s)",
+        f"{'scenario':<20} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} {'max':>8}  (ms)",
+    ]
+    for name, s in [*report["scenarios"].items(), ("total", report["total"])]:
+        lat = s["latency_ms"]
+        lines.append(
+            f"{name:<20} {s['requests']:>7} {s['throughput_rps']:>8.1f} {s['error_rate'] * 100:>6.2f} "
+            f"{lat['p50']:>8.2f} {lat['p90']:>8.2f} {lat['p99']:>8.2f} {lat['p99.9']:>8.2f} {lat['max']:>8.2f}"
+        )
+    return "\n".join(lines)
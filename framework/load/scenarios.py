@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Iterator, Optional
+
+from framework.api.httpbin_api import HttpBinApi
+from framework.data_gen import UserPayload, iter_user_payloads, rand_string
+
+# A scenario is one request shape from HttpBinApi; it raises on any non-2xx response.
+Scenario = Callable[[HttpBinApi], None]
+
+
+def _uuid(api: HttpBinApi) -> None:
+    api.uuid()
+
+
+def _anything_get(api: HttpBinApi) -> None:
+    api.anything_get(params={"q": rand_string()}, accept="application/json").raise_for_status()
+
+
+# Payloads come from one shared bulk stream (pooled Faker values) rather than per-request Faker calls.
+_PAYLOADS: Optional[Iterator[UserPayload]] = None
+_PAYLOADS_LOCK = threading.Lock()
+
+
+def _next_payload() -> UserPayload:
+    global _PAYLOADS
+    with _PAYLOADS_LOCK:
+        if _PAYLOADS is None:
+            _PAYLOADS = iter_user_payloads()
+        return next(_PAYLOADS)
+
+
+def _anything_post_json(api: HttpBinApi) -> None:
+    api.anything_post_json(_next_payload().as_dict())
+
+
+def _anything_post_form(api: HttpBinApi) -> None:
+    api.anything_post_form({"name": rand_string(), "city": rand_string()})
+
+
+def _headers(api: HttpBinApi) -> None:
+    api.headers()
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "uuid": _uuid,
+    "anything_get": _anything_get,
+    "anything_post_json": _anything_post_json,
+    "anything_post_form": _anything_post_form,
+    "headers": _headers,
+}
+
+
+def prepare(names) -> None:
+    """Build lazily-created inputs up front so the first requests don't pay for them."""
+    if "anything_post_json" in names:
+        _next_payload()
+
+
+def parse_mix(specs: list[str]) -> Dict[str, float]:
+    """``["uuid:3", "headers"]`` -> ``{"uuid": 3.0, "headers": 1.0}``; empty means every scenario."""
+    if not specs:
+        return {name: 1.0 for name in SCENARIOS}
+    mix: Dict[str, float] = {}
+    for spec in specs:
+        name, _, weight = spec.partition(":")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; expected one of {sorted(SCENARIOS)}")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] <= 0:
+            raise ValueError(f"Scenario weight must be positive: {spec!r}")
+    return mix
@@ -0,0 +1,523 @@
+"""In-process AMQP 0-9-1 broker stand-in for hermetic messaging runs and benchmarks.
+
+Run: python -m framework.local_amqp --port 5672
+
+Speaks enough of RabbitMQ's dialect for framework.messaging and plain pika clients: the
+default exchange (routing key = queue name), ``queue.declare/purge/delete``, ``basic.publish``
+(``mandatory`` returns), ``basic.get``, ``basic.consume`` with ``basic.qos`` prefetch and
+round-robin dispatch, ``basic.ack/nack/reject`` with requeue, publisher confirms (acked with
+``multiple`` once per read from the socket), exclusive and auto-delete queues. Queues live in
+memory on one asyncio event loop; there are no other exchanges, bindings, persistence or auth
+(any credentials are accepted). Frames are encoded and decoded with pika's own codec.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from framework import local_server
+from framework.local_server import LocalServer
+
+try:
+    from pika import frame as amqp_frame
+    from pika import spec
+except Exception:  # pragma: no cover
+    amqp_frame = spec = None
+
+logger = logging.getLogger("framework.local_amqp")
+
+FRAME_MAX = 131072
+CHANNEL_MAX = 2047
+
+# AMQP reply codes (spec section 1.9)
+NOT_FOUND = 404
+RESOURCE_LOCKED = 405
+PRECONDITION_FAILED = 406
+NO_ROUTE = 312
+UNEXPECTED_FRAME = 505
+NOT_IMPLEMENTED = 540
+
+_SERVER_PROPERTIES = {
+    "product": "framework.local_amqp",
+    "capabilities": {
+        "publisher_confirms": True,
+        "basic.nack": True,
+        "consumer_cancel_notify": True,
+        "exchange_exchange_bindings": False,
+        "per_consumer_qos": True,
+    },
+}
+
+
+class ChannelError(Exception):
+    def __init__(self, code: int, text: str, method: Any = None) -> None:
+        super().__init__(text)
+        self.code = code
+        self.text = text
+        self.method = method
+
+
+@dataclass
+class _Message:
+    exchange: str
+    routing_key: str
+    properties: Any
+    body: bytes
+    redelivered: bool = False
+
+
+@dataclass
+class _Consumer:
+    tag: str
+    channel: "_Channel"
+    queue: "_Queue"
+    no_ack: bool
+
+
+@dataclass
+class _Queue:
+    name: str
+    auto_delete: bool = False
+    owner: Optional["_Connection"] = None
+    messages: Deque[_Message] = field(default_factory=deque)
+    consumers: List[_Consumer] = field(default_factory=list)
+    had_consumers: bool = False
+    next_consumer: int = 0
+
+
+class _Channel:
+    def __init__(self, conn: "_Connection", number: int) -> None:
+        self.conn = conn
+        self.number = number
+        self.prefetch = 0
+        self.next_tag = 0
+        self.unacked: "OrderedDict[int, Tuple[_Queue, _Message]]" = OrderedDict()
+        self.consumers: Dict[str, _Consumer] = {}
+        self.confirm = False
+        self.published = 0
+        self.confirmed = 0
+        self.closing = False
+        # basic.publish waiting for its content header / body frames
+        self.publish: Optional[Any] = None
+        self.header: Optional[Any] = None
+        self.body: List[bytes] = []
+        self.body_size = 0
+
+    def has_room(self) -> bool:
+        return self.prefetch == 0 or len(self.unacked) < self.prefetch
+
+
+class _Broker:
+    def __init__(self, stats: Counter) -> None:
+        self.queues: Dict[str, _Queue] = {}
+        self.connections: "set[_Connection]" = set()
+        self.stats = stats
+
+    def declare(self, conn: "_Connection", m: Any) -> _Queue:
+        name = m.queue or f"amq.gen-{uuid.uuid4().hex[:22]}"
+        queue = self.queues.get(name)
+        if queue is None:
+            if m.passive:
+                raise ChannelError(NOT_FOUND, f"NOT_FOUND - no queue '{name}'", m)
+            queue = _Queue(name, auto_delete=m.auto_delete, owner=conn if m.exclusive else None)
+            self.queues[name] = queue
+        elif queue.owner is not None and queue.owner is not conn:
+            raise ChannelError(RESOURCE_LOCKED, f"RESOURCE_LOCKED - queue '{name}' is exclusive", m)
+        return queue
+
+    def lookup(self, conn: "_Connection", name: str, method: Any) -> _Queue:
+        queue = self.queues.get(name)
+        if queue is None:
+            raise ChannelError(NOT_FOUND, f"NOT_FOUND - no queue '{name}'", method)
+        if queue.owner is not None and queue.owner is not conn:
+            raise ChannelError(RESOURCE_LOCKED, f"RESOURCE_LOCKED - queue '{name}' is exclusive", method)
+        return queue
+
+    def delete(self, queue: _Queue) -> int:
+        self.queues.pop(queue.name, None)
+        for consumer in list(queue.consumers):
+            consumer.channel.consumers.pop(consumer.tag, None)
+            consumer.channel.conn.send_method(consumer.channel.number, spec.Basic.Cancel(consumer_tag=consumer.tag))
+        queue.consumers.clear()
+        return len(queue.messages)
+
+    def remove_consumer(self, consumer: _Consumer) -> None:
+        queue = consumer.queue
+        if consumer in queue.consumers:
+            queue.consumers.remove(consumer)
+        if queue.auto_delete and queue.had_consumers and not queue.consumers:
+            self.delete(queue)
+
+    def route(self, message: _Message) -> bool:
+        queue = self.queues.get(message.routing_key) if message.exchange in ("", "amq.default") else None
+        if queue is None:
+            return False
+        queue.messages.append(message)
+        self.stats["published"] += 1
+        self.dispatch(queue)
+        return True
+
+    def requeue(self, entries: List[Tuple[_Queue, _Message]]) -> None:
+        touched = []
+        for queue, message in reversed(entries):
+            if queue.name not in self.queues:
+                continue
+            message.redelivered = True
+            queue.messages.appendleft(message)
+            if queue not in touched:
+                touched.append(queue)
+        for queue in touched:
+            self.dispatch(queue)
+
+    def dispatch(self, queue: _Queue) -> None:
+        """Push ready messages to consumers round-robin, within each channel's prefetch window."""
+        while queue.messages and queue.consumers:
+            for offset in range(len(queue.consumers)):
+                index = (queue.next_consumer + offset) % len(queue.consumers)
+                consumer = queue.consumers[index]
+                if consumer.no_ack or consumer.channel.has_room():
+                    break
+            else:
+                return  # every consumer's window is full; acks resume dispatch
+            queue.next_consumer = index + 1
+            message = queue.messages.popleft()
+            ch = consumer.channel
+            ch.next_tag += 1
+            if not consumer.no_ack:
+                ch.unacked[ch.next_tag] = (queue, message)
+            self.stats["delivered"] += 1
+            ch.conn.send_content(
+                ch.number,
+                spec.Basic.Deliver(
+                    consumer_tag=consumer.tag,
+                    delivery_tag=ch.next_tag,
+                    redelivered=message.redelivered,
+                    exchange=message.exchange,
+                    routing_key=message.routing_key,
+                ),
+                message,
+            )
+
+
+class _Connection:
+    def __init__(self, broker: _Broker, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.broker = broker
+        self.reader = reader
+        self.writer = writer
+        self.channels: Dict[int, _Channel] = {}
+        self.frame_max = FRAME_MAX
+        self.heartbeat = 0
+        self.closing = False
+        self._out: List[bytes] = []
+
+    # -- output
+
+    def send_method(self, channel: int, method: Any) -> None:
+        self._out.append(amqp_frame.Method(channel, method).marshal())
+
+    def send_content(self, channel: int, method: Any, message: _Message) -> None:
+        self.send_method(channel, method)
+        self._out.append(amqp_frame.Header(channel, len(message.body), message.properties).marshal())
+        step = self.frame_max - 8  # frame header and end octet
+        for i in range(0, len(message.body), step):
+            self._out.append(amqp_frame.Body(channel, message.body[i : i + step]).marshal())
+
+    def flush(self) -> None:
+        if self._out and not self.writer.is_closing():
+            self.writer.write(b"".join(self._out))
+        self._out.clear()
+
+    # -- input
+
+    async def serve(self) -> None:
+        buffer = b""
+        heartbeats: Optional[asyncio.Task] = None
+        try:
+            while not self.closing:
+                data = await self.reader.read(FRAME_MAX)
+                if not data:
+                    break
+                buffer += data
+                while buffer:
+                    consumed, frame = amqp_frame.decode_frame(buffer)
+                    if frame is None:
+                        break
+                    buffer = buffer[consumed:]
+                    self.handle(frame)
+                    if self.heartbeat and heartbeats is None:
+                        heartbeats = asyncio.ensure_future(self._send_heartbeats())
+                self._confirm_publishes()
+                self.flush()
+                # Deliveries to this and other connections were queued by handle(): let them out.
+                for conn in self.broker.connections:
+                    conn.flush()
+                await self.writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if heartbeats is not None:
+                heartbeats.cancel()
+            self.close_all()
+
+    async def _send_heartbeats(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat / 2)
+            self._out.append(amqp_frame.Heartbeat().marshal())
+            self.flush()
+
+    def _confirm_publishes(self) -> None:
+        for ch in self.channels.values():
+            if ch.confirm and ch.published > ch.confirmed:
+                self.send_method(ch.number, spec.Basic.Ack(delivery_tag=ch.published, multiple=True))
+                self.broker.stats["confirms"] += 1
+                ch.confirmed = ch.published
+
+    def handle(self, frame: Any) -> None:
+        if isinstance(frame, amqp_frame.ProtocolHeader):
+            self.send_method(0, spec.Connection.Start(server_properties=_SERVER_PROPERTIES, mechanisms="PLAIN AMQPLAIN"))
+            return
+        if isinstance(frame, amqp_frame.Heartbeat):
+            return
+        if frame.channel_number == 0:
+            self._connection_method(frame.method)
+            return
+        ch = self.channels.get(frame.channel_number)
+        if ch is None:
+            if isinstance(frame, amqp_frame.Method) and isinstance(frame.method, spec.Channel.Open):
+                self.channels[frame.channel_number] = _Channel(self, frame.channel_number)
+                self.broker.stats["channels"] += 1
+                self.send_method(frame.channel_number, spec.Channel.OpenOk())
+            return
+        if ch.closing:
+            if isinstance(frame, amqp_frame.Method) and isinstance(frame.method, spec.Channel.CloseOk):
+                self._drop_channel(ch)
+            return
+        try:
+            if isinstance(frame, amqp_frame.Method):
+                self._channel_method(ch, frame.method)
+            elif isinstance(frame, amqp_frame.Header):
+                ch.header, ch.body, ch.body_size = frame.properties, [], frame.body_size
+                if frame.body_size == 0:
+                    self._publish(ch)
+            elif isinstance(frame, amqp_frame.Body):
+                ch.body.append(frame.fragment)
+                if sum(len(b) for b in ch.body) >= ch.body_size:
+                    self._publish(ch)
+        except ChannelError as exc:
+            m = exc.method
+            self.send_method(
+                ch.number,
+                spec.Channel.Close(
+                    reply_code=exc.code,
+                    reply_text=exc.text,
+                    class_id=m.INDEX >> 16 if m is not None else 0,
+                    method_id=m.INDEX & 0xFFFF if m is not None else 0,
+                ),
+            )
+            self._release_channel(ch)
+            ch.closing = True
+
+    def _connection_method(self, m: Any) -> None:
+        if isinstance(m, spec.Connection.StartOk):
+            self.send_method(0, spec.Connection.Tune(channel_max=CHANNEL_MAX, frame_max=FRAME_MAX, heartbeat=0))
+        elif isinstance(m, spec.Connection.TuneOk):
+            self.frame_max = min(m.frame_max or FRAME_MAX, FRAME_MAX)
+            self.heartbeat = m.heartbeat
+        elif isinstance(m, spec.Connection.Open):
+            self.send_method(0, spec.Connection.OpenOk())
+        elif isinstance(m, spec.Connection.Close):
+            self.send_method(0, spec.Connection.CloseOk())
+            self.closing = True
+        elif isinstance(m, spec.Connection.CloseOk):
+            self.closing = True
+
+    def _channel_method(self, ch: _Channel, m: Any) -> None:
+        broker = self.broker
+        if isinstance(m, spec.Basic.Publish):
+            if m.exchange not in ("", "amq.default"):
+                raise ChannelError(NOT_FOUND, f"NOT_FOUND - no exchange '{m.exchange}'", m)
+            ch.publish = m
+        elif isinstance(m, spec.Basic.Ack):
+            self._settle(ch, m.delivery_tag, m.multiple, m, requeue=None)
+        elif isinstance(m, spec.Basic.Nack):
+            self._settle(ch, m.delivery_tag, m.multiple, m, requeue=m.requeue)
+        elif isinstance(m, spec.Basic.Reject):
+            self._settle(ch, m.delivery_tag, False, m, requeue=m.requeue)
+        elif isinstance(m, spec.Basic.Qos):
+            ch.prefetch = m.prefetch_count
+            self.send_method(ch.number, spec.Basic.QosOk())
+            for queue in {c.queue.name: c.queue for c in ch.consumers.values()}.values():
+                broker.dispatch(queue)
+        elif isinstance(m, spec.Basic.Consume):
+            queue = broker.lookup(self, m.queue, m)
+            tag = m.consumer_tag or f"amq.ctag-{uuid.uuid4().hex[:22]}"
+            if tag in ch.consumers:
+                raise ChannelError(NOT_IMPLEMENTED, f"NOT_ALLOWED - attempt to reuse consumer tag '{tag}'", m)
+            consumer = _Consumer(tag, ch, queue, m.no_ack)
+            ch.consumers[tag] = consumer
+            queue.consumers.append(consumer)
+            queue.had_consumers = True
+            if not m.nowait:
+                self.send_method(ch.number, spec.Basic.ConsumeOk(consumer_tag=tag))
+            broker.dispatch(queue)
+        elif isinstance(m, spec.Basic.Cancel):
+            cancelled = ch.consumers.pop(m.consumer_tag, None)
+            if cancelled is not None:
+                broker.remove_consumer(cancelled)
+            if not m.nowait:
+                self.send_method(ch.number, spec.Basic.CancelOk(consumer_tag=m.consumer_tag))
+        elif isinstance(m, spec.Basic.Get):
+            queue = broker.lookup(self, m.queue, m)
+            if not queue.messages:
+                self.send_method(ch.number, spec.Basic.GetEmpty())
+                return
+            message = queue.messages.popleft()
+            ch.next_tag += 1
+            if not m.no_ack:
+                ch.unacked[ch.next_tag] = (queue, message)
+            broker.stats["delivered"] += 1
+            get_ok = spec.Basic.GetOk(
+                delivery_tag=ch.next_tag,
+                redelivered=message.redelivered,
+                exchange=message.exchange,
+                routing_key=message.routing_key,
+                message_count=len(queue.messages),
+            )
+            self.send_content(ch.number, get_ok, message)
+        elif isinstance(m, spec.Confirm.Select):
+            ch.confirm = True
+            if not m.nowait:
+                self.send_method(ch.number, spec.Confirm.SelectOk())
+        elif isinstance(m, spec.Queue.Declare):
+            queue = broker.declare(self, m)
+            if not m.nowait:
+                self.send_method(
+                    ch.number,
+                    spec.Queue.DeclareOk(
+                        queue=queue.name, message_count=len(queue.messages), consumer_count=len(queue.consumers)
+                    ),
+                )
+        elif isinstance(m, spec.Queue.Purge):
+            queue = broker.lookup(self, m.queue, m)
+            count = len(queue.messages)
+            queue.messages.clear()
+            if not m.nowait:
+                self.send_method(ch.number, spec.Queue.PurgeOk(message_count=count))
+        elif isinstance(m, spec.Queue.Delete):
+            existing = broker.queues.get(m.queue)
+            count = broker.delete(existing) if existing is not None else 0
+            if not m.nowait:
+                self.send_method(ch.number, spec.Queue.DeleteOk(message_count=count))
+        elif isinstance(m, spec.Channel.Flow):
+            self.send_method(ch.number, spec.Channel.FlowOk(active=m.active))
+        elif isinstance(m, spec.Channel.Close):
+            self.send_method(ch.number, spec.Channel.CloseOk())
+            self._release_channel(ch)
+            self._drop_channel(ch)
+        else:
+            raise ChannelError(NOT_IMPLEMENTED, f"NOT_IMPLEMENTED - {m.NAME} is not supported by the stand-in", m)
+
+    def _publish(self, ch: _Channel) -> None:
+        m = ch.publish
+        if m is None:
+            raise ChannelError(UNEXPECTED_FRAME, "UNEXPECTED_FRAME - content frame without basic.publish")
+        message = _Message(m.exchange, m.routing_key, ch.header, b"".join(ch.body))
+        ch.publish, ch.header, ch.body, ch.body_size = None, None, [], 0
+        if ch.confirm:
+            ch.published += 1
+        if not self.broker.route(message) and m.mandatory:
+            self.send_content(
+                ch.number,
+                spec.Basic.Return(
+                    reply_code=NO_ROUTE, reply_text="NO_ROUTE", exchange=m.exchange, routing_key=m.routing_key
+                ),
+                message,
+            )
+
+    def _settle(self, ch: _Channel, tag: int, multiple: bool, m: Any, *, requeue: Optional[bool]) -> None:
+        if multiple:
+            tags = [t for t in ch.unacked if t <= tag] if tag else list(ch.unacked)
+        elif tag in ch.unacked:
+            tags = [tag]
+        else:
+            raise ChannelError(PRECONDITION_FAILED, f"PRECONDITION_FAILED - unknown delivery tag {tag}", m)
+        entries = [ch.unacked.pop(t) for t in tags]
+        if requeue is None:
+            self.broker.stats["acked"] += len(entries)
+        elif requeue:
+            self.broker.stats["requeued"] += len(entries)
+            self.broker.requeue(entries)
+        for queue in {q.name: q for q, _ in entries}.values():
+            if queue.name in self.broker.queues:
+                self.broker.dispatch(queue)
+        for consumer in ch.consumers.values():
+            self.broker.dispatch(consumer.queue)
+
+    def _release_channel(self, ch: _Channel) -> None:
+        for consumer in list(ch.consumers.values()):
+            self.broker.remove_consumer(consumer)
+        ch.consumers.clear()
+        entries = list(ch.unacked.values())
+        ch.unacked.clear()
+        self.broker.requeue(entries)
+
+    def _drop_channel(self, ch: _Channel) -> None:
+        self.channels.pop(ch.number, None)
+
+    def close_all(self) -> None:
+        for ch in list(self.channels.values()):
+            self._release_channel(ch)
+        self.channels.clear()
+        for queue in [q for q in self.broker.queues.values() if q.owner is self]:
+            self.broker.delete(queue)
+        for conn in self.broker.connections:
+            if conn is not self:
+                conn.flush()
+        self.broker.connections.discard(self)
+        self.flush()
+        self.writer.close()
+
+
+async def start_broker(
+    host: str = "127.0.0.1", port: int = 0, *, stats: Optional[Counter] = None
+) -> asyncio.Server:
+    """``stats`` (if given) counts ``connections``, ``channels``, ``published``, ``delivered``,
+    ``acked``, ``requeued`` and ``confirms`` (basic.ack frames sent to publishers)."""
+    if spec is None:
+        raise RuntimeError("pika is not installed. Install requirements-messaging.txt to use the AMQP stand-in.")
+    broker = _Broker(stats if stats is not None else Counter())
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        broker.stats["connections"] += 1
+        conn = _Connection(broker, reader, writer)
+        broker.connections.add(conn)
+        await conn.serve()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+class LocalAmqpBroker(LocalServer):
+    """The stand-in broker on its own event loop in a daemon thread.
+
+    ``with LocalAmqpBroker() as broker: MessagingClient(MessagingConfig(amqp_url=broker.url))``;
+    ``port=0`` binds an ephemeral port.
+    """
+
+    name = "local AMQP broker"
+    start_server = staticmethod(start_broker)
+
+    @property
+    def url(self) -> str:
+        return f"amqp://guest:guest@{self.host}:{self.port}/%2F"
+
+
+def main() -> None:
+    local_server.main(LocalAmqpBroker, __doc__.splitlines()[0], default_port=5672)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,687 @@
+"""In-process httpbin stand-in for hermetic runs and load benchmarks.
+
+Run: python -m framework.local_httpbin --port 8080
+
+Implements the endpoints HttpBinApi and the suite use (``/anything``, ``/get``, ``/uuid``,
+``/headers``, ``/status/{codes}``, ``/delay/{n}``, ``/html``, ``/json``, ``/bytes/{n}``,
+``/stream/{n}``, ``/stream-bytes/{n}``, ``/cache[/{n}]``, ``/etag/{etag}``, ``/gzip``,
+``/deflate``) with httpbin's response shapes. It is a single
+asyncio event loop speaking HTTP/1.1 keep-alive over plain streams: ``/delay`` is an
+``asyncio.sleep``, so thousands of concurrent connections cost a coroutine each, not a thread.
+With ``h2`` installed, a connection opening with the HTTP/2 preface is served as h2c
+(prior knowledge), multiplexing its streams. Request bodies sent with
+``Content-Encoding: gzip | deflate | zstd`` are inflated before the handlers see them.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import gzip
+import json
+import logging
+import random
+import re
+import time
+import uuid
+import zlib
+from collections import Counter
+from email.parser import BytesParser
+from email.policy import HTTP
+from email.utils import collapse_rfc2231_value, formatdate
+from http.client import responses as _REASONS
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, cast
+from urllib.parse import parse_qsl, urlsplit
+
+from framework import local_server
+from framework.local_server import LocalServer
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.errors
+    import h2.events
+    import h2.exceptions
+except Exception:  # pragma: no cover
+    h2 = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+logger = logging.getLogger("framework.local_httpbin")
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 64 * 1024 * 1024
+# httpbin truncates generated bodies (/bytes, /stream-bytes) to 100 KB; so does the stand-in,
+# or tests written against it would break against the real service.
+MAX_GENERATED_BYTES = 100 * 1024
+MAX_DELAY_S = 10.0
+DEFAULT_STREAM_CHUNK = 10 * 1024
+
+
+_HTML = b"""<!DOCTYPE html>
+<html>
+  <head>
+  </head>
+  <body>
+      <h1>Herman Melville - Moby-Dick</h1>
+      <div>
+        <p>Availing himself of the mild, summer-cool weather that now reigned in these latitudes,
+        and in preparation for the peculiarly active pursuits shortly to be anticipated, Perth,
+        the begrimed, blistered old blacksmith, had not removed his portable forge to the hold
+        again, after concluding his contributory work for Ahab's leg.</p>
+      </div>
+  </body>
+</html>"""
+
+_SLIDESHOW = {
+    "slideshow": {
+        "author": "Yours Truly",
+        "date": "date of publication",
+        "slides": [
+            {"title": "Wake up to WonderWidgets!", "type": "all"},
+            {"items": ["Why <em>WonderWidgets</em> are great", "Who <em>buys</em> WonderWidgets"],
+             "title": "Overview", "type": "all"},
+        ],
+        "title": "Sample Slide Show",
+    }
+}
+
+
+class BadRequest(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    __slots__ = ("method", "target", "path", "query", "headers", "body", "peer")
+
+    def __init__(self, method: str, target: str, headers: List[Tuple[str, str]], body: bytes, peer: str) -> None:
+        self.method = method
+        self.target = target
+        parts = urlsplit(target)
+        self.path = parts.path or "/"
+        self.query = parts.query
+        self.headers = headers
+        self.body = body
+        self.peer = peer
+
+    def header(self, name: str, default: str = "") -> str:
+        name = name.lower()
+        for k, v in self.headers:
+            if k.lower() == name:
+                return v
+        return default
+
+
+class Response:
+    __slots__ = ("status", "headers", "body", "chunks")
+
+    def __init__(
+        self,
+        status: int = 200,
+        body: bytes = b"",
+        content_type: Optional[str] = None,
+        *,
+        headers: Optional[List[Tuple[str, str]]] = None,
+        chunks: Optional[List[bytes]] = None,
+    ) -> None:
+        self.status = status
+        self.body = body
+        self.headers = list(headers or [])
+        if content_type:
+            self.headers.append(("Content-Type", content_type))
+        # Set for streamed endpoints: sent with Transfer-Encoding: chunked, one chunk each.
+        self.chunks = chunks
+
+
+def _json_response(doc: Any, status: int = 200) -> Response:
+    return Response(status, json.dumps(doc, indent=2).encode() + b"\n", "application/json")
+
+
+# --- httpbin payload helpers -------------------------------------------------------------
+
+
+def _title(name: str) -> str:
+    return "-".join(part.capitalize() for part in name.split("-"))
+
+
+def _headers_doc(req: Request) -> Dict[str, str]:
+    # httpbin (werkzeug) reports title-cased names, repeated headers joined with commas.
+    out: Dict[str, str] = {}
+    for k, v in req.headers:
+        k = _title(k)
+        out[k] = f"{out[k]},{v}" if k in out else v
+    return out
+
+
+def _multi(pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
+    # A repeated key becomes a list, a single one stays a string (httpbin's convention).
+    out: Dict[str, Any] = {}
+    for k, v in pairs:
+        if k in out:
+            out[k] = out[k] + [v] if isinstance(out[k], list) else [out[k], v]
+        else:
+            out[k] = v
+    return out
+
+
+def _url(req: Request) -> str:
+    return f"http://{req.header('host', 'localhost')}{req.target}"
+
+
+def _parse_body(req: Request) -> Tuple[str, Dict[str, Any], Dict[str, Any], Any]:
+    """(data, form, files, json) as httpbin reports them."""
+    content_type = req.header("content-type").lower()
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return "", _multi(parse_qsl(req.body.decode("utf-8", "replace"), keep_blank_values=True)), {}, None
+    if content_type.startswith("multipart/form-data"):
+        msg = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: " + req.header("content-type").encode() + b"\r\n\r\n" + req.body
+        )
+        form: List[Tuple[str, str]] = []
+        files: List[Tuple[str, str]] = []
+        for part in msg.iter_parts():
+            name = collapse_rfc2231_value(part.get_param("name", header="content-disposition") or "")
+            payload = part.get_payload(decode=True)
+            target = files if part.get_filename() else form
+            target.append((name, payload.decode("utf-8", "replace") if isinstance(payload, bytes) else ""))
+        return "", _multi(form), _multi(files), None
+    data = req.body.decode("utf-8", "replace")
+    try:
+        parsed = json.loads(req.body) if req.body else None
+    except ValueError:
+        parsed = None
+    return data, {}, {}, parsed
+
+
+def _echo(req: Request, *, method: bool = True) -> Dict[str, Any]:
+    data, form, files, parsed = _parse_body(req)
+    doc: Dict[str, Any] = {
+        "args": _multi(parse_qsl(req.query, keep_blank_values=True)),
+        "data": data,
+        "files": files,
+        "form": form,
+        "headers": _headers_doc(req),
+        "json": parsed,
+    }
+    if method:
+        doc["method"] = req.method
+    doc["origin"] = req.peer
+    doc["url"] = _url(req)
+    return doc
+
+
+# --- handlers ---------------------------------------------------------------------------
+
+Handler = Callable[[Request, "re.Match[str]"], Awaitable[Response]]
+
+
+async def _anything(req: Request, m: "re.Match[str]") -> Response:
+    return _json_response(_echo(req))
+
+
+async def _get(req: Request, m: "re.Match[str]") -> Response:
+    doc = _echo(req)
+    return _json_response({k: doc[k] for k in ("args", "headers", "origin", "url")})
+
+
+async def _uuid(req: Request, m: "re.Match[str]") -> Response:
+    return _json_response({"uuid": str(uuid.uuid4())})
+
+
+async def _headers(req: Request, m: "re.Match[str]") -> Response:
+    return _json_response({"headers": _headers_doc(req)})
+
+
+async def _ip(req: Request, m: "re.Match[str]") -> Response:
+    return _json_response({"origin": req.peer})
+
+
+async def _user_agent(req: Request, m: "re.Match[str]") -> Response:
+    return _json_response({"user-agent": req.header("user-agent")})
+
+
+async def _status(req: Request, m: "re.Match[str]") -> Response:
+    # "/status/200,503" picks one at random; "/status/200:0.9,503:0.1" weighs the choice.
+    codes: List[int] = []
+    weights: List[float] = []
+    try:
+        for item in m.group(1).split(","):
+            code, _, weight = item.partition(":")
+            codes.append(int(code))
+            weights.append(float(weight) if weight else 1.0)
+    except ValueError:
+        raise BadRequest(400, "Invalid status code") from None
+    status = random.choices(codes, weights=weights)[0]
+    return Response(status, b"", "text/html; charset=utf-8")
+
+
+async def _delay(req: Request, m: "re.Match[str]") -> Response:
+    try:
+        delay = min(max(float(m.group(1)), 0.0), MAX_DELAY_S)
+    except ValueError:
+        raise BadRequest(400, "Invalid delay") from None
+    await asyncio.sleep(delay)
+    return _json_response(_echo(req, method=False))
+
+
+async def _cache(req: Request, m: "re.Match[str]") -> Response:
+    # Like httpbin: any conditional header gets a 304, otherwise fresh validators.
+    if req.header("if-modified-since") or req.header("if-none-match"):
+        return Response(304)
+    resp = await _get(req, m)
+    resp.headers += [("Last-Modified", formatdate(usegmt=True)), ("ETag", uuid.uuid4().hex)]
+    return resp
+
+
+async def _cache_for(req: Request, m: "re.Match[str]") -> Response:
+    resp = await _get(req, m)
+    resp.headers.append(("Cache-Control", f"public, max-age={int(m.group(1))}"))
+    return resp
+
+
+async def _etag(req: Request, m: "re.Match[str]") -> Response:
+    etag = m.group(1)
+    quoted = f'"{etag}"'
+    if_none_match = [t.strip() for t in req.header("if-none-match").split(",") if t.strip()]
+    if if_none_match and (quoted in if_none_match or etag in if_none_match or "*" in if_none_match):
+        return Response(304, headers=[("ETag", quoted)])
+    if_match = [t.strip() for t in req.header("if-match").split(",") if t.strip()]
+    if if_match and not (quoted in if_match or etag in if_match or "*" in if_match):
+        return Response(412)
+    resp = await _get(req, m)
+    resp.headers.append(("ETag", quoted))
+    return resp
+
+
+async def _html(req: Request, m: "re.Match[str]") -> Response:
+    return Response(200, _HTML, "text/html; charset=utf-8")
+
+
+async def _json_doc(req: Request, m: "re.Match[str]") -> Response:
+    return _json_response(_SLIDESHOW)
+
+
+async def _compressed(req: Request, m: "re.Match[str]") -> Response:
+    encoding = m.group(1)
+    doc = _echo(req)
+    flag = "gzipped" if encoding == "gzip" else "deflated"
+    resp = _json_response({flag: True, **{k: doc[k] for k in ("headers", "method", "origin")}})
+    if encoding == "gzip":
+        resp.body = gzip.compress(resp.body, mtime=0)
+    else:
+        resp.body = zlib.compress(resp.body)
+    resp.headers.append(("Content-Encoding", encoding))
+    return resp
+
+
+def _seeded(req: Request) -> random.Random:
+    seed = dict(parse_qsl(req.query)).get("seed")
+    try:
+        return random.Random(int(seed)) if seed is not None else random.Random()
+    except ValueError:
+        raise BadRequest(400, "Invalid seed") from None
+
+
+async def _bytes(req: Request, m: "re.Match[str]") -> Response:
+    n = min(int(m.group(1)), MAX_GENERATED_BYTES)
+    return Response(200, _seeded(req).randbytes(n), "application/octet-stream")
+
+
+async def _stream_bytes(req: Request, m: "re.Match[str]") -> Response:
+    n = min(int(m.group(1)), MAX_GENERATED_BYTES)
+    try:
+        chunk_size = max(1, int(dict(parse_qsl(req.query)).get("chunk_size", DEFAULT_STREAM_CHUNK)))
+    except ValueError:
+        raise BadRequest(400, "Invalid chunk_size") from None
+    # One randbytes() call, then slice: the body for a seed does not depend on chunk_size.
+    body = _seeded(req).randbytes(n)
+    chunks = [body[i : i + chunk_size] for i in range(0, n, chunk_size)]
+    return Response(200, content_type="application/octet-stream", chunks=chunks)
+
+
+async def _stream(req: Request, m: "re.Match[str]") -> Response:
+    n = min(int(m.group(1)), 100)
+    doc = _echo(req)
+    base = {k: doc[k] for k in ("url", "args", "headers", "origin")}
+    chunks = [json.dumps({**base, "id": i}).encode() + b"\n" for i in range(n)]
+    return Response(200, content_type="application/json", chunks=chunks)
+
+
+_ROUTES: List[Tuple["re.Pattern[str]", Handler]] = [
+    (re.compile(r"/anything(?:/.*)?"), _anything),
+    (re.compile(r"/get"), _get),
+    (re.compile(r"/(?:post|put|patch|delete)"), _anything),
+    (re.compile(r"/uuid"), _uuid),
+    (re.compile(r"/headers"), _headers),
+    (re.compile(r"/ip"), _ip),
+    (re.compile(r"/user-agent"), _user_agent),
+    (re.compile(r"/status/([^/]+)"), _status),
+    (re.compile(r"/delay/([^/]+)"), _delay),
+    (re.compile(r"/cache"), _cache),
+    (re.compile(r"/cache/(\d+)"), _cache_for),
+    (re.compile(r"/etag/([^/]+)"), _etag),
+    (re.compile(r"/html"), _html),
+    (re.compile(r"/json"), _json_doc),
+    (re.compile(r"/(gzip|deflate)"), _compressed),
+    (re.compile(r"/bytes/(\d+)"), _bytes),
+    (re.compile(r"/stream-bytes/(\d+)"), _stream_bytes),
+    (re.compile(r"/stream/(\d+)"), _stream),
+]
+
+
+_DECODE_ERRORS: Tuple[Type[BaseException], ...] = (zlib.error, ValueError) + (
+    (zstandard.ZstdError,) if zstandard else ()
+)
+
+
+def _decode_body(req: Request) -> None:
+    encoding = req.header("content-encoding").strip().lower()
+    if not req.body or encoding in ("", "identity"):
+        return
+    try:
+        if encoding in ("gzip", "deflate"):
+            # wbits 47: zlib or gzip header, detected. The cap stops decompression bombs.
+            inflater = zlib.decompressobj(wbits=47)
+            body = inflater.decompress(req.body, MAX_BODY_BYTES)
+            truncated = bool(inflater.unconsumed_tail)
+        elif encoding == "zstd" and zstandard is not None:
+            reader = zstandard.ZstdDecompressor().stream_reader(req.body)
+            body = reader.read(MAX_BODY_BYTES + 1)
+            truncated = len(body) > MAX_BODY_BYTES
+        else:
+            raise BadRequest(415, f"Unsupported Content-Encoding {encoding!r}")
+    except _DECODE_ERRORS as exc:
+        raise BadRequest(400, f"Invalid {encoding} body: {exc}") from None
+    if truncated:
+        raise BadRequest(413, "Request body too large")
+    req.body = body
+
+
+async def dispatch(req: Request) -> Response:
+    _decode_body(req)
+    for pattern, handler in _ROUTES:
+        m = pattern.fullmatch(req.path)
+        if m:
+            return await handler(req, m)
+    return Response(404, b"<h1>Not Found</h1>", "text/html; charset=utf-8")
+
+
+# --- HTTP/1.1 connection handling -------------------------------------------------------
+
+
+class _DateCache:
+    """``Date`` header value, formatted at most once per second."""
+
+    def __init__(self) -> None:
+        self._second = -1
+        self._value = ""
+
+    def get(self) -> str:
+        now = int(time.time())
+        if now != self._second:
+            self._second, self._value = now, formatdate(now, usegmt=True)
+        return self._value
+
+
+_DATE = _DateCache()
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: List[Tuple[str, str]]) -> bytes:
+    lowered = {k.lower(): v for k, v in headers}
+    if "chunked" in lowered.get("transfer-encoding", "").lower():
+        body = bytearray()
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                await reader.readuntil(b"\r\n")  # trailers are not supported beyond the blank line
+                return bytes(body)
+            if len(body) + size > MAX_BODY_BYTES:
+                raise BadRequest(413, "Request body too large")
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+    length = int(lowered.get("content-length", "0") or 0)
+    if length > MAX_BODY_BYTES:
+        raise BadRequest(413, "Request body too large")
+    return await reader.readexactly(length) if length else b""
+
+
+def _head(status: int, headers: List[Tuple[str, str]], keep_alive: bool) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}", f"Date: {_DATE.get()}", "Server: local-httpbin"]
+    lines += [f"{k}: {v}" for k, v in headers]
+    if not keep_alive:
+        lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _write_response(writer: asyncio.StreamWriter, resp: Response, head_only: bool, keep_alive: bool) -> None:
+    headers = resp.headers
+    if resp.chunks is not None:
+        writer.write(_head(resp.status, headers + [("Transfer-Encoding", "chunked")], keep_alive))
+        if not head_only:
+            for chunk in resp.chunks:
+                writer.write(b"%x\r\n%b\r\n" % (len(chunk), chunk))
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+    else:
+        writer.write(_head(resp.status, headers + [("Content-Length", str(len(resp.body)))], keep_alive))
+        if not head_only and resp.body:
+            writer.write(resp.body)
+    await writer.drain()
+
+
+# --- h2c (HTTP/2 prior knowledge) -------------------------------------------------------
+
+_H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+class _H2Connection:
+    """One h2c connection: a reader loop feeding h2, plus a task per request stream."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, peer: str) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.peer = peer
+        self.conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        self._streams: Dict[int, Tuple[List[Tuple[str, str]], bytearray]] = {}
+        self._tasks: Dict[int, "asyncio.Task[None]"] = {}
+        # Replaced on every WINDOW_UPDATE; senders out of flow-control credit wait on it.
+        self._window = asyncio.Event()
+
+    def _flush(self) -> None:
+        data = self.conn.data_to_send()
+        if data:
+            self.writer.write(data)
+
+    async def serve(self, stats: Counter) -> None:
+        self.conn.initiate_connection()
+        # The HTTP/1.1 request-line parser already consumed the preface.
+        self.conn.receive_data(_H2_PREFACE)
+        self._flush()
+        try:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    return
+                try:
+                    events = self.conn.receive_data(data)
+                except h2.exceptions.ProtocolError:
+                    self._flush()
+                    return
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        # header_encoding="utf-8" makes h2 hand the headers over as str.
+                        self._streams[event.stream_id] = (cast(List[Tuple[str, str]], event.headers), bytearray())
+                    elif isinstance(event, h2.events.DataReceived):
+                        self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                        pending = self._streams.get(event.stream_id)
+                        if pending is None:
+                            continue
+                        pending[1].extend(event.data)
+                        if len(pending[1]) > MAX_BODY_BYTES:
+                            del self._streams[event.stream_id]
+                            self.conn.reset_stream(event.stream_id, h2.errors.ErrorCodes.REFUSED_STREAM)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        if event.stream_id not in self._streams:
+                            continue
+                        headers, body = self._streams.pop(event.stream_id)
+                        stats["h2_streams"] += 1
+                        task = asyncio.create_task(self._respond(event.stream_id, headers, bytes(body)))
+                        self._tasks[event.stream_id] = task
+                        task.add_done_callback(functools.partial(self._forget_task, event.stream_id))
+                    elif isinstance(event, h2.events.StreamReset):
+                        self._streams.pop(event.stream_id, None)
+                        running = self._tasks.pop(event.stream_id, None)
+                        if running is not None:
+                            running.cancel()
+                    elif isinstance(event, (h2.events.WindowUpdated, h2.events.RemoteSettingsChanged)):
+                        self._window.set()
+                        self._window = asyncio.Event()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        self._flush()
+                        return
+                self._flush()
+                await self.writer.drain()
+        finally:
+            for task in list(self._tasks.values()):
+                task.cancel()
+
+    def _forget_task(self, stream_id: int, _task: "asyncio.Task[None]") -> None:
+        self._tasks.pop(stream_id, None)
+
+    async def _respond(self, stream_id: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+        pseudo = {k: v for k, v in headers if k.startswith(":")}
+        fields = [(k, v) for k, v in headers if not k.startswith(":")]
+        if ":authority" in pseudo:
+            fields.insert(0, ("host", pseudo[":authority"]))
+        method = pseudo.get(":method", "GET").upper()
+        target = pseudo.get(":path", "/")
+        try:
+            resp = await dispatch(Request(method, target, fields, body, self.peer))
+        except BadRequest as exc:
+            resp = Response(exc.status, str(exc).encode(), "text/plain")
+        except Exception:
+            logger.exception("local httpbin handler failed for %s %s", method, target)
+            resp = Response(500, b"Internal Server Error", "text/plain")
+
+        out = [(":status", str(resp.status)), ("date", _DATE.get()), ("server", "local-httpbin")]
+        out += [(k.lower(), v) for k, v in resp.headers]
+        if resp.chunks is None:
+            out.append(("content-length", str(len(resp.body))))
+        chunks = [] if method == "HEAD" else (resp.chunks if resp.chunks is not None else [resp.body])
+        try:
+            self.conn.send_headers(stream_id, out, end_stream=not any(chunks))
+            self._flush()
+            if any(chunks):
+                for chunk in chunks:
+                    await self._send_data(stream_id, chunk)
+                self.conn.end_stream(stream_id)
+                self._flush()
+            await self.writer.drain()
+        except (h2.exceptions.StreamClosedError, ConnectionError):
+            pass
+
+    async def _send_data(self, stream_id: int, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            window = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+            if window <= 0:
+                await self._window.wait()
+                continue
+            self.conn.send_data(stream_id, view[:window].tobytes())
+            view = view[window:]
+            self._flush()
+            await self.writer.drain()
+
+
+# --- connections ------------------------------------------------------------------------
+
+
+async def handle_connection(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, stats: Optional[Counter] = None
+) -> None:
+    peer = (writer.get_extra_info("peername") or ("127.0.0.1",))[0]
+    stats = stats if stats is not None else Counter()
+    stats["connections"] += 1
+    try:
+        while True:
+            try:
+                raw = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            if raw == _H2_PREFACE[:18]:
+                if h2 is None or await reader.readexactly(6) != _H2_PREFACE[18:]:
+                    return
+                stats["h2_connections"] += 1
+                await _H2Connection(reader, writer, peer).serve(stats)
+                return
+            stats["requests"] += 1
+            lines = raw[:-4].decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                await _write_response(writer, Response(400, b"Bad Request", "text/plain"), False, False)
+                return
+            headers = [(k.strip(), v.strip()) for k, _, v in (line.partition(":") for line in lines[1:] if line)]
+            connection = next((v.lower() for k, v in headers if k.lower() == "connection"), "")
+            keep_alive = "close" not in connection if version == "HTTP/1.1" else "keep-alive" in connection
+            if any(k.lower() == "expect" and v.lower() == "100-continue" for k, v in headers):
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            try:
+                body = await _read_body(reader, headers)
+                resp = await dispatch(Request(method.upper(), target, headers, body, peer))
+            except BadRequest as exc:
+                resp, keep_alive = Response(exc.status, str(exc).encode(), "text/plain"), exc.status != 413
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except Exception:
+                logger.exception("local httpbin handler failed for %s %s", method, target)
+                resp = Response(500, b"Internal Server Error", "text/plain")
+            await _write_response(writer, resp, method.upper() == "HEAD", keep_alive)
+            if not keep_alive:
+                return
+    except ConnectionError:
+        pass
+    except asyncio.CancelledError:
+        # Shutdown cancels open connections; on 3.11 asyncio logs a re-raised cancel as an error.
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(
+    host: str = "127.0.0.1", port: int = 0, *, backlog: int = 4096, stats: Optional[Counter] = None
+) -> asyncio.Server:
+    """``stats`` (if given) counts ``connections``, ``requests`` (HTTP/1.1), ``h2_connections``, ``h2_streams``."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await handle_connection(reader, writer, stats)
+
+    return await asyncio.start_server(handle, host, port, backlog=backlog, limit=MAX_HEADER_BYTES)
+
+
+class LocalHttpBin(LocalServer):
+    """The stand-in server on its own event loop in a daemon thread.
+
+    ``with LocalHttpBin() as server: HttpClient(ServiceConfig(base_url=server.url, ...))``;
+    ``port=0`` binds an ephemeral port. ``stats`` counts connections and requests served.
+    """
+
+    name = "local httpbin"
+    start_server = staticmethod(start_server)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+
+def main() -> None:
+    local_server.main(LocalHttpBin, __doc__.splitlines()[0], default_port=8080)
+
+
+if __name__ == "__main__":
+    main()
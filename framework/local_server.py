@@ -0,0 +1,113 @@
+"""Runs the in-process stand-ins (framework.local_httpbin, framework.local_amqp).
+
+Each is an ``asyncio.Server`` on its own event loop in a daemon thread, so synchronous tests
+and benchmarks can talk to it over a real socket; ``main`` serves one from the command line.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, List, Optional, Type, TypeVar
+
+logger = logging.getLogger("framework.local_server")
+
+_S = TypeVar("_S", bound="LocalServer")
+
+StartServer = Callable[..., Awaitable[asyncio.Server]]
+
+
+class LocalServer:
+    """A stand-in server on its own event loop in a daemon thread.
+
+    Subclasses set ``name`` and ``start_server = staticmethod(...)`` (called as
+    ``start_server(host, port, stats=...)``) and define ``url``. ``port=0`` binds an ephemeral
+    port; ``stats`` counts whatever the server counts (connections, requests, ...).
+    """
+
+    name = "local server"
+    start_server: StartServer
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.host = host
+        self.port = port
+        self.stats: Counter = Counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        raise NotImplementedError
+
+    def start(self: _S) -> _S:
+        ready = threading.Event()
+        failure: List[BaseException] = []
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self._loop = loop
+            try:
+                server = loop.run_until_complete(self.start_server(self.host, self.port, stats=self.stats))
+                self.port = server.sockets[0].getsockname()[1]
+            except BaseException as exc:
+                failure.append(exc)
+                ready.set()
+                loop.close()
+                return
+            self._server = server
+            ready.set()
+            try:
+                loop.run_forever()
+            finally:
+                server.close()
+                # Open keep-alive connections would otherwise outlive the loop.
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name=self.name.replace(" ", "-"), daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            raise failure[0]
+        logger.info("%s listening on %s:%d", self.name, self.host, self.port)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+        self._loop = self._thread = None
+
+    def __enter__(self: _S) -> _S:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main(server_cls: Type[LocalServer], description: str, default_port: int) -> None:
+    """``python -m`` entry point: serves ``server_cls`` in the foreground until interrupted."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=default_port)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def serve() -> None:
+        server = await server_cls.start_server(args.host, args.port)
+        port = server.sockets[0].getsockname()[1]
+        logger.info("%s listening on %s:%d", server_cls.name, args.host, port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
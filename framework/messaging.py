@@ -0,0 +1,337 @@
+"""RabbitMQ client for messaging checks: one connection per session, pooled channels,
+batched publishing with publisher confirms and push-based consumption.
+
+``publish_batch`` keeps up to ``confirm_batch`` messages in flight and waits once per batch
+for the broker's (usually ``multiple``) acks; ``collect`` consumes with ``basic_consume`` and
+a ``basic.qos`` prefetch window instead of polling ``basic_get``, acking in batches too
+(``consume`` streams the messages to a callback instead of collecting them).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set
+
+from framework.config import MessagingConfig
+
+try:
+    import pika
+    import pika.channel
+    from pika.exceptions import AMQPChannelError, AMQPConnectionError
+except Exception:  # pragma: no cover
+    pika = None
+    AMQPChannelError = AMQPConnectionError = Exception
+
+logger = logging.getLogger("framework.messaging")
+
+
+class PublishError(Exception):
+    """The broker nacked published messages or did not confirm them in time."""
+
+    def __init__(self, routing_key: str, unconfirmed: int, nacked: int) -> None:
+        super().__init__(f"{nacked} message(s) nacked, {unconfirmed} unconfirmed publishing to {routing_key!r}")
+        self.routing_key = routing_key
+        self.unconfirmed = unconfirmed
+        self.nacked = nacked
+
+
+class MessageTimeoutError(AssertionError):
+    """``collect`` hit its deadline before the expected number of messages arrived."""
+
+    def __init__(self, queue: str, expected: int, received: List["Message"], timeout_s: float) -> None:
+        super().__init__(f"Received {len(received)}/{expected} message(s) from {queue!r} within {timeout_s:g} s")
+        self.queue = queue
+        self.expected = expected
+        self.received = received
+
+
+@dataclass(frozen=True)
+class Message:
+    body: bytes
+    routing_key: str
+    properties: Any
+    redelivered: bool = False
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+def connection_parameters(cfg: MessagingConfig) -> "pika.URLParameters":
+    params = pika.URLParameters(cfg.amqp_url)
+    # Retries are ours (connect()): pika's own would sleep inside a single attempt.
+    params.connection_attempts = 1
+    params.retry_delay = 0
+    params.socket_timeout = cfg.socket_timeout_s
+    params.blocked_connection_timeout = cfg.blocked_timeout_s
+    params.heartbeat = cfg.heartbeat_s
+    return params
+
+
+def connect(cfg: MessagingConfig) -> "pika.BlockingConnection":
+    if pika is None:
+        raise RuntimeError("pika is not installed. Install requirements-messaging.txt to use messaging.")
+    params = connection_parameters(cfg)
+    attempts = max(1, cfg.connect_attempts)
+    for attempt in range(1, attempts + 1):
+        try:
+            return pika.BlockingConnection(params)
+        except AMQPConnectionError:
+            if attempt == attempts:
+                raise
+            logger.info("AMQP connect attempt %d/%d failed; retrying", attempt, attempts)
+            time.sleep(cfg.connect_retry_delay_s)
+    raise AssertionError("unreachable")
+
+
+def _impl_channel(ch: Any) -> Any:
+    """The async channel under a BlockingChannel, for batched publishing and confirms.
+
+    ``BlockingChannel._impl`` is private pika API (pinned in requirements-messaging.txt);
+    fail loudly rather than misbehave if a pika release changes it.
+    """
+    impl = getattr(ch, "_impl", None)
+    if not isinstance(impl, pika.channel.Channel):
+        raise RuntimeError(
+            f"pika {pika.__version__} has no BlockingChannel._impl channel; "
+            "install the version pinned in requirements-messaging.txt"
+        )
+    return impl
+
+
+def _encode(body: Any) -> bytes:
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+class _Confirms:
+    """Delivery tags published on the confirm channel and not yet acked or nacked."""
+
+    def __init__(self, connection: "pika.BlockingConnection") -> None:
+        self.connection = connection
+        self.selected = False
+        self.last_tag = 0
+        self.pending: Set[int] = set()
+        self.nacked = 0
+
+    def on_select_ok(self, _frame) -> None:
+        self.selected = True
+        self._wake()
+
+    def on_confirm(self, frame) -> None:
+        method = frame.method
+        tags = {t for t in self.pending if t <= method.delivery_tag} if method.multiple else {method.delivery_tag}
+        self.pending -= tags
+        if isinstance(method, pika.spec.Basic.Nack):
+            self.nacked += len(tags)
+        if not self.pending:
+            self._wake()
+
+    def _wake(self) -> None:
+        # Impl-level callbacks are not "ready events": without one, process_data_events
+        # would sit out its whole time_limit even though the batch is confirmed.
+        self.connection.add_callback_threadsafe(lambda: None)
+
+
+class MessagingClient:
+    """A session's RabbitMQ connection with a small pool of reusable channels.
+
+    ``with MessagingClient(cfg.messaging) as mq: mq.publish_batch(queue, events); mq.collect(queue, n)``.
+    The connection is opened on first use and re-opened after the broker drops it; channels a
+    broker error closed are discarded rather than returned to the pool. pika's
+    BlockingConnection is not thread-safe, so threads take turns on it (one lock).
+    """
+
+    def __init__(self, cfg: MessagingConfig) -> None:
+        self.cfg = cfg
+        self._lock = threading.RLock()
+        self._connection: Optional["pika.BlockingConnection"] = None
+        self._idle: List[Any] = []
+        self._publisher: Optional[Any] = None
+        self._confirms: Optional[_Confirms] = None
+
+    def connect(self) -> "pika.BlockingConnection":
+        with self._lock:
+            if self._connection is None or not self._connection.is_open:
+                self._connection = connect(self.cfg)
+                self._idle, self._publisher, self._confirms = [], None, None
+            return self._connection
+
+    @contextmanager
+    def channel(self) -> Iterator[Any]:
+        """A pooled channel for declares, purges and other one-off calls."""
+        with self._lock:
+            connection = self.connect()
+            ch = self._idle.pop() if self._idle else connection.channel()
+            try:
+                yield ch
+            finally:
+                if ch.is_open and connection.is_open and len(self._idle) < self.cfg.max_channels:
+                    self._idle.append(ch)
+                elif ch.is_open and connection.is_open:
+                    ch.close()
+
+    def declare_queue(
+        self, queue: str, *, durable: bool = False, auto_delete: bool = False, exclusive: bool = False
+    ) -> str:
+        with self.channel() as ch:
+            frame = ch.queue_declare(queue=queue, durable=durable, auto_delete=auto_delete, exclusive=exclusive)
+        name: str = frame.method.queue  # the broker's name when ``queue`` is ""
+        return name
+
+    def purge(self, queue: str) -> int:
+        with self.channel() as ch:
+            purged: int = ch.queue_purge(queue=queue).method.message_count
+        return purged
+
+    def publish(self, routing_key: str, body: Any, *, exchange: str = "", properties: Any = None) -> None:
+        self.publish_batch(routing_key, [body], exchange=exchange, properties=properties)
+
+    def publish_batch(
+        self,
+        routing_key: str,
+        bodies: Iterable[Any],
+        *,
+        exchange: str = "",
+        properties: Any = None,
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """Publish every body (bytes, str, or JSON-encoded otherwise) with publisher confirms.
+
+        Returns the number published once all of them are confirmed; raises PublishError if the
+        broker nacked any or a batch stayed unconfirmed for ``confirm_timeout_s``.
+        """
+        batch_size = max(1, batch_size or self.cfg.confirm_batch)
+        published = 0
+        with self._lock:
+            ch, confirms = self._confirm_channel()
+            impl = _impl_channel(ch)
+            in_flight = 0
+            for body in bodies:
+                props = properties
+                if props is None and not isinstance(body, (bytes, str)):
+                    props = pika.BasicProperties(content_type="application/json")
+                # The broker numbers confirms per channel from 1, in publish order.
+                confirms.last_tag += 1
+                confirms.pending.add(confirms.last_tag)
+                # Frames are only buffered here; the socket write happens once per batch in
+                # _await_confirms instead of a flush (and poll) per message in basic_publish.
+                impl.basic_publish(exchange=exchange, routing_key=routing_key, body=_encode(body), properties=props)
+                published += 1
+                in_flight += 1
+                if in_flight >= batch_size:
+                    self._await_confirms(routing_key, confirms)
+                    in_flight = 0
+            self._await_confirms(routing_key, confirms)
+        return published
+
+    def collect(
+        self, queue: str, count: int, *, timeout_s: float = 10.0, prefetch: Optional[int] = None
+    ) -> List[Message]:
+        """Consume ``count`` messages from ``queue`` as the broker pushes them, or raise MessageTimeoutError."""
+        received: List[Message] = []
+        self.consume(queue, received.append, count, timeout_s=timeout_s, prefetch=prefetch)
+        if len(received) < count:
+            raise MessageTimeoutError(queue, count, received, timeout_s)
+        return received
+
+    def consume(
+        self,
+        queue: str,
+        handler: Callable[[Message], Optional[bool]],
+        count: int,
+        *,
+        timeout_s: float = 10.0,
+        prefetch: Optional[int] = None,
+    ) -> int:
+        """Hand up to ``count`` pushed messages to ``handler``; returns how many arrived in time.
+
+        A handler that returns ``False`` rejects the message as not its own: it is acked (and so
+        dropped) but does not count towards ``count``. Messages are acked in batches of half the
+        prefetch window (so the broker never stalls on a full window); deliveries past ``count``
+        are handed back to the queue.
+        """
+        window = max(1, min(prefetch or self.cfg.prefetch, count))
+        ack_every = max(1, window // 2)
+        handled = 0
+        unacked: List[int] = []  # delivery tags handled but not acked yet
+
+        def on_message(ch, method, properties, body) -> None:
+            nonlocal handled
+            if handled >= count:
+                ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+                return
+            if handler(Message(body, method.routing_key, properties, method.redelivered)) is not False:
+                handled += 1
+            unacked.append(method.delivery_tag)
+            if len(unacked) >= ack_every or handled == count:
+                ch.basic_ack(delivery_tag=method.delivery_tag, multiple=True)
+                unacked.clear()
+
+        with self.channel() as ch:
+            ch.basic_qos(prefetch_count=window)
+            tag = ch.basic_consume(queue=queue, on_message_callback=on_message)
+            deadline = time.monotonic() + timeout_s
+            try:
+                while handled < count:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    ch.connection.process_data_events(time_limit=remaining)
+            finally:
+                if ch.is_open:
+                    if unacked:  # deadline hit mid-batch: what was handled is consumed
+                        ch.basic_ack(delivery_tag=unacked[-1], multiple=True)
+                    # Also nacks (requeues) deliveries that arrived but were never dispatched.
+                    ch.basic_cancel(tag)
+        return handled
+
+    def _confirm_channel(self):
+        connection = self.connect()
+        if self._publisher is not None and self._publisher.is_open:
+            return self._publisher, self._confirms
+        ch = connection.channel()
+        confirms = _Confirms(connection)
+        # BlockingChannel.confirm_delivery() makes every basic_publish wait for its own ack,
+        # one round trip per message. Registering on the underlying channel lets a whole
+        # batch be in flight and be confirmed together.
+        _impl_channel(ch).confirm_delivery(ack_nack_callback=confirms.on_confirm, callback=confirms.on_select_ok)
+        deadline = time.monotonic() + self.cfg.confirm_timeout_s
+        while not confirms.selected and time.monotonic() < deadline:
+            connection.process_data_events(time_limit=deadline - time.monotonic())
+        if not confirms.selected:
+            raise AMQPChannelError("Broker did not answer confirm.select")
+        self._publisher, self._confirms = ch, confirms
+        return ch, confirms
+
+    def _await_confirms(self, routing_key: str, confirms: _Confirms) -> None:
+        deadline = time.monotonic() + self.cfg.confirm_timeout_s
+        while confirms.pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            confirms.connection.process_data_events(time_limit=remaining)
+        nacked, confirms.nacked = confirms.nacked, 0
+        if confirms.pending or nacked:
+            unconfirmed = len(confirms.pending)
+            confirms.pending.clear()
+            raise PublishError(routing_key, unconfirmed, nacked)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._connection.is_open:
+                self._connection.close()
+            self._connection, self._idle, self._publisher, self._confirms = None, [], None, None
+
+    def __enter__(self) -> "MessagingClient":
+        self.connect()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
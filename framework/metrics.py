@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+import logging
+import re
+import threading
 import time
 from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    push_to_gateway,
+    pushadd_to_gateway,
+)
+from prometheus_client.metrics_core import Metric
+from prometheus_client.parser import text_string_to_metric_families
 
-from prometheus_client import CollectorRegistry, Counter, Histogram, push_to_gateway, pushadd_to_gateway
 
+logger = logging.getLogger("framework.metrics")
 
 REGISTRY = CollectorRegistry()
 
@@ -21,6 +38,20 @@ RETRY_COUNTER = Counter(
     registry=REGISTRY,
 )
 
+RETRY_BACKOFF_SECONDS = Counter(
+    "test_retry_backoff_seconds_total",
+    "Time spent sleeping in retry backoff.",
+    ["test_name"],
+    registry=REGISTRY,
+)
+
+RETRY_BUDGET_EXHAUSTED = Counter(
+    "test_retry_budget_exhausted_total",
+    "Calls that stopped retrying early because a retry budget ran out.",
+    ["budget"],
+    registry=REGISTRY,
+)
+
 TEST_DURATION = Histogram(
     "test_duration_seconds",
     "Test duration in seconds.",
@@ -28,6 +59,272 @@ TEST_DURATION = Histogram(
     registry=REGISTRY,
 )
 
+HTTP_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration per attempt (send to body fully read).",
+    ["method", "path_template", "status_class", "attempt"],
+    buckets=HTTP_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+HTTP_REQUEST_PHASE_DURATION = Histogram(
+    "http_request_phase_duration_seconds",
+    "HTTP request phases: connect (DNS+TCP+TLS), ttfb (request sent to headers), download (body).",
+    ["method", "path_template", "phase"],
+    buckets=HTTP_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+HTTP_POOL_CONNECTIONS_OPENED = Counter(
+    "http_pool_connections_opened_total",
+    "HTTP connections opened (fresh TCP/TLS handshakes) by the client pool.",
+    ["host"],
+    registry=REGISTRY,
+)
+
+HTTP_POOL_CONNECTIONS_REUSED = Counter(
+    "http_pool_connections_reused_total",
+    "Requests served on an already-open keep-alive connection from the pool.",
+    ["host"],
+    registry=REGISTRY,
+)
+
+HTTP_POOL_CONNECTIONS_DISCARDED = Counter(
+    "http_pool_connections_discarded_total",
+    "HTTP connections closed by the pool instead of being reused.",
+    ["host", "reason"],
+    registry=REGISTRY,
+)
+
+HTTP_POOL_CONNECTIONS_IN_USE = Gauge(
+    "http_pool_connections_in_use",
+    "HTTP connections currently checked out of the pool.",
+    ["host"],
+    registry=REGISTRY,
+)
+
+RATE_LIMIT_WAIT_SECONDS = Counter(
+    "http_rate_limit_wait_seconds_total",
+    "Time spent waiting for a client-side rate limiter token.",
+    ["host"],
+    registry=REGISTRY,
+)
+
+RATE_LIMIT_THROTTLED = Counter(
+    "http_rate_limit_throttled_total",
+    "Responses that signalled throttling (429/503) and lowered the client rate.",
+    ["host", "status"],
+    registry=REGISTRY,
+)
+
+RATE_LIMIT_RATE = Gauge(
+    "http_rate_limit_rate_per_second",
+    "Current adaptive client-side request rate.",
+    ["host"],
+    registry=REGISTRY,
+)
+
+CIRCUIT_STATE = Gauge(
+    "http_circuit_state",
+    "Circuit breaker state per endpoint: 0=closed, 1=half_open, 2=open.",
+    ["host", "endpoint"],
+    registry=REGISTRY,
+)
+
+CIRCUIT_TRANSITIONS = Counter(
+    "http_circuit_transitions_total",
+    "Circuit breaker state transitions.",
+    ["host", "endpoint", "from_state", "to_state"],
+    registry=REGISTRY,
+)
+
+ATTACHMENT_QUEUE_DEPTH = Gauge(
+    "allure_attachment_queue_depth",
+    "Allure attachments waiting for the background writer thread.",
+    registry=REGISTRY,
+)
+
+
+LOAD_THROUGHPUT = Gauge(
+    "load_throughput_rps",
+    "Completed requests per second in the last load run.",
+    ["scenario"],
+    registry=REGISTRY,
+)
+
+LOAD_ERROR_RATE = Gauge(
+    "load_error_ratio",
+    "Share of failed requests in the last load run.",
+    ["scenario"],
+    registry=REGISTRY,
+)
+
+LOAD_LATENCY = Gauge(
+    "load_latency_seconds",
+    "Latency percentiles of the last load run (measured from the scheduled send time).",
+    ["scenario", "quantile"],
+    registry=REGISTRY,
+)
+
+MESSAGING_THROUGHPUT = Gauge(
+    "messaging_throughput_messages_per_second",
+    "Messages per second in the last messaging benchmark, by direction (publish, consume).",
+    ["queue", "direction"],
+    registry=REGISTRY,
+)
+
+MESSAGING_LATENCY = Gauge(
+    "messaging_latency_seconds",
+    "End-to-end latency percentiles of the last messaging benchmark (scheduled publish to consume).",
+    ["queue", "quantile"],
+    registry=REGISTRY,
+)
+
+MESSAGING_LOST = Gauge(
+    "messaging_lost_messages",
+    "Messages the last messaging benchmark published but did not consume before its deadline.",
+    ["queue"],
+    registry=REGISTRY,
+)
+
+CASSETTE_REQUESTS = Counter(
+    "http_cassette_requests_total",
+    "Requests served by the record/replay transport, by outcome (recorded, hit, miss, verified, mismatch).",
+    ["mode", "outcome"],
+    registry=REGISTRY,
+)
+
+HTTP_CACHE_REQUESTS = Counter(
+    "http_cache_requests_total",
+    "Cacheable requests by outcome (hit, miss, revalidated, coalesced).",
+    ["outcome"],
+    registry=REGISTRY,
+)
+
+HTTP_CACHE_EVICTIONS = Counter(
+    "http_cache_evictions_total",
+    "Response cache entries dropped, by reason (capacity, expired).",
+    ["reason"],
+    registry=REGISTRY,
+)
+
+METRICS_DROPPED_SERIES = Counter(
+    "metrics_dropped_series_total",
+    "Label sets folded into the __overflow__ series because their metric hit its series budget.",
+    ["metric"],
+    registry=REGISTRY,
+)
+
+_CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+OVERFLOW_LABEL = "__overflow__"
+
+# Labels whose values grow with the suite (tests) or the API surface (endpoints); the
+# others (method, status class, attempt, phase) come from small fixed sets.
+_UNBOUNDED_LABELS = frozenset({"test_name", "path_template"})
+
+
+def _metric_name(metric: Any) -> str:
+    family = metric.describe()[0]
+    return f"{family.name}_total" if family.type == "counter" else family.name
+
+
+class SeriesBudget:
+    """Caps the label sets each metric may create; later ones share an ``__overflow__`` series.
+
+    Only the unbounded labels are replaced, so overflowed observations still count in totals
+    and keep their method and status class. ``metrics_dropped_series_total`` counts the label
+    sets folded away per metric (``dropped_counter``). Under xdist the budget applies per worker.
+    """
+
+    def __init__(self, max_series: int = 500, dropped_counter: Optional[Counter] = None) -> None:
+        self.max_series = max_series
+        self.dropped_counter = dropped_counter if dropped_counter is not None else METRICS_DROPPED_SERIES
+        self._lock = threading.Lock()
+        self._series: Dict[Any, Set[Tuple[str, ...]]] = {}
+        self._dropped: Dict[Any, Set[Tuple[str, ...]]] = {}
+
+    def labels(self, metric: Any, **labels: str) -> Any:
+        key = tuple(labels.values())
+        with self._lock:
+            seen = self._series.setdefault(metric, set())
+            if key not in seen:
+                if len(seen) < self.max_series:
+                    seen.add(key)
+                else:
+                    self._drop(metric, key)
+                    labels = {k: OVERFLOW_LABEL if k in _UNBOUNDED_LABELS else v for k, v in labels.items()}
+        return metric.labels(**labels)
+
+    def _drop(self, metric: Any, key: Tuple[str, ...]) -> None:
+        dropped = self._dropped.setdefault(metric, set())
+        if key in dropped:
+            return
+        dropped.add(key)
+        name = _metric_name(metric)
+        self.dropped_counter.labels(metric=name).inc()
+        if len(dropped) == 1:
+            logger.warning(
+                "%s reached its budget of %d series; new label sets go to %s", name, self.max_series, OVERFLOW_LABEL
+            )
+
+    def dropped(self) -> Dict[str, int]:
+        """Label sets folded into the overflow series so far, by metric name."""
+        with self._lock:
+            return {_metric_name(metric): len(keys) for metric, keys in self._dropped.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._dropped.clear()
+
+
+_SERIES_BUDGET = SeriesBudget()
+
+
+def configure_series_budget(max_series: int) -> SeriesBudget:
+    _SERIES_BUDGET.max_series = max_series
+    return _SERIES_BUDGET
+
+
+def get_series_budget() -> SeriesBudget:
+    return _SERIES_BUDGET
+
+
+def normalize_test_name(name: str) -> str:
+    """Function-level name for labels: every parametrised case of a test shares its series.
+
+    tests/smoke/test_formats.py::test_accept[application/json] -> tests/smoke/test_formats.py::test_accept
+    """
+    return name.split("[", 1)[0]
+
+
+_UUID_SEGMENT = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+_ID_SEGMENT = re.compile(r"^(?=.*\d)[0-9A-Za-z_-]{16,}$")
+_NUMBER_SEGMENT = re.compile(r"^\d+(\.\d+)?$")
+
+
+def path_template(path: str) -> str:
+    """Collapse variable URL segments so labels stay bounded: /status/503 -> /status/{n}.
+
+    Absolute URLs are reduced to their path first, so the host never ends up in the label.
+    """
+    if "://" in path:
+        path = urlsplit(path).path
+    path = path.split("?", 1)[0].split("#", 1)[0]
+    segments = []
+    for seg in path.split("/"):
+        if _NUMBER_SEGMENT.match(seg):
+            seg = "{n}"
+        elif _UUID_SEGMENT.match(seg):
+            seg = "{uuid}"
+        elif _ID_SEGMENT.match(seg):
+            seg = "{id}"
+        segments.append(seg)
+    return "/".join(segments) or "/"
+
 
 @contextmanager
 def track_test_duration(test_name: str):
@@ -35,7 +332,9 @@ def track_test_duration(test_name: str):
     try:
         yield
     finally:
-        TEST_DURATION.labels(test_name=test_name).observe(time.perf_counter() - start)
+        _SERIES_BUDGET.labels(TEST_DURATION, test_name=normalize_test_name(test_name)).observe(
+            time.perf_counter() - start
+        )
 
 
 def set_current_test_name(name: str) -> None:
@@ -49,8 +348,160 @@ def get_current_test_name() -> str:
 def inc_retry(test_name: Optional[str] = None, n: int = 1) -> None:
     if n <= 0:
         return
-    name = test_name or get_current_test_name()
-    RETRY_COUNTER.labels(test_name=name).inc(n)
+    name = normalize_test_name(test_name or get_current_test_name())
+    _SERIES_BUDGET.labels(RETRY_COUNTER, test_name=name).inc(n)
+
+
+def observe_backoff(seconds: float, test_name: Optional[str] = None) -> None:
+    if seconds <= 0:
+        return
+    name = normalize_test_name(test_name or get_current_test_name())
+    _SERIES_BUDGET.labels(RETRY_BACKOFF_SECONDS, test_name=name).inc(seconds)
+
+
+def inc_retry_budget_exhausted(budget: str) -> None:
+    RETRY_BUDGET_EXHAUSTED.labels(budget=budget).inc()
+
+
+def observe_circuit_transition(host: str, endpoint: str, from_state: str, to_state: str) -> None:
+    CIRCUIT_TRANSITIONS.labels(host=host, endpoint=endpoint, from_state=from_state, to_state=to_state).inc()
+    CIRCUIT_STATE.labels(host=host, endpoint=endpoint).set(_CIRCUIT_STATE_VALUES[to_state])
+
+
+def status_class(status_code: Optional[int]) -> str:
+    return f"{status_code // 100}xx" if status_code else "error"
+
+
+def observe_http_request(
+    method: str,
+    endpoint: str,
+    status_code: Optional[int],
+    attempt: int,
+    duration_s: float,
+    phases: Optional[dict] = None,
+) -> None:
+    method = method.upper()
+    _SERIES_BUDGET.labels(
+        HTTP_REQUEST_DURATION,
+        method=method,
+        path_template=endpoint,
+        status_class=status_class(status_code),
+        attempt=str(attempt),
+    ).observe(duration_s)
+    for phase, seconds in (phases or {}).items():
+        _SERIES_BUDGET.labels(
+            HTTP_REQUEST_PHASE_DURATION, method=method, path_template=endpoint, phase=phase
+        ).observe(seconds)
+
+
+def inc_cassette(mode: str, outcome: str) -> None:
+    CASSETTE_REQUESTS.labels(mode=mode, outcome=outcome).inc()
+
+
+def inc_cache(outcome: str) -> None:
+    HTTP_CACHE_REQUESTS.labels(outcome=outcome).inc()
+
+
+def inc_cache_eviction(reason: str, n: int = 1) -> None:
+    HTTP_CACHE_EVICTIONS.labels(reason=reason).inc(n)
+
+
+def inc_pool_connection(event: str, host: str, reason: str = "") -> None:
+    """Record a pool event: "opened", "reused" or "discarded" (with a reason)."""
+    if event == "opened":
+        HTTP_POOL_CONNECTIONS_OPENED.labels(host=host).inc()
+    elif event == "reused":
+        HTTP_POOL_CONNECTIONS_REUSED.labels(host=host).inc()
+    elif event == "discarded":
+        HTTP_POOL_CONNECTIONS_DISCARDED.labels(host=host, reason=reason or "unknown").inc()
+
+
+def track_pool_checkout(host: str, delta: int) -> None:
+    HTTP_POOL_CONNECTIONS_IN_USE.labels(host=host).inc(delta)
+
+
+def observe_rate_limit(
+    host: str,
+    *,
+    wait_s: float = 0.0,
+    rate: Optional[float] = None,
+    throttled_status: Optional[int] = None,
+) -> None:
+    if wait_s > 0:
+        RATE_LIMIT_WAIT_SECONDS.labels(host=host).inc(wait_s)
+    if rate is not None:
+        RATE_LIMIT_RATE.labels(host=host).set(rate)
+    if throttled_status is not None:
+        RATE_LIMIT_THROTTLED.labels(host=host, status=str(throttled_status)).inc()
+
+
+def set_load_summary(
+    scenario: str,
+    *,
+    throughput_rps: float,
+    error_rate: float,
+    latency_s: Dict[str, float],
+) -> None:
+    LOAD_THROUGHPUT.labels(scenario=scenario).set(throughput_rps)
+    LOAD_ERROR_RATE.labels(scenario=scenario).set(error_rate)
+    for quantile, value in latency_s.items():
+        LOAD_LATENCY.labels(scenario=scenario, quantile=quantile).set(value)
+
+
+def set_messaging_summary(
+    queue: str,
+    *,
+    publish_rate: float,
+    consume_rate: float,
+    lost: int,
+    latency_s: Dict[str, float],
+) -> None:
+    MESSAGING_THROUGHPUT.labels(queue=queue, direction="publish").set(publish_rate)
+    MESSAGING_THROUGHPUT.labels(queue=queue, direction="consume").set(consume_rate)
+    MESSAGING_LOST.labels(queue=queue).set(lost)
+    for quantile, value in latency_s.items():
+        MESSAGING_LATENCY.labels(queue=queue, quantile=quantile).set(value)
+
+
+def dump_metrics(path: str | Path, registry: CollectorRegistry = REGISTRY) -> Path:
+    """Write the registry in text exposition format (used by parallel workers)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(generate_latest(registry))
+    tmp.replace(path)
+    return path
+
+
+class _WorkerMetricsCollector:
+    """Re-exposes metrics dumped by several workers as one set of families with a ``worker`` label."""
+
+    def __init__(self, dumps: Dict[str, str]) -> None:
+        self._families: Dict[str, Metric] = {}
+        for worker, text in sorted(dumps.items()):
+            for family in text_string_to_metric_families(text):
+                if family.name.endswith("_created") and family.type == "gauge":
+                    # *_created timestamps are per-process noise once merged.
+                    continue
+                merged = self._families.get(family.name)
+                if merged is None:
+                    merged = Metric(family.name, family.documentation, family.type, family.unit)
+                    self._families[family.name] = merged
+                for sample in family.samples:
+                    if sample.name.endswith("_created"):
+                        continue
+                    merged.add_sample(sample.name, {**sample.labels, "worker": worker}, sample.value)
+
+    def collect(self) -> Iterable[Metric]:
+        return list(self._families.values())
+
+
+def merge_worker_metrics(paths: Iterable[str | Path]) -> CollectorRegistry:
+    """Build a registry holding every worker dump; the worker label is the file stem (e.g. gw0)."""
+    dumps = {Path(p).stem: Path(p).read_text(encoding="utf-8") for p in paths}
+    registry = CollectorRegistry()
+    registry.register(_WorkerMetricsCollector(dumps))
+    return registry
 
 
 def push_metrics(
@@ -59,6 +510,8 @@ def push_metrics(
     grouping_key: Optional[dict] = None,
     *,
     mode: str = "add",
+    registry: CollectorRegistry = REGISTRY,
+    timeout_s: Optional[float] = 30,
 ) -> None:
     """Push collected metrics to Pushgateway.
 
@@ -69,6 +522,6 @@ def push_metrics(
 
     key = grouping_key or {}
     if mode == "replace":
-        push_to_gateway(pushgateway_url, job=job_name, registry=REGISTRY, grouping_key=key)
+        push_to_gateway(pushgateway_url, job=job_name, registry=registry, grouping_key=key, timeout=timeout_s)
     else:
-        pushadd_to_gateway(pushgateway_url, job=job_name, registry=REGISTRY, grouping_key=key)
+        pushadd_to_gateway(pushgateway_url, job=job_name, registry=registry, grouping_key=key, timeout=timeout_s)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from prometheus_client import CollectorRegistry, pushadd_to_gateway, start_http_server
+from prometheus_client.metrics_core import Metric
+
+from framework.metrics import dump_metrics
+
+logger = logging.getLogger("framework.metrics_exporter")
+
+RegistrySource = Callable[[], CollectorRegistry]
+
+_Signature = Tuple[Tuple[str, Tuple[Tuple[str, str], ...], float], ...]
+
+
+def _signature(family: Metric) -> _Signature:
+    return tuple((s.name, tuple(sorted(s.labels.items())), s.value) for s in family.samples)
+
+
+class _Families:
+    """A fixed set of already-collected families, registrable as a collector."""
+
+    def __init__(self, families: List[Metric]) -> None:
+        self._families = families
+
+    def collect(self) -> Iterable[Metric]:
+        return list(self._families)
+
+
+class _LiveCollector:
+    """Collects from ``source()`` on every scrape (the merged worker dumps change under xdist)."""
+
+    def __init__(self, source: RegistrySource) -> None:
+        self._source = source
+
+    def collect(self) -> Iterable[Metric]:
+        return list(self._source().collect())
+
+
+class MetricsExporter:
+    """Exports a registry every ``interval_s`` from a daemon thread while the tests run.
+
+    Each tick writes ``dump_path`` (xdist workers, for the controller to merge) and/or
+    ``pushadd``s to Pushgateway the families whose samples changed since the last successful
+    push: Pushgateway keeps the others, counters stay cumulative, and a quiet run sends
+    almost nothing. Pushes time out after ``timeout_s``, so a slow gateway costs the exporter
+    thread a tick, never a test. A failed push leaves its families pending for the next tick;
+    ``stop`` runs one final export (also registered with atexit), so a crash loses at most
+    ``interval_s`` of data.
+    """
+
+    def __init__(
+        self,
+        source: RegistrySource,
+        *,
+        interval_s: float,
+        pushgateway_url: Optional[str] = None,
+        job_name: str = "",
+        grouping_key: Optional[dict] = None,
+        timeout_s: float = 5.0,
+        dump_path: Optional[str | Path] = None,
+    ) -> None:
+        if interval_s <= 0:
+            raise ValueError("interval_s must be positive")
+        self.source = source
+        self.interval_s = interval_s
+        self.pushgateway_url = pushgateway_url
+        self.job_name = job_name
+        self.grouping_key = dict(grouping_key or {})
+        self.timeout_s = timeout_s
+        self.dump_path = Path(dump_path) if dump_path else None
+        self.pushes = 0
+        self.failures = 0
+        self._pushed: Dict[str, _Signature] = {}
+        self._tick_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricsExporter":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.export()
+
+    def export(self, *, full: bool = False) -> bool:
+        """One tick: dump and/or push what changed (everything with ``full``). False if the push failed."""
+        with self._tick_lock:
+            try:
+                registry = self.source()
+                if self.dump_path is not None:
+                    dump_metrics(self.dump_path, registry)
+                url = self.pushgateway_url
+                return self._push_changed(url, registry, full=full) if url else True
+            except Exception as exc:
+                self.failures += 1
+                logger.debug("Metrics export failed: %s", exc)
+                return False
+
+    def _push_changed(self, url: str, registry: CollectorRegistry, *, full: bool) -> bool:
+        changed: List[Metric] = []
+        signatures: Dict[str, _Signature] = {}
+        for family in registry.collect():
+            sig = _signature(family)
+            if full or self._pushed.get(family.name) != sig:
+                changed.append(family)
+                signatures[family.name] = sig
+        if not changed:
+            return True
+        delta = CollectorRegistry()
+        delta.register(_Families(changed))
+        pushadd_to_gateway(
+            url,
+            job=self.job_name,
+            registry=delta,
+            grouping_key=self.grouping_key,
+            timeout=self.timeout_s,
+        )
+        self._pushed.update(signatures)
+        self.pushes += 1
+        return True
+
+    def stop(self, *, final: bool = True) -> None:
+        """Stop the thread (waiting out at most one push) and, with ``final``, export everything once more.
+
+        The final push is complete rather than a delta, so the group is whole again even if the
+        gateway restarted (and lost its state) during the run.
+        """
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        atexit.unregister(self.stop)
+        self._stop.set()
+        thread.join(timeout=self.timeout_s + 1)
+        if final:
+            self.export(full=True)
+
+
+def serve_metrics(port: int, source: RegistrySource, addr: str = "0.0.0.0"):
+    """Serve ``source()`` at ``http://addr:port/metrics`` for Prometheus to scrape; returns the server."""
+    registry = CollectorRegistry()
+    registry.register(_LiveCollector(source))
+    server, _thread = start_http_server(port, addr=addr, registry=registry)
+    logger.info("Serving metrics on http://%s:%d/metrics", addr, server.server_port)
+    return server
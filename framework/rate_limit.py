@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from framework.clock import SYSTEM_CLOCK, Clock
+from framework.config import RateLimitConfig
+from framework.metrics import observe_rate_limit
+
+logger = logging.getLogger("framework.rate_limit")
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date); None if unusable."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket with AIMD rate adaptation.
+
+    Callers reserve a token under a short lock and sleep *outside* it, so the same bucket
+    serves worker threads (``acquire``) and coroutines (``acquire_async``). The rate is cut
+    by ``decrease_factor`` on 429/503 and recovers by ``recovery_step`` per successful
+    response; a Retry-After header blocks every caller until it has elapsed (at most
+    ``max_retry_after_s``, like RetryPolicy). Time and sleeps come from ``clock``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate_per_s: float,
+        burst: int,
+        *,
+        min_rate_per_s: float = 1.0,
+        decrease_factor: float = 0.5,
+        recovery_step: Optional[float] = None,
+        max_retry_after_s: float = 30.0,
+        clock: Clock = SYSTEM_CLOCK,
+    ) -> None:
+        self.host = host
+        self.max_rate = float(rate_per_s)
+        self.min_rate = min(float(min_rate_per_s), self.max_rate)
+        self.burst = max(1, int(burst))
+        self.decrease_factor = decrease_factor
+        self.recovery_step = recovery_step if recovery_step is not None else self.max_rate / 20
+        self.max_retry_after_s = max_retry_after_s
+        self.clock = clock
+        self.rate = self.max_rate
+        self._tokens = float(self.burst)
+        self._updated = clock.now()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = self.clock.now()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            observe_rate_limit(self.host, wait_s=wait)
+            self.clock.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            observe_rate_limit(self.host, wait_s=wait)
+            await self.clock.asleep(wait)
+        return wait
+
+    def on_response(self, status_code: int, retry_after: Optional[str] = None) -> None:
+        with self._lock:
+            now = self.clock.now()
+            self._refill(now)
+            if status_code in THROTTLE_STATUSES:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    delay = min(delay, self.max_retry_after_s)
+                    self._blocked_until = max(self._blocked_until, now + delay)
+                throttled = True
+            elif status_code < 400 and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.recovery_step)
+                throttled = False
+            else:
+                return
+            rate = self.rate
+        if throttled:
+            logger.warning("Throttled by %s (HTTP %s): rate lowered to %.2f req/s", self.host, status_code, rate)
+        observe_rate_limit(self.host, rate=rate, throttled_status=status_code if throttled else None)
+
+
+_LIMITERS: Dict[Tuple[str, int], TokenBucket] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_limiter(host: str, cfg: RateLimitConfig, clock: Clock = SYSTEM_CLOCK) -> Optional[TokenBucket]:
+    """Process-wide limiter for ``host``; every client talking to that host on ``clock`` shares it.
+
+    A client on a VirtualClock gets its own bucket: virtual time must not pace real callers.
+    """
+    if not cfg.enabled:
+        return None
+    key = (host, id(clock))
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            overrides = cfg.hosts.get(host, {})
+            limiter = TokenBucket(
+                host,
+                rate_per_s=float(overrides.get("rate_per_s", cfg.rate_per_s)),
+                burst=int(overrides.get("burst", cfg.burst)),
+                min_rate_per_s=float(overrides.get("min_rate_per_s", cfg.min_rate_per_s)),
+                max_retry_after_s=cfg.max_retry_after_s,
+                clock=clock,
+            )
+            _LIMITERS[key] = limiter
+        return limiter
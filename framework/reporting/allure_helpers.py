@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Tuple
 
-import requests
+from framework.reporting.attachment_pipeline import get_pipeline
+from framework.streaming import is_unread_stream
 
 try:
     import allure
@@ -11,6 +12,19 @@ except Exception:  # pragma: no cover
     allure = None
 
 
+class _Response(Protocol):
+    """The part of a response attach_response reads: requests and httpx both fit."""
+
+    @property
+    def status_code(self) -> int: ...
+
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+
+    @property
+    def content(self) -> bytes: ...
+
+
 def _safe_json(obj: Any) -> str:
     try:
         return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True)
@@ -18,6 +32,103 @@ def _safe_json(obj: Any) -> str:
         return str(obj)
 
 
+def _truncate(raw: bytes, max_bytes: int) -> Tuple[str, bool]:
+    truncated = len(raw) > max_bytes
+    text = raw[:max_bytes].decode("utf-8", errors="replace")
+    if truncated:
+        text += "\n...<truncated>..."
+    return text, truncated
+
+
+# iterencode() without _one_shot is the lazy pure-Python encoder: it can stop at the cap.
+_SNAPSHOT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _snapshot(obj: Any, max_bytes: int) -> bytes:
+    """Compact JSON (or ``str``) of ``obj`` cut to ``max_bytes + 1`` bytes.
+
+    Taken on the caller's thread, so a dict changed or reused after the request can't change
+    (or break) what gets attached; the extra byte tells the renderer whether it was cut.
+    Serialisation stops once the cap is reached, so a 4 MB payload costs about as much as
+    the capped prefix.
+    """
+    limit = max_bytes + 1
+    if isinstance(obj, bytes):
+        return obj[:limit]
+    if isinstance(obj, (dict, list, tuple)):
+        buf = bytearray()
+        try:
+            for chunk in _SNAPSHOT_ENCODER.iterencode(obj):
+                buf += chunk.encode("utf-8")
+                if len(buf) >= limit:
+                    break
+            return bytes(buf[:limit])
+        except Exception:
+            pass
+    return str(obj)[:limit].encode("utf-8")[:limit]
+
+
+def _render_json(raw: bytes, max_body_bytes: int, *, sort_keys: bool = False) -> Tuple[str, Any]:
+    """Pretty-print a snapshot if it is whole; a cut one can't be parsed and stays as text."""
+    text, truncated = _truncate(raw, max_body_bytes)
+    if not truncated:
+        try:
+            pretty = json.dumps(json.loads(text), ensure_ascii=False, indent=2, sort_keys=sort_keys)
+            return pretty, allure.attachment_type.JSON
+        except ValueError:
+            pass
+    return text, allure.attachment_type.TEXT
+
+
+def _render_request(
+    method: str,
+    url: str,
+    headers: Optional[Dict[str, Any]],
+    params: Optional[bytes],
+    body: Optional[bytes],
+    body_is_json: bool,
+    max_body_bytes: int,
+) -> List[Tuple[str, str, Any]]:
+    out = [
+        (method.upper(), "request.method", allure.attachment_type.TEXT),
+        (url, "request.url", allure.attachment_type.TEXT),
+    ]
+    if headers:
+        out.append((_safe_json(headers), "request.headers", allure.attachment_type.JSON))
+    if params is not None:
+        text, kind = _render_json(params, max_body_bytes, sort_keys=True)
+        out.append((text, "request.params", kind))
+    if body is not None:
+        if body_is_json:
+            text, kind = _render_json(body, max_body_bytes)
+        else:
+            text, _ = _truncate(body, max_body_bytes)
+            kind = allure.attachment_type.TEXT
+        out.append((text, "request.body", kind))
+    return out
+
+
+def _render_response(
+    status_code: int,
+    headers: Dict[str, Any],
+    raw: bytes,
+    max_body_bytes: int,
+    streamed: bool = False,
+) -> List[Tuple[str, str, Any]]:
+    out = [(str(status_code), "response.status", allure.attachment_type.TEXT)]
+    if headers:
+        out.append((_safe_json(headers), "response.headers", allure.attachment_type.JSON))
+
+    text, truncated = _truncate(raw, max_body_bytes)
+    content_type = str(headers.get("Content-Type") or headers.get("content-type") or "")
+    if "json" in content_type and not truncated and not streamed:
+        # The server already serialised it; attach as-is rather than parse + re-dump.
+        out.append((text, "response.body.json", allure.attachment_type.JSON))
+    else:
+        out.append((text, "response.body", allure.attachment_type.TEXT))
+    return out
+
+
 def attach_request(
     method: str,
     url: str,
@@ -27,38 +138,39 @@ def attach_request(
 ) -> None:
     if allure is None:
         return
-    allure.attach(method.upper(), name="request.method", attachment_type=allure.attachment_type.TEXT)
-    allure.attach(url, name="request.url", attachment_type=allure.attachment_type.TEXT)
-    if headers:
-        allure.attach(_safe_json(dict(headers)), name="request.headers", attachment_type=allure.attachment_type.JSON)
-    if params:
-        allure.attach(_safe_json(dict(params)), name="request.params", attachment_type=allure.attachment_type.JSON)
-    if body is not None:
-        if isinstance(body, (dict, list)):
-            allure.attach(_safe_json(body), name="request.body", attachment_type=allure.attachment_type.JSON)
-        else:
-            allure.attach(str(body), name="request.body", attachment_type=allure.attachment_type.TEXT)
+    pipeline = get_pipeline()
+    if not pipeline.enabled:
+        return
+    # Snapshots capped to max_body_bytes are all that is taken here; pretty-printing (of the
+    # capped snapshot only) runs on the pipeline's writer thread.
+    cap = pipeline.max_body_bytes
+    pipeline.submit(
+        _render_request,
+        method,
+        url,
+        dict(headers) if headers else None,
+        _snapshot(dict(params) if isinstance(params, dict) else params, cap) if params else None,
+        _snapshot(body, cap) if body is not None else None,
+        isinstance(body, (dict, list)),
+        cap,
+    )
 
 
-def attach_response(resp: requests.Response, max_body_chars: int = 10000) -> None:
+def attach_response(resp: _Response, max_body_chars: Optional[int] = None) -> None:
     if allure is None:
         return
-    allure.attach(str(resp.status_code), name="response.status", attachment_type=allure.attachment_type.TEXT)
-    try:
-        allure.attach(_safe_json(dict(resp.headers)), name="response.headers", attachment_type=allure.attachment_type.JSON)
-    except Exception:
-        pass
-
-    try:
-        body = resp.text or ""
-    except Exception:
-        body = "<unreadable>"
-
-    if len(body) > max_body_chars:
-        body = body[:max_body_chars] + "\n...<truncated>..."
-
-    try:
-        j = resp.json()
-        allure.attach(_safe_json(j), name="response.body.json", attachment_type=allure.attachment_type.JSON)
-    except Exception:
-        allure.attach(body, name="response.body", attachment_type=allure.attachment_type.TEXT)
+    pipeline = get_pipeline()
+    if not pipeline.enabled:
+        return
+    cap = max_body_chars if max_body_chars is not None else pipeline.max_body_bytes
+    streamed = is_unread_stream(resp)
+    if streamed:
+        # Reading it here would buffer the whole body the caller chose to stream.
+        raw = b"<streamed body not captured>"
+    else:
+        try:
+            # One extra byte tells the renderer whether the body was cut.
+            raw = (resp.content or b"")[: cap + 1]
+        except Exception:
+            raw = b"<unreadable>"
+    pipeline.submit(_render_response, resp.status_code, dict(resp.headers), raw, cap, streamed)
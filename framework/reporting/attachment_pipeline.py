@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from framework.metrics import ATTACHMENT_QUEUE_DEPTH, get_current_test_name
+
+try:
+    import allure
+    import allure_commons
+except Exception:  # pragma: no cover
+    allure = None  # type: ignore[assignment]
+
+logger = logging.getLogger("framework.reporting.attachment_pipeline")
+
+# (body, name, attachment_type) ready for allure.attach
+Rendered = Tuple[str, str, Any]
+# The Allure step (uuid, title) a request was made in, if any, and what it rendered.
+_Entry = Tuple[Optional[Tuple[str, str]], Rendered]
+
+ATTACH_MODES = ("always", "on_failure", "off")
+
+_WAIT_S = 10.0
+
+
+class AttachmentPipeline:
+    """Renders Allure attachments off the request thread and attaches them per test.
+
+    Callers ``submit`` a render function plus the raw data it needs (bytes, dict copies);
+    a single daemon writer thread runs it and buffers the result under the test set by
+    ``begin`` (the pytest hooks pass the nodeid before any fixture runs). Allure's lifecycle
+    is thread-local, so the writer thread never attaches itself: in "always" mode what a
+    request inside ``allure.step`` rendered is attached as that step closes, everything else
+    when ``flush`` is called for the finished test, or dropped there when the mode is
+    "on_failure" and the test passed.
+    """
+
+    def __init__(self, mode: str = "always", max_body_bytes: int = 10000, max_per_test: int = 500) -> None:
+        if mode not in ATTACH_MODES:
+            raise ValueError(f"Unknown attachment mode {mode!r}; expected one of {ATTACH_MODES}")
+        self.mode = mode
+        self.max_body_bytes = max_body_bytes
+        self.max_per_test = max_per_test
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._cond = threading.Condition()
+        self._pending: Dict[str, int] = defaultdict(int)
+        self._pending_steps: Dict[str, int] = defaultdict(int)
+        self._buffers: Dict[str, List[_Entry]] = defaultdict(list)
+        self._test: Optional[str] = None
+        self._local = threading.local()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def begin(self, test_name: str) -> None:
+        """Buffer everything submitted from now until ``flush`` under ``test_name``."""
+        self._test = test_name
+
+    def _key(self) -> str:
+        return self._test or get_current_test_name()
+
+    def _open_steps(self) -> List[Tuple[str, str]]:
+        steps = getattr(self._local, "steps", None)
+        if steps is None:
+            steps = self._local.steps = []
+        return steps
+
+    def submit(self, render: Callable[..., List[Rendered]], *args: Any) -> None:
+        test_name = self._key()
+        steps = self._open_steps()
+        step = steps[-1] if steps else None
+        with self._cond:
+            self._pending[test_name] += 1
+            if step is not None:
+                self._pending_steps[step[0]] += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="allure-attachments", daemon=True)
+                self._worker.start()
+        ATTACHMENT_QUEUE_DEPTH.inc()
+        self._queue.put((test_name, step, render, args))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            test_name, step, render, args = item
+            try:
+                rendered = render(*args)
+            except Exception:
+                logger.debug("Attachment render failed", exc_info=True)
+                rendered = []
+            finally:
+                ATTACHMENT_QUEUE_DEPTH.dec()
+            with self._cond:
+                buf = self._buffers[test_name]
+                buf.extend((step, r) for r in rendered)
+                if len(buf) > self.max_per_test:
+                    del buf[: len(buf) - self.max_per_test]
+                self._pending[test_name] -= 1
+                if step is not None:
+                    self._pending_steps[step[0]] -= 1
+                self._cond.notify_all()
+
+    def step_started(self, uuid: str, title: str) -> None:
+        self._open_steps().append((uuid, title))
+
+    def step_stopped(self, uuid: str) -> None:
+        """Attach what requests inside the step rendered while Allure still has it open."""
+        steps = self._open_steps()
+        if not any(s[0] == uuid for s in steps):
+            return
+        while steps.pop()[0] != uuid:
+            pass
+        if allure is None or self.mode != "always":
+            return
+        for body, name, attachment_type in self._drain_step(uuid, _WAIT_S):
+            allure.attach(body, name=name, attachment_type=attachment_type)
+
+    def _drain_step(self, uuid: str, timeout_s: float) -> List[Rendered]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending_steps.get(uuid, 0) <= 0, timeout=timeout_s)
+            self._pending_steps.pop(uuid, None)
+            buf = self._buffers.get(self._key(), [])
+            ours = [r for step, r in buf if step is not None and step[0] == uuid]
+            buf[:] = [(step, r) for step, r in buf if step is None or step[0] != uuid]
+            return ours
+
+    def _drain(self, test_name: str, timeout_s: float) -> List[Rendered]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending.get(test_name, 0) <= 0, timeout=timeout_s)
+            self._pending.pop(test_name, None)
+            entries = self._buffers.pop(test_name, [])
+        # Their step is closed by now: keep its title in the name instead.
+        return [(body, f"{step[1]}: {name}" if step else name, kind) for step, (body, name, kind) in entries]
+
+    def flush(self, test_name: str, *, failed: bool, timeout_s: float = _WAIT_S) -> int:
+        """Attach (or discard) everything buffered for ``test_name``; returns the number attached."""
+        if self._test == test_name:
+            self._test = None
+        rendered = self._drain(test_name, timeout_s)
+        if allure is None or (self.mode == "on_failure" and not failed):
+            return 0
+        for body, name, attachment_type in rendered:
+            allure.attach(body, name=name, attachment_type=attachment_type)
+        return len(rendered)
+
+    def discard_all(self) -> int:
+        """Drop whatever no test flushed (e.g. requests from session fixtures); returns how many."""
+        with self._cond:
+            dropped = sum(len(buf) for buf in self._buffers.values())
+            self._buffers.clear()
+            return dropped
+
+    def close(self, timeout_s: float = _WAIT_S) -> None:
+        """Stop the writer thread once the queue is drained; leftovers are dropped."""
+        with self._cond:
+            worker, self._worker = self._worker, None
+            self._cond.wait_for(lambda: all(n <= 0 for n in self._pending.values()), timeout=timeout_s)
+        dropped = self.discard_all()
+        if dropped:
+            logger.debug("Dropped %d attachments that belonged to no test", dropped)
+        if worker is not None:
+            self._queue.put(None)
+
+
+if allure is not None:
+
+    class _StepTracker:
+        """Allure step hooks, so attachments made inside ``allure.step`` land in that step."""
+
+        @allure_commons.hookimpl
+        def start_step(self, uuid, title, params) -> None:
+            get_pipeline().step_started(uuid, title)
+
+        # Before allure-pytest's own stop_step closes the step.
+        @allure_commons.hookimpl(tryfirst=True)
+        def stop_step(self, uuid, exc_type, exc_val, exc_tb) -> None:
+            get_pipeline().step_stopped(uuid)
+
+    _STEP_TRACKER = _StepTracker()
+
+
+def track_allure_steps() -> None:
+    """Register the step hooks with Allure (once per process)."""
+    if allure is not None and not allure_commons.plugin_manager.is_registered(_STEP_TRACKER):
+        allure_commons.plugin_manager.register(_STEP_TRACKER)
+
+
+_PIPELINE = AttachmentPipeline()
+
+
+def get_pipeline() -> AttachmentPipeline:
+    return _PIPELINE
+
+
+def configure_attachments(mode: str = "always", max_body_bytes: int = 10000) -> AttachmentPipeline:
+    global _PIPELINE
+    _PIPELINE.close()
+    _PIPELINE = AttachmentPipeline(mode=mode, max_body_bytes=max_body_bytes)
+    return _PIPELINE
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from framework.adapters import synthetic_response
+from framework.config import ResponseCacheConfig
+from framework.metrics import inc_cache, inc_cache_eviction
+from framework.retry import SYSTEM_CLOCK, Clock
+
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+# Statuses RFC 9111 lets a cache store without explicit freshness (206 partial content aside).
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+# Not part of the cache key: they describe the connection, not the representation.
+_UNKEYED_HEADERS = frozenset({"connection", "keep-alive", "if-none-match", "if-modified-since", "cache-control"})
+# Describe the stored body, or are recomputed when it is served again.
+_DROP_HEADERS = frozenset({"content-encoding", "transfer-encoding", "content-length", "connection", "keep-alive"})
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*(?:s-)?max-age\s*=\s*\"?(\d+)", re.IGNORECASE)
+
+
+def _directives(value: str) -> List[str]:
+    return [part.strip().lower().split("=", 1)[0] for part in value.split(",") if part.strip()]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status: int
+    reason: str
+    headers: Tuple[Tuple[str, str], ...]
+    body: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers)
+
+    @property
+    def revalidatable(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+
+def cache_key(request: requests.PreparedRequest) -> str:
+    """Method, URL and every representation-relevant request header.
+
+    httpbin echoes request headers without sending ``Vary``, so all of them are keyed:
+    a different ``Accept`` or trace id is a different entry.
+    """
+    headers = sorted((k.lower(), v) for k, v in request.headers.items() if k.lower() not in _UNKEYED_HEADERS)
+    return f"{request.method} {request.url} {headers!r}"
+
+
+class ResponseCache:
+    """Thread-safe LRU of responses bounded by entry count and total bytes."""
+
+    def __init__(self, *, max_entries: int = 512, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            evicted = 0
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._bytes -= dropped.size
+                evicted += 1
+        if evicted:
+            inc_cache_eviction("capacity", evicted)
+
+    def discard(self, key: str, reason: str = "expired") -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+        if entry is not None:
+            inc_cache_eviction(reason)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class _Flight:
+    """One in-progress network call that identical concurrent requests wait on."""
+
+    __slots__ = ("done", "entry", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.entry: Optional[CachedResponse] = None
+        self.error: Optional[BaseException] = None
+
+
+class CachingAdapter(BaseAdapter):
+    """Private HTTP cache for GET/HEAD in front of ``inner``.
+
+    - fresh entries (``Cache-Control: max-age`` or ``ttl_s``) are answered from memory
+    - stale entries with an ``ETag`` / ``Last-Modified`` are revalidated with
+      ``If-None-Match`` / ``If-Modified-Since``; a 304 refreshes them
+    - identical requests already in flight wait for that call instead of sending their own
+      (single flight), whether or not its response turns out cacheable
+
+    Only paths matching ``paths`` are considered; streamed requests, ``no-store`` responses
+    and requests sending ``Cache-Control: no-cache`` skip the lookup.
+    """
+
+    def __init__(
+        self,
+        inner: BaseAdapter,
+        cache: ResponseCache,
+        *,
+        ttl_s: float = 60.0,
+        paths: Tuple[str, ...] = ResponseCacheConfig.paths,
+        clock: Clock = SYSTEM_CLOCK,
+    ) -> None:
+        super().__init__()
+        self.inner = inner
+        self.cache = cache
+        self.ttl_s = ttl_s
+        self.paths = tuple(paths)
+        self.clock = clock
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, inner: BaseAdapter, cfg: ResponseCacheConfig, clock: Clock = SYSTEM_CLOCK
+    ) -> "CachingAdapter":
+        cache = ResponseCache(max_entries=cfg.max_entries, max_bytes=cfg.max_bytes)
+        return cls(inner, cache, ttl_s=cfg.ttl_s, paths=cfg.paths, clock=clock)
+
+    def _applies(self, request, stream: bool) -> bool:
+        if stream or request.method not in CACHEABLE_METHODS:
+            return False
+        path = urlsplit(request.url).path or "/"
+        return any(fnmatchcase(path, pattern) for pattern in self.paths)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        send_kwargs = dict(stream=False, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        if not self._applies(request, stream):
+            return self.inner.send(request, **{**send_kwargs, "stream": stream})
+
+        key = cache_key(request)
+        no_cache = "no-cache" in _directives(request.headers.get("Cache-Control", ""))
+        entry = self.cache.get(key)
+        if entry is not None and not no_cache:
+            if entry.is_fresh(self.clock.now()):
+                inc_cache("hit")
+                return self._build_response(request, entry)
+            if not entry.revalidatable:
+                self.cache.discard(key, "expired")
+                entry = None
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if leader and entry is None:
+            # A flight that finished between the lookup and the registration may have stored it.
+            stored = self.cache.get(key)
+            if stored is not None and not no_cache and stored.is_fresh(self.clock.now()):
+                self._land(key, flight, stored)
+                inc_cache("hit")
+                return self._build_response(request, stored)
+        if not leader:
+            flight.done.wait()
+            inc_cache("coalesced")
+            if flight.error is not None:
+                raise flight.error
+            return self._build_response(request, flight.entry)
+
+        try:
+            resp, entry = self._fetch(request, key, entry, send_kwargs)
+        except BaseException as exc:
+            flight.error = exc
+            self._land(key, flight, None)
+            raise
+        self._land(key, flight, entry)
+        return resp
+
+    def _land(self, key: str, flight: _Flight, entry: Optional[CachedResponse]) -> None:
+        flight.entry = entry
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.done.set()
+
+    def _fetch(
+        self, request, key: str, entry: Optional[CachedResponse], send_kwargs
+    ) -> Tuple[requests.Response, CachedResponse]:
+        outgoing = request
+        if entry is not None:
+            outgoing = request.copy()
+            if entry.etag is not None:
+                outgoing.headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                outgoing.headers["If-Modified-Since"] = entry.last_modified
+
+        resp = self.inner.send(outgoing, **send_kwargs)
+        now = self.clock.now()
+        if entry is not None and resp.status_code == 304:
+            resp.close()
+            refreshed = replace(entry, expires_at=now + self._ttl(resp.headers, entry.headers))
+            self.cache.put(key, refreshed)
+            inc_cache("revalidated")
+            return self._build_response(request, refreshed), refreshed
+
+        inc_cache("miss")
+        snapshot = CachedResponse(
+            status=resp.status_code,
+            reason=resp.reason or "",
+            headers=tuple((k, v) for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS),
+            body=resp.content,
+            expires_at=now + self._ttl(resp.headers),
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        if self._storable(resp):
+            self.cache.put(key, snapshot)
+        elif entry is not None:
+            self.cache.discard(key, "expired")
+        return resp, snapshot
+
+    def _ttl(self, headers, stored: Tuple[Tuple[str, str], ...] = ()) -> float:
+        # A 304 without Cache-Control keeps the stored response's freshness rules.
+        cache_control = headers.get("Cache-Control") or {k.lower(): v for k, v in stored}.get("cache-control", "")
+        if "no-cache" in _directives(cache_control):
+            return 0.0
+        m = _MAX_AGE.search(cache_control)
+        return float(m.group(1)) if m else self.ttl_s
+
+    @staticmethod
+    def _storable(resp: requests.Response) -> bool:
+        if resp.status_code not in CACHEABLE_STATUSES:
+            return False
+        return "no-store" not in _directives(resp.headers.get("Cache-Control", ""))
+
+    def _build_response(self, request, entry: CachedResponse) -> requests.Response:
+        resp = synthetic_response(self, request, entry.status, entry.reason, entry.headers, entry.body)
+        resp.from_cache = True  # type: ignore[attr-defined]
+        return resp
+
+    def close(self) -> None:
+        self.inner.close()
@@ -2,24 +2,349 @@ from __future__ import annotations
 
 import functools
 import logging
-import time
-from typing import Callable, Iterable, Optional, Type
+import random
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Optional, Protocol, Tuple, Type, TypeVar
 
 import requests
 
-from framework.metrics import inc_retry
+from framework.clock import SYSTEM_CLOCK, Clock, SystemClock, VirtualClock  # noqa: F401 (re-exported)
+from framework.config import RetryConfig
+from framework.metrics import get_current_test_name, inc_retry, inc_retry_budget_exhausted, observe_backoff
+from framework.rate_limit import parse_retry_after
+from framework.streaming import read_prefix
 
 
 logger = logging.getLogger("framework.retry")
 
+T = TypeVar("T")
+
+# 1-based attempt number of the call currently executing under a RetryPolicy.
+CURRENT_ATTEMPT: ContextVar[int] = ContextVar("CURRENT_ATTEMPT", default=1)
+
+
+def get_current_attempt() -> int:
+    return CURRENT_ATTEMPT.get()
+
 
 class RetryableHttpError(Exception):
     """Raised when HTTP status code is retryable."""
 
-    def __init__(self, status_code: int, url: str, body_preview: str = "") -> None:
+    def __init__(
+        self, status_code: int, url: str, body_preview: str = "", retry_after: Optional[float] = None
+    ) -> None:
         super().__init__(f"Retryable HTTP {status_code} for {url}. Body preview: {body_preview[:200]}")
         self.status_code = status_code
         self.url = url
+        self.retry_after = retry_after
+
+
+# Enough bytes for the 200-character preview even if every character is multi-byte UTF-8.
+_PREVIEW_BYTES = 800
+
+
+def _raise_retryable(resp) -> None:
+    body_preview = ""
+    try:
+        # Bounded: a retryable 5xx with a huge (or streamed) body must not be buffered whole.
+        raw = read_prefix(resp, _PREVIEW_BYTES)
+        body_preview = raw.decode(resp.encoding or "utf-8", errors="replace")
+    except Exception:
+        body_preview = "<unreadable>"
+    retry_after = parse_retry_after(resp.headers.get("Retry-After")) if resp.headers else None
+    raise RetryableHttpError(resp.status_code, str(resp.url), body_preview, retry_after)
+
+
+DEFAULT_RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (requests.RequestException, RetryableHttpError)
+
+# Jitter must not consume the seeded global ``random`` stream used for test data.
+_JITTER_RNG = random.Random()
+
+
+class Backoff(Protocol):
+    def delay(self, retry: int, prev_delay: float) -> float:
+        """Sleep before retry number ``retry`` (1-based); ``prev_delay`` is the last sleep."""
+
+
+@dataclass(frozen=True)
+class ExponentialBackoff:
+    """Deterministic ``base_s * multiplier**n``, optionally capped; precomputed per policy."""
+
+    schedule: Tuple[float, ...]
+
+    @classmethod
+    def build(
+        cls, *, base_s: float, multiplier: float, retries: int, cap_s: Optional[float] = None
+    ) -> "ExponentialBackoff":
+        delays = []
+        delay = base_s
+        for _ in range(max(retries, 0)):
+            delays.append(delay if cap_s is None else min(delay, cap_s))
+            delay *= multiplier
+        return cls(schedule=tuple(delays))
+
+    def delay(self, retry: int, prev_delay: float) -> float:
+        return self.schedule[retry - 1]
+
+
+@dataclass(frozen=True)
+class FullJitterBackoff:
+    """``uniform(0, capped exponential)``: spreads parallel workers over the whole window."""
+
+    ceiling: ExponentialBackoff
+
+    def delay(self, retry: int, prev_delay: float) -> float:
+        return _JITTER_RNG.uniform(0.0, self.ceiling.delay(retry, prev_delay))
+
+
+@dataclass(frozen=True)
+class DecorrelatedJitterBackoff:
+    """``min(cap, uniform(base, 3 * previous))``: grows like exponential but never in lockstep."""
+
+    base_s: float
+    cap_s: float
+
+    def delay(self, retry: int, prev_delay: float) -> float:
+        return min(self.cap_s, _JITTER_RNG.uniform(self.base_s, max(self.base_s, prev_delay * 3)))
+
+
+BACKOFF_STRATEGIES = ("exponential", "full_jitter", "decorrelated_jitter")
+
+
+def make_backoff(
+    strategy: str, *, base_s: float, multiplier: float, retries: int, cap_s: Optional[float] = None
+) -> Backoff:
+    exponential = ExponentialBackoff.build(base_s=base_s, multiplier=multiplier, retries=retries, cap_s=cap_s)
+    if strategy == "exponential":
+        return exponential
+    if strategy == "full_jitter":
+        return FullJitterBackoff(ceiling=exponential)
+    if strategy == "decorrelated_jitter":
+        cap = cap_s if cap_s is not None else max(exponential.schedule, default=base_s)
+        return DecorrelatedJitterBackoff(base_s=base_s, cap_s=cap)
+    raise ValueError(f"Unknown backoff strategy {strategy!r}; expected one of {BACKOFF_STRATEGIES}")
+
+
+class RetryBudget:
+    """Process-wide retry accounting shared by every policy.
+
+    Tracks calls vs. retries for the session ratio and backoff sleep per test name.
+    Limits live on the policy; this only holds the counters.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self._slept_by_test: Dict[str, float] = {}
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def try_acquire_retry(self, ratio: float, min_retries: int) -> bool:
+        with self._lock:
+            if self.retries >= min_retries and self.retries >= ratio * self.calls:
+                return False
+            self.retries += 1
+            return True
+
+    def slept(self, test_name: str) -> float:
+        return self._slept_by_test.get(test_name, 0.0)
+
+    def add_sleep(self, test_name: str, seconds: float) -> None:
+        with self._lock:
+            self._slept_by_test[test_name] = self._slept_by_test.get(test_name, 0.0) + seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.retries = 0
+            self._slept_by_test.clear()
+
+
+SESSION_RETRY_BUDGET = RetryBudget()
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry settings compiled once and reused for every call.
+
+    The backoff strategy, the status set and the exception tuple are built up front so the
+    per-call path allocates nothing. A server-sent Retry-After (up to ``max_retry_after_s``)
+    wins over a shorter backoff delay. Optional budgets stop retrying early:
+
+    - ``max_call_retry_s``: wall time of one call, attempts plus backoff
+    - ``max_test_retry_s``: backoff sleep accumulated by the current test
+    - ``session_retry_ratio``: retries as a fraction of all calls (after ``session_min_retries``)
+
+    Time comes from ``clock``; a :class:`VirtualClock` makes backoff instantaneous.
+    """
+
+    attempts: int
+    backoff: Backoff
+    retry_on_statuses: FrozenSet[int]
+    retry_on_exceptions: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_EXCEPTIONS
+    max_retry_after_s: float = 30.0
+    max_call_retry_s: Optional[float] = None
+    max_test_retry_s: Optional[float] = None
+    session_retry_ratio: Optional[float] = None
+    session_min_retries: int = 10
+    budget: RetryBudget = SESSION_RETRY_BUDGET
+    clock: Clock = SYSTEM_CLOCK
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        attempts: int,
+        backoff_s: float,
+        backoff_multiplier: float,
+        retry_on_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        retry_on_exceptions: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_EXCEPTIONS,
+        backoff_strategy: str = "exponential",
+        backoff_cap_s: Optional[float] = None,
+        **budgets: Any,
+    ) -> "RetryPolicy":
+        return cls(
+            attempts=attempts,
+            backoff=make_backoff(
+                backoff_strategy,
+                base_s=backoff_s,
+                multiplier=backoff_multiplier,
+                retries=attempts - 1,
+                cap_s=backoff_cap_s,
+            ),
+            retry_on_statuses=frozenset(retry_on_statuses),
+            retry_on_exceptions=tuple(retry_on_exceptions),
+            **budgets,
+        )
+
+    @classmethod
+    def from_config(
+        cls,
+        cfg: RetryConfig,
+        retry_on_exceptions: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_EXCEPTIONS,
+        clock: Clock = SYSTEM_CLOCK,
+    ) -> "RetryPolicy":
+        return cls.build(
+            attempts=cfg.attempts,
+            backoff_s=cfg.backoff_s,
+            backoff_multiplier=cfg.backoff_multiplier,
+            retry_on_statuses=cfg.retry_on_statuses,
+            retry_on_exceptions=retry_on_exceptions,
+            backoff_strategy=cfg.backoff_strategy,
+            backoff_cap_s=cfg.backoff_cap_s,
+            max_call_retry_s=cfg.max_call_retry_s,
+            max_test_retry_s=cfg.max_test_retry_s,
+            session_retry_ratio=cfg.session_retry_ratio,
+            clock=clock,
+        )
+
+    def _check(self, resp) -> None:
+        # Anything that looks like an HTTP response is checked against retryable statuses.
+        if getattr(resp, "status_code", None) in self.retry_on_statuses:
+            _raise_retryable(resp)
+
+    def _budget_exhausted(self, delay: float, started: float, test_name: str) -> Optional[str]:
+        if self.max_call_retry_s is not None and self.clock.now() - started + delay > self.max_call_retry_s:
+            return "call"
+        if self.max_test_retry_s is not None and self.budget.slept(test_name) + delay > self.max_test_retry_s:
+            return "test"
+        if self.session_retry_ratio is not None and not self.budget.try_acquire_retry(
+            self.session_retry_ratio, self.session_min_retries
+        ):
+            return "session"
+        return None
+
+    def _on_failure(
+        self, attempt: int, t0: float, started: float, prev_delay: float, exc: BaseException
+    ) -> Optional[float]:
+        """Log a failed attempt; return the backoff delay or None when giving up."""
+        dt_ms = (self.clock.now() - t0) * 1000
+        if attempt >= self.attempts:
+            logger.error("Attempt %s/%s failed in %.1f ms (giving up): %s", attempt, self.attempts, dt_ms, exc)
+            return None
+        delay = self.backoff.delay(attempt, prev_delay)
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_retry_after_s))
+
+        test_name = get_current_test_name()
+        exhausted = self._budget_exhausted(delay, started, test_name)
+        if exhausted:
+            inc_retry_budget_exhausted(exhausted)
+            logger.error(
+                "Attempt %s/%s failed in %.1f ms (%s retry budget exhausted, giving up): %s",
+                attempt,
+                self.attempts,
+                dt_ms,
+                exhausted,
+                exc,
+            )
+            return None
+
+        # Count retry attempts (excluding the first attempt).
+        inc_retry(n=1)
+        observe_backoff(delay, test_name)
+        self.budget.add_sleep(test_name, delay)
+        logger.warning(
+            "Attempt %s/%s failed in %.1f ms: %s | next retry in %.2f s",
+            attempt,
+            self.attempts,
+            dt_ms,
+            exc,
+            delay,
+        )
+        return delay
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        if self.session_retry_ratio is not None:
+            self.budget.record_call()
+        started = self.clock.now()
+        delay = 0.0
+        for attempt in range(1, self.attempts + 1):
+            t0 = self.clock.now()
+            CURRENT_ATTEMPT.set(attempt)
+            try:
+                resp = fn(*args, **kwargs)
+                self._check(resp)
+                logger.info(
+                    "Attempt %s/%s succeeded in %.1f ms", attempt, self.attempts, (self.clock.now() - t0) * 1000
+                )
+                return resp
+            except self.retry_on_exceptions as exc:
+                next_delay = self._on_failure(attempt, t0, started, delay, exc)
+                if next_delay is None:
+                    raise
+                delay = next_delay
+                self.clock.sleep(delay)
+        raise RuntimeError("retry policy reached unreachable state")
+
+    async def acall(self, fn: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        if self.session_retry_ratio is not None:
+            self.budget.record_call()
+        started = self.clock.now()
+        delay = 0.0
+        for attempt in range(1, self.attempts + 1):
+            t0 = self.clock.now()
+            CURRENT_ATTEMPT.set(attempt)
+            try:
+                resp = await fn(*args, **kwargs)
+                self._check(resp)
+                logger.info(
+                    "Attempt %s/%s succeeded in %.1f ms", attempt, self.attempts, (self.clock.now() - t0) * 1000
+                )
+                return resp
+            except self.retry_on_exceptions as exc:
+                next_delay = self._on_failure(attempt, t0, started, delay, exc)
+                if next_delay is None:
+                    raise
+                delay = next_delay
+                await self.clock.asleep(delay)
+        raise RuntimeError("retry policy reached unreachable state")
 
 
 def retry(
@@ -28,58 +353,59 @@ def retry(
     backoff_s: float,
     backoff_multiplier: float,
     retry_on_statuses: Iterable[int] = (429, 500, 502, 503, 504),
-    retry_on_exceptions: tuple[Type[BaseException], ...] = (requests.RequestException, RetryableHttpError),
+    retry_on_exceptions: tuple[Type[BaseException], ...] = DEFAULT_RETRY_EXCEPTIONS,
 ) -> Callable:
     """Custom retry decorator with attempt-by-attempt logging.
 
     - Retries on network exceptions (requests.RequestException by default)
     - Retries on configured HTTP statuses by raising RetryableHttpError
+
+    Hot paths should build a :class:`RetryPolicy` once and use ``policy.call`` instead.
     """
 
+    policy = RetryPolicy.build(
+        attempts=attempts,
+        backoff_s=backoff_s,
+        backoff_multiplier=backoff_multiplier,
+        retry_on_statuses=retry_on_statuses,
+        retry_on_exceptions=retry_on_exceptions,
+    )
+
     def decorator(fn: Callable) -> Callable:
         @functools.wraps(fn)
         def wrapper(*args, **kwargs):
-            delay = backoff_s
-            last_exc: Optional[BaseException] = None
-            for attempt in range(1, attempts + 1):
-                t0 = time.perf_counter()
-                try:
-                    resp = fn(*args, **kwargs)
-
-                    # If function returns a Response, enforce retryable status codes.
-                    if isinstance(resp, requests.Response) and resp.status_code in set(retry_on_statuses):
-                        body_preview = ""
-                        try:
-                            body_preview = resp.text
-                        except Exception:
-                            body_preview = "<unreadable>"
-                        raise RetryableHttpError(resp.status_code, resp.url, body_preview)
-
-                    dt_ms = (time.perf_counter() - t0) * 1000
-                    logger.info("Attempt %s/%s succeeded in %.1f ms", attempt, attempts, dt_ms)
-                    return resp
-                except retry_on_exceptions as exc:
-                    dt_ms = (time.perf_counter() - t0) * 1000
-                    last_exc = exc
-                    if attempt >= attempts:
-                        logger.error("Attempt %s/%s failed in %.1f ms (giving up): %s", attempt, attempts, dt_ms, exc)
-                        raise
-                    # Count retry attempts (excluding the first attempt).
-                    inc_retry(n=1)
-                    logger.warning(
-                        "Attempt %s/%s failed in %.1f ms: %s | next retry in %.2f s",
-                        attempt,
-                        attempts,
-                        dt_ms,
-                        exc,
-                        delay,
-                    )
-                    time.sleep(delay)
-                    delay *= backoff_multiplier
-            # Defensive
-            if last_exc:
-                raise last_exc
-            raise RuntimeError("retry wrapper reached unreachable state")
+            return policy.call(fn, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def async_retry(
+    *,
+    attempts: int,
+    backoff_s: float,
+    backoff_multiplier: float,
+    retry_on_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+    retry_on_exceptions: tuple[Type[BaseException], ...] = (RetryableHttpError,),
+) -> Callable:
+    """Coroutine counterpart of :func:`retry` with identical attempt/backoff semantics.
+
+    Transport exceptions must be passed in explicitly (e.g. ``httpx.TransportError``).
+    """
+
+    policy = RetryPolicy.build(
+        attempts=attempts,
+        backoff_s=backoff_s,
+        backoff_multiplier=backoff_multiplier,
+        retry_on_statuses=retry_on_statuses,
+        retry_on_exceptions=retry_on_exceptions,
+    )
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await policy.acall(fn, *args, **kwargs)
 
         return wrapper
 
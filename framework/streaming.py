@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+import requests
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class BodyTooLargeError(Exception):
+    """Raised when a streamed body exceeds the caller's ``max_bytes``."""
+
+    def __init__(self, url: str, max_bytes: int) -> None:
+        super().__init__(f"Response body from {url} exceeds {max_bytes} bytes")
+        self.url = url
+        self.max_bytes = max_bytes
+
+
+@dataclass(frozen=True)
+class StreamedBody:
+    """What is left of a body consumed chunk by chunk: its size, digest and first bytes."""
+
+    size: int
+    algorithm: str
+    hexdigest: str
+    prefix: bytes
+
+
+def is_unread_stream(resp: object) -> bool:
+    """True for a ``stream=True`` response whose body has not been buffered yet.
+
+    Touching ``resp.content``/``resp.text``/``resp.json()`` on such a response reads the
+    whole body into memory, which is exactly what streaming callers are avoiding.
+    """
+    return getattr(resp, "_content", None) is False
+
+
+def read_prefix(resp: requests.Response, limit: int) -> bytes:
+    """Up to ``limit`` bytes of the body without buffering the rest.
+
+    A streamed response is read only as far as the prefix and then closed, so it is
+    unusable afterwards; this is meant for error previews of responses being discarded.
+    """
+    if not is_unread_stream(resp):
+        return (resp.content or b"")[:limit]
+    try:
+        buf = bytearray()
+        for chunk in resp.iter_content(chunk_size=limit):
+            buf += chunk
+            if len(buf) >= limit:
+                break
+        return bytes(buf[:limit])
+    finally:
+        resp.close()
+
+
+def consume(
+    resp: requests.Response,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    algorithm: str = "sha256",
+    prefix_bytes: int = 1024,
+    on_chunk: Optional[Callable[[bytes], None]] = None,
+) -> StreamedBody:
+    """Read the body chunk by chunk, hashing and counting it; only ``prefix_bytes`` are kept."""
+    digest = hashlib.new(algorithm)
+    size = 0
+    prefix = bytearray()
+    try:
+        for chunk in resp.iter_content(chunk_size=chunk_size):
+            digest.update(chunk)
+            size += len(chunk)
+            if len(prefix) < prefix_bytes:
+                prefix += chunk[: prefix_bytes - len(prefix)]
+            if on_chunk is not None:
+                on_chunk(chunk)
+    finally:
+        resp.close()
+    return StreamedBody(size=size, algorithm=algorithm, hexdigest=digest.hexdigest(), prefix=bytes(prefix))
+
+
+def read_body(
+    resp: requests.Response,
+    *,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> bytearray:
+    """Collect the body into one growable buffer (no ``.content`` + ``.text`` double copy).
+
+    Pass the result straight to ``Model.model_validate_json`` to parse without building an
+    intermediate dict. ``max_bytes`` stops reading early instead of buffering a runaway body.
+    """
+    buf = bytearray()
+    try:
+        for chunk in resp.iter_content(chunk_size=chunk_size):
+            buf += chunk
+            if max_bytes is not None and len(buf) > max_bytes:
+                raise BodyTooLargeError(str(resp.url), max_bytes)
+    finally:
+        resp.close()
+    return buf
+
+
+def iter_json_lines(resp: requests.Response, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Parse a newline-delimited JSON body one document at a time as it arrives."""
+    try:
+        for line in resp.iter_lines(chunk_size=chunk_size):
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        resp.close()
@@ -1,15 +1,33 @@
 from __future__ import annotations
 
+import dataclasses
 import os
 import pathlib
 import random
+import shutil
+import tempfile
 import pytest
+from prometheus_client.metrics import MetricWrapperBase
 
+from framework.circuit_breaker import CircuitOpenError
 from framework.config import load_config
+from framework.dataset_cache import DatasetCache
+from framework.fault_injection import FaultPlan
 from framework.http_client import HttpClient
 from framework.logging import setup_logging
-from framework.metrics import push_metrics, set_current_test_name
+import framework.metrics
+from framework.metrics import (
+    REGISTRY,
+    configure_series_budget,
+    dump_metrics,
+    merge_worker_metrics,
+    push_metrics,
+    set_current_test_name,
+)
+from framework.metrics_exporter import MetricsExporter, serve_metrics
 from framework.api.httpbin_api import HttpBinApi
+from framework.reporting.attachment_pipeline import configure_attachments, get_pipeline, track_allure_steps
+from framework.retry import VirtualClock
 
 try:
     import allure
@@ -18,8 +36,21 @@ except Exception:
 
 
 @pytest.fixture(scope="session")
-def cfg():
-    return load_config()
+def local_httpbin():
+    """In-process httpbin stand-in on an ephemeral port (one per xdist worker)."""
+    from framework.local_httpbin import LocalHttpBin
+
+    with LocalHttpBin() as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def cfg(request):
+    c = load_config()
+    if c.service.local_httpbin:
+        server = request.getfixturevalue("local_httpbin")
+        c = dataclasses.replace(c, service=dataclasses.replace(c.service, base_url=server.url))
+    return c
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -29,14 +60,25 @@ def _logging():
 
 
 @pytest.fixture(scope="session", autouse=True)
-def test_seed():
+def test_seed(cfg):
     seed_raw = os.getenv("TEST_SEED")
+    # Replayed request keys include the generated payloads, so replay reuses the recording's seed.
+    store = None
+    if cfg.cassette.mode != "off":
+        from framework.cassette import CassetteStore
+
+        store = CassetteStore(cfg.cassette.dir)
+    if not seed_raw and store is not None and cfg.cassette.mode != "record":
+        seed_raw = store.read_meta().get("seed")
     seed = int(seed_raw) if seed_raw else random.randint(1, 2_000_000_000)
     random.seed(seed)
+    if store is not None and cfg.cassette.mode == "record":
+        store.write_meta(seed=seed, base_url=cfg.service.base_url)
 
     try:
         from framework import data_gen
-        data_gen.fake.seed_instance(seed)
+        # Applied when Faker is first used: runs that generate no data never import it.
+        data_gen.seed_fake(seed)
     except Exception:
         pass
 
@@ -46,9 +88,54 @@ def test_seed():
     return seed
 
 
+@pytest.fixture(scope="session")
+def local_amqp():
+    """In-process AMQP broker stand-in on an ephemeral port (one per xdist worker)."""
+    from framework.local_amqp import LocalAmqpBroker
+
+    with LocalAmqpBroker() as broker:
+        yield broker
+
+
+@pytest.fixture(scope="session")
+def messaging(cfg, request):
+    """Session-wide RabbitMQ connection and channel pool; skips when pika or the broker is missing."""
+    from framework.messaging import MessagingClient, pika
+
+    if pika is None:
+        pytest.skip("pika is not installed. Install requirements-messaging.txt to run integration tests.")
+    settings = cfg.messaging
+    if settings.local_broker:
+        settings = dataclasses.replace(settings, amqp_url=request.getfixturevalue("local_amqp").url)
+    client = MessagingClient(settings)
+    try:
+        client.connect()
+    except Exception as e:
+        url = settings.amqp_url
+        pytest.skip(f"RabbitMQ not reachable via AMQP_URL={url!r}. Start RabbitMQ or fix URL. Details: {e}")
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def dataset_cache(cfg) -> DatasetCache | None:
+    c = cfg.dataset_cache
+    if not c.enabled:
+        return None
+    return DatasetCache(c.dir, max_bytes=c.max_bytes, max_entries=c.max_entries)
+
+
 @pytest.fixture(scope="session")
 def client(cfg) -> HttpClient:
-    return HttpClient(service=cfg.service, retry_cfg=cfg.retry)
+    return HttpClient(
+        service=cfg.service,
+        retry_cfg=cfg.retry,
+        rate_limit=cfg.rate_limit,
+        circuit_breaker=cfg.circuit_breaker,
+        record_phases=cfg.metrics.request_phases,
+        cassette=cfg.cassette,
+        response_cache=cfg.response_cache,
+    )
 
 
 @pytest.fixture(scope="session")
@@ -56,26 +143,211 @@ def api(client) -> HttpBinApi:
     return HttpBinApi(client=client)
 
 
+@pytest.fixture
+def virtual_clock() -> VirtualClock:
+    return VirtualClock()
+
+
+@pytest.fixture
+def fault_plan() -> FaultPlan:
+    return FaultPlan()
+
+
+@pytest.fixture
+def faulty_client(cfg, fault_plan, virtual_clock) -> HttpClient:
+    """The suite's service/retry settings behind ``fault_plan``; backoff and latency are virtual."""
+    return HttpClient(service=cfg.service, retry_cfg=cfg.retry, faults=fault_plan, clock=virtual_clock)
+
+
+_SUFFIX_LABELS = {"histogram": "le", "summary": "quantile"}
+
+
+def _series(metric: MetricWrapperBase) -> set:
+    # Histogram buckets / summary quantiles aside, every sample carries its series' label set.
+    return {
+        frozenset((k, v) for k, v in sample.labels.items() if k != _SUFFIX_LABELS.get(family.type))
+        for family in metric.collect()
+        for sample in family.samples
+    }
+
+
+@pytest.fixture
+def scratch_metrics():
+    """Removes the label sets a test adds to the shared REGISTRY metrics (fake hosts, queues,
+    retries) when it ends, so the metrics exporter never pushes them to Pushgateway.
+
+    Each metric's ``labels()`` is wrapped for the test to note label sets that did not exist
+    before it; those are ``remove()``d afterwards.
+    """
+    added: dict = {}
+
+    def recording(metric, existing):
+        labels = metric.labels
+
+        def record(**labelvalues):
+            key = frozenset((k, str(v)) for k, v in labelvalues.items())
+            if key not in existing:
+                added.setdefault(metric, set()).add(key)
+            return labels(**labelvalues)
+
+        return record
+
+    metrics = [m for m in vars(framework.metrics).values() if isinstance(m, MetricWrapperBase)]
+    for metric in metrics:
+        metric.labels = recording(metric, _series(metric))
+    try:
+        yield
+    finally:
+        for metric in metrics:
+            del metric.labels
+        for metric, keys in added.items():
+            samples = [s.labels for family in metric.collect() for s in family.samples]
+            for key in keys & _series(metric):
+                names = dict(key)
+                # remove() takes the values in label-name order, the order every sample lists them in.
+                metric.remove(*(names[n] for n in samples[0] if n in names))
+
+
 @pytest.fixture(autouse=True)
 def _current_test(request):
+    # The full nodeid (attachments are flushed per case); metric labels drop the parameters.
     set_current_test_name(request.node.nodeid)
     yield
 
 
+_TEST_FAILED = pytest.StashKey[bool]()
+_CIRCUIT_ON_OPEN = pytest.StashKey[str]()
+_METRICS_DIR = pytest.StashKey[pathlib.Path]()
+_METRICS_EXPORTER = pytest.StashKey[MetricsExporter]()
+_METRICS_SERVER = pytest.StashKey[object]()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    try:
+        return (yield)
+    except CircuitOpenError as exc:
+        # The target is known to be down: report quickly instead of a wall of timeouts.
+        if item.config.stash.get(_CIRCUIT_ON_OPEN, "fail") == "skip":
+            pytest.skip(str(exc))
+        raise
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    # Before any fixture runs: whatever they and the test attach belongs to this item.
+    get_pipeline().begin(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed:
+        item.stash[_TEST_FAILED] = True
+    if report.when == "teardown":
+        # Request/response attachments are rendered in the background; attach them now
+        # (or drop them for passed tests in "on_failure" mode).
+        get_pipeline().flush(item.nodeid, failed=item.stash.get(_TEST_FAILED, False))
+
+
+def _is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # xdist controller -> worker: where each worker dumps its registry (periodically and at session end).
+    node.workerinput["metrics_dir"] = str(node.config.stash[_METRICS_DIR])
+
+
+def _grouping_key() -> dict:
+    return {
+        "instance": os.getenv("HOSTNAME", "local"),
+        "repo": os.getenv("GITHUB_REPOSITORY", "local"),
+    }
+
+
+def _session_metrics(metrics_dir: pathlib.Path):
+    """What the controller exports: the merged worker dumps under xdist, else this process's registry."""
+
+    def source():
+        dumps = sorted(metrics_dir.glob("*.prom"))
+        return merge_worker_metrics(dumps) if dumps else REGISTRY
+
+    return source
+
+
 def pytest_sessionfinish(session, exitstatus):
+    get_pipeline().close()
+    config = session.config
+    exporter = config.stash.get(_METRICS_EXPORTER, None)
+    if _is_xdist_worker(config):
+        # Workers never push: the controller merges their dumps and pushes, so
+        # concurrent pushadd calls can't overwrite each other's series.
+        metrics_dir = config.workerinput.get("metrics_dir")
+        if exporter is not None:
+            exporter.stop()  # final dump
+        elif metrics_dir:
+            dump_metrics(pathlib.Path(metrics_dir) / f"{config.workerinput['workerid']}.prom")
+        return
+    metrics_dir = config.stash.get(_METRICS_DIR, None)
     try:
         cfg = load_config()
-        if cfg.metrics.enabled:
-            grouping_key = {
-                "instance": os.getenv("HOSTNAME", "local"),
-                "repo": os.getenv("GITHUB_REPOSITORY", "local"),
-            }
-            push_metrics(cfg.metrics.pushgateway_url, cfg.metrics.job_name, grouping_key=grouping_key, mode="add")
+        if exporter is not None:
+            exporter.stop()  # final push, after every worker's final dump
+        elif cfg.metrics.enabled:
+            push_metrics(
+                cfg.metrics.pushgateway_url,
+                cfg.metrics.job_name,
+                grouping_key=_grouping_key(),
+                mode="add",
+                registry=_session_metrics(metrics_dir)(),
+                timeout_s=cfg.metrics.push_timeout_s,
+            )
     except Exception:
         return
+    finally:
+        server = config.stash.get(_METRICS_SERVER, None)
+        if server is not None:
+            server.shutdown()
+        if metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def _start_metrics_export(config, cfg) -> None:
+    m = cfg.metrics
+    if _is_xdist_worker(config):
+        metrics_dir = config.workerinput.get("metrics_dir")
+        if metrics_dir and m.push_interval_s:
+            # Keep the dump fresh so the controller's periodic pushes include this worker.
+            dump_path = pathlib.Path(metrics_dir) / f"{config.workerinput['workerid']}.prom"
+            exporter = MetricsExporter(lambda: REGISTRY, interval_s=m.push_interval_s, dump_path=dump_path)
+            config.stash[_METRICS_EXPORTER] = exporter.start()
+        return
+    source = _session_metrics(config.stash[_METRICS_DIR])
+    if m.enabled and m.push_interval_s:
+        exporter = MetricsExporter(
+            source,
+            interval_s=m.push_interval_s,
+            pushgateway_url=m.pushgateway_url,
+            job_name=m.job_name,
+            grouping_key=_grouping_key(),
+            timeout_s=m.push_timeout_s,
+        )
+        config.stash[_METRICS_EXPORTER] = exporter.start()
+    if m.http_port is not None:
+        config.stash[_METRICS_SERVER] = serve_metrics(m.http_port, source)
 
 
 def pytest_configure(config):
     cfg = load_config()
     pathlib.Path(cfg.reporting.allure_results_dir).mkdir(parents=True, exist_ok=True)
     pathlib.Path(os.path.dirname(cfg.reporting.html_report_path)).mkdir(parents=True, exist_ok=True)
+    configure_attachments(mode=cfg.reporting.attach_mode, max_body_bytes=cfg.reporting.attach_max_body_bytes)
+    track_allure_steps()
+    config.stash[_CIRCUIT_ON_OPEN] = cfg.circuit_breaker.on_open
+    configure_series_budget(cfg.metrics.max_series)
+    if not _is_xdist_worker(config):
+        config.stash[_METRICS_DIR] = pathlib.Path(tempfile.mkdtemp(prefix="pytest-metrics-"))
+    _start_metrics_export(config, cfg)
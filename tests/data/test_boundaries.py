@@ -38,3 +38,34 @@ def test_large_json_payload_roundtrip(api):
         with allure.step("POST /anything (json)"):
             data = api.anything_post_json(payload)
         assert data.json == payload
+
+
+@allure.story("Data boundaries")
+@allure.title("QA Data: Multi-megabyte json payload roundtrip (streamed)")
+def test_multi_megabyte_json_payload_streamed(api):
+    big = "x" * (4 * 1024 * 1024)  # 4MB, echoed back twice (data + json)
+    payload = {"blob": big}
+    with track_test_duration("test_multi_megabyte_json_payload_streamed"):
+        with allure.step("POST /anything (json, streamed response)"):
+            data = api.anything_post_json_streamed(payload)
+        assert data.json == payload
+
+
+@allure.story("Data boundaries")
+@allure.title("QA Data: Streamed bytes are hashed incrementally")
+def test_stream_bytes_digest(api):
+    n = 100 * 1024  # httpbin caps /stream-bytes at 100 KB
+    with allure.step(f"GET /stream-bytes/{n} twice with the same seed"):
+        first = api.stream_bytes(n, seed=42, chunk_size=8 * 1024)
+        second = api.stream_bytes(n, seed=42)
+    assert first.size == n
+    assert first.hexdigest == second.hexdigest
+    assert first.prefix == second.prefix and len(first.prefix) == 1024
+
+
+@allure.story("Data boundaries")
+@allure.title("QA Data: Newline-delimited json is parsed line by line")
+def test_stream_json_lines(api):
+    with allure.step("GET /stream/25"):
+        lines = list(api.stream_json(25))
+    assert [line["id"] for line in lines] == list(range(25))
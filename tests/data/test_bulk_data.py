@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from itertools import islice
+
+import allure
+
+import pytest
+
+from framework.data_gen import ALPHABET, iter_user_payloads, make_user_payloads, rand_strings
+
+
+pytestmark = pytest.mark.data
+
+
+allure.dynamic.suite("Data")
+
+
+@allure.story("Bulk data generation")
+@allure.title("QA Data: Bulk payloads and strings are reproducible per seed")
+def test_bulk_generation_is_deterministic():
+    assert make_user_payloads(500, seed=7) == make_user_payloads(500, seed=7)
+    assert make_user_payloads(500, seed=7) != make_user_payloads(500, seed=8)
+    strings = rand_strings(1000, 3, 9, seed=11)
+    assert strings == rand_strings(1000, 3, 9, seed=11)
+    assert all(3 <= len(s) <= 9 and set(s) <= set(ALPHABET) for s in strings)
+
+
+@allure.story("Bulk data generation")
+@allure.title("QA Data: Payload stream is lazy and well-formed")
+def test_payload_stream_is_lazy():
+    stream = iter_user_payloads(seed=3, pool_size=64, batch_size=100)
+    first = list(islice(stream, 250))
+    assert len(first) == 250
+    assert all("@" in u.email and str(u.user_id) in u.email for u in first)
+    assert len({u.name for u in first}) <= 64
+
+
+@allure.story("Bulk data generation")
+@allure.title("QA Data: Bulk payloads roundtrip through /anything")
+def test_bulk_payloads_roundtrip(api):
+    users = make_user_payloads(20)
+    with allure.step(f"POST /anything x{len(users)} (batched)"):
+        results = list(api.batch(lambda a, user: a.anything_post_json(user.as_dict()), users))
+    assert [r.index for r in results] == list(range(len(users)))
+    for result in results:
+        assert result.unwrap().json == result.item.as_dict()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+
+import allure
+
+import pytest
+
+from framework import data_gen
+from framework.data_gen import cached_user_payloads, make_user_payloads
+from framework.dataset_cache import Dataset, DatasetCache
+
+
+pytestmark = pytest.mark.data
+
+
+allure.dynamic.suite("Data")
+
+
+@allure.story("Dataset cache")
+@allure.title("QA Data: Cached dataset reloads identical rows from disk")
+def test_cached_dataset_roundtrip(tmp_path, monkeypatch):
+    cache = DatasetCache(tmp_path)
+    expected = make_user_payloads(2000, seed=5)
+
+    with cached_user_payloads(2000, seed=5, cache=cache) as first:
+        assert isinstance(first, Dataset)
+        assert list(first) == expected
+
+    def _no_generation(*args, **kwargs):
+        raise AssertionError("dataset should come from the cache")
+
+    monkeypatch.setattr(data_gen, "iter_user_payloads", _no_generation)
+    with cached_user_payloads(2000, seed=5, cache=cache) as again:
+        assert len(again) == 2000
+        assert again[0] == expected[0] and again[-1] == expected[-1]
+        assert again[10:13] == expected[10:13]
+        assert again.column("user_id") == [u.user_id for u in expected]
+
+
+@allure.story("Dataset cache")
+@allure.title("QA Data: Least recently used datasets are evicted")
+def test_dataset_cache_lru_eviction(tmp_path):
+    cache = DatasetCache(tmp_path, max_entries=2)
+    for i, seed in enumerate((1, 2, 3)):
+        with cached_user_payloads(10, seed=seed, cache=cache) as ds:
+            # Explicit, increasing "last used" stamps: filesystem mtime resolution varies.
+            os.utime(ds.path, (1_000_000 + i, 1_000_000 + i))
+
+    seeds = set()
+    for path in tmp_path.glob("*.qads"):
+        with Dataset(path, data_gen.UserPayload) as ds:
+            seeds.add(ds.header["parts"]["seed"])
+    assert seeds == {2, 3}
+
+
+@allure.story("Dataset cache")
+@allure.title("QA Data: Session dataset follows TEST_SEED")
+def test_session_dataset_is_seeded(dataset_cache, test_seed):
+    users = cached_user_payloads(500, seed=test_seed, cache=dataset_cache)
+    assert list(users[:5]) == make_user_payloads(500, seed=test_seed)[:5]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+
+import allure
+
+import pytest
+
+from framework.metrics import get_current_test_name, set_current_test_name
+from framework.reporting import attachment_pipeline
+from framework.reporting.allure_helpers import attach_request
+from framework.reporting.attachment_pipeline import AttachmentPipeline
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pipeline = AttachmentPipeline(mode="always", max_body_bytes=200)
+    monkeypatch.setattr(attachment_pipeline, "_PIPELINE", pipeline)
+    yield pipeline
+    pipeline.close()
+
+
+@allure.story("Reporting")
+@allure.title("QA Platform: Request attachments are snapshotted when the request is sent")
+def test_request_attachment_snapshot(pipeline):
+    params = {"q": "first"}
+    body = {"items": [1, 2, 3]}
+    attach_request("POST", "http://x.test/anything", params=params, body=body)
+    params["q"] = "changed"
+    body["items"].append(object())  # would not even serialise any more
+
+    drained = pipeline._drain(get_current_test_name(), 5)
+    rendered = {name: (text, kind) for text, name, kind in drained}
+
+    assert json.loads(rendered["request.params"][0]) == {"q": "first"}
+    text, kind = rendered["request.body"]
+    assert json.loads(text) == {"items": [1, 2, 3]} and "\n  " in text  # pretty-printed
+    assert kind == allure.attachment_type.JSON
+
+
+@allure.story("Reporting")
+@allure.title("QA Platform: Large request bodies are capped before they are rendered")
+def test_request_attachment_capped(pipeline):
+    attach_request("POST", "http://x.test/anything", body={"blob": "x" * 100_000})
+    attach_request("POST", "http://x.test/anything", body="y" * 100_000)
+
+    drained = pipeline._drain(get_current_test_name(), 5)
+    bodies = [(text, kind) for text, name, kind in drained if name == "request.body"]
+
+    assert bodies[0] == ('{"blob":"' + "x" * 191 + "\n...<truncated>...", allure.attachment_type.TEXT)
+    assert bodies[1] == ("y" * 200 + "\n...<truncated>...", allure.attachment_type.TEXT)
+
+
+@allure.story("Reporting")
+@allure.title("QA Platform: Request snapshots stop serialising at the cap")
+def test_request_snapshot_is_incremental(pipeline):
+    rendered = []
+
+    class Item:
+        def __str__(self):
+            rendered.append(self)
+            return "item"
+
+    attach_request("POST", "http://x.test/anything", body=[Item() for _ in range(100_000)])
+
+    assert len(rendered) < 100  # about 200 bytes' worth, not the whole list
+    drained = pipeline._drain(get_current_test_name(), 5)
+    (body,) = [text for text, name, kind in drained if name == "request.body"]
+    assert body == ("[" + '"item",' * 30)[:200] + "\n...<truncated>..."
+
+
+@pytest.fixture
+def attached(monkeypatch):
+    calls = []
+    monkeypatch.setattr(allure, "attach", lambda body, name, attachment_type: calls.append(name))
+    return calls
+
+
+@allure.story("Reporting")
+@allure.title("QA Platform: Attachments are keyed by the test begun, not a stale current name")
+def test_attachments_keyed_by_begun_test(pipeline, attached):
+    pipeline.begin("tests/x.py::test_x")
+    nodeid = get_current_test_name()
+    set_current_test_name("tests/earlier.py::test_earlier")  # e.g. a fixture running before _current_test
+    try:
+        attach_request("GET", "http://x.test/get")
+    finally:
+        set_current_test_name(nodeid)
+
+    assert pipeline.flush("tests/x.py::test_x", failed=False) == 2
+    assert attached == ["request.method", "request.url"]
+    assert pipeline.discard_all() == 0
+
+
+@allure.story("Reporting")
+@allure.title("QA Platform: Attachments made inside a step are attached as the step closes")
+def test_attachments_nested_in_steps(pipeline, attached):
+    with allure.step("outer"):
+        attach_request("GET", "http://x.test/outer")
+        with allure.step("inner"):
+            attach_request("GET", "http://x.test/inner")
+        assert attached == ["request.method", "request.url"]  # inner's, while inner was open
+    assert len(attached) == 4
+    attach_request("GET", "http://x.test/after")
+    assert len(attached) == 4
+
+    assert pipeline.flush(get_current_test_name(), failed=False) == 2
+
+
+@allure.story("Reporting")
+@allure.title("QA Platform: In on_failure mode step attachments wait for the verdict, titled by step")
+def test_on_failure_keeps_step_title(monkeypatch, attached):
+    pipeline = AttachmentPipeline(mode="on_failure")
+    monkeypatch.setattr(attachment_pipeline, "_PIPELINE", pipeline)
+    try:
+        with allure.step("GET /get"):
+            attach_request("GET", "http://x.test/get")
+        assert attached == []
+        assert pipeline.flush(get_current_test_name(), failed=True) == 2
+        assert attached == ["GET /get: request.method", "GET /get: request.url"]
+    finally:
+        pipeline.close()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import time
+
+import allure
+
+import pytest
+import requests
+
+from framework.batch import RequestSpec, map_concurrent
+from framework.config import RetryConfig, ServiceConfig
+from framework.fault_injection import Fault, FaultPlan
+from framework.http_client import HttpClient
+from framework.metrics import get_current_test_name
+from framework.retry import VirtualClock
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+
+def _client(base_url: str, **kwargs) -> HttpClient:
+    return HttpClient(
+        service=ServiceConfig(base_url=base_url, timeout_s=5, pool_maxsize=16),
+        retry_cfg=RetryConfig(attempts=3, backoff_s=0.2, backoff_multiplier=2.0, retry_on_statuses=[503]),
+        **kwargs,
+    )
+
+
+@allure.story("Batch requests")
+@allure.title("QA Platform: request_many keeps order and retries each item")
+def test_request_many_retries_per_item(local_httpbin):
+    plan = FaultPlan().route("/anything/flaky", Fault.respond(503))
+    plan.route("/anything/broken", then=Fault.reset())
+    client = _client(local_httpbin.url, faults=plan, clock=VirtualClock())
+
+    specs = [
+        RequestSpec.get("/anything/ok", params={"i": "0"}),
+        ("GET", "/anything/flaky"),
+        ("POST", "/anything/echo", {"json": {"i": 2}}),
+        RequestSpec.get("/status/404"),
+        RequestSpec.get("/anything/broken"),
+    ]
+    results = list(client.request_many(specs))
+
+    assert [r.index for r in results] == list(range(len(specs)))
+    assert results[0].unwrap().json()["args"] == {"i": "0"}
+    assert results[1].unwrap().status_code == 200
+    assert plan.count("/anything/flaky") == 2
+    assert results[2].unwrap().json()["json"] == {"i": 2}
+    assert results[3].unwrap().status_code == 404
+    assert not results[4].ok and isinstance(results[4].error, requests.ConnectionError)
+    assert plan.count("/anything/broken") == 3
+
+
+@allure.story("Batch requests")
+@allure.title("QA Platform: Batched calls overlap and keep the test context")
+def test_batch_runs_concurrently_in_test_context(local_httpbin, request):
+    client = _client(local_httpbin.url)
+    n, delay = 32, 0.2
+
+    def call(i: int):
+        return get_current_test_name(), client.get(f"/delay/{delay}", params={"i": str(i)}).status_code
+
+    started = time.perf_counter()
+    results = list(map_concurrent(call, range(n), concurrency=16, ordered=False))
+    elapsed = time.perf_counter() - started
+
+    assert sorted(r.index for r in results) == list(range(n))
+    assert {r.unwrap() for r in results} == {(request.node.nodeid, 200)}
+    # Sequential would take n * delay = 6.4 s; 16 workers need two rounds.
+    assert elapsed < n * delay / 4
+
+
+@allure.story("Batch requests")
+@allure.title("QA Platform: Batches consume their input lazily")
+def test_batch_input_is_lazy():
+    pulled = []
+
+    def specs():
+        for i in range(10_000):
+            pulled.append(i)
+            yield i
+
+    results = map_concurrent(lambda i: i * 2, specs(), concurrency=2, window=4)
+    first = [next(results).unwrap() for _ in range(3)]
+    results.close()
+
+    assert first == [0, 2, 4]
+    assert len(pulled) <= 8
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+
+import allure
+
+import pytest
+
+from framework.cassette import CassetteMismatchError, CassetteMissError, request_key
+from framework.config import CassetteConfig
+from framework.http_client import HttpClient
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+
+def _require_live(cfg) -> None:
+    if cfg.cassette.mode == "replay":
+        pytest.skip("Recording needs the live service; the session is replaying a cassette")
+
+
+def _client(cfg, cassette: CassetteConfig, base_url: str | None = None) -> HttpClient:
+    service = dataclasses.replace(cfg.service, base_url=base_url or cfg.service.base_url)
+    retry_cfg = dataclasses.replace(cfg.retry, attempts=1)
+    return HttpClient(service=service, retry_cfg=retry_cfg, cassette=cassette)
+
+
+@allure.story("Record / replay")
+@allure.title("QA Platform: Request keys ignore host and query/JSON ordering")
+def test_request_key_normalisation():
+    a = request_key("post", "https://httpbin.org/anything?b=2&a=1", b'{"x": 1, "y": [1, 2]}')
+    b = request_key("POST", "http://127.0.0.1:8080/anything?a=1&b=2", b'{"y":[1,2],"x":1}')
+    assert a == b
+    assert a != request_key("POST", "http://127.0.0.1:8080/anything?a=1&b=3", b'{"y":[1,2],"x":1}')
+
+
+@allure.story("Record / replay")
+@allure.title("QA Platform: Request keys include the headers that change the response")
+def test_request_key_headers():
+    html = request_key("GET", "/anything", headers={"Accept": "text/html", "X-Trace-Id": "1"})
+    assert html == request_key("GET", "/anything", headers={"accept": "TEXT/HTML", "X-Trace-Id": "2"})
+    assert html != request_key("GET", "/anything", headers={"Accept": "application/json"})
+    assert html != request_key("GET", "/anything")
+    gzip = request_key("GET", "/get", headers={"Accept-Encoding": "gzip, deflate"})
+    assert gzip == request_key("GET", "/get", headers={"Accept-Encoding": "deflate,gzip"})
+    assert request_key("GET", "/get", headers={"X-Env": "a"}, key_headers=("x-env",)) != request_key(
+        "GET", "/get", headers={"X-Env": "b"}, key_headers=("x-env",)
+    )
+
+
+@allure.story("Record / replay")
+@allure.title("QA Platform: Recorded responses replay offline in order")
+def test_record_then_replay_offline(cfg, tmp_path):
+    _require_live(cfg)
+    recorder = _client(cfg, CassetteConfig(mode="record", dir=str(tmp_path)))
+    recorded = [recorder.get("/uuid").json()["uuid"] for _ in range(2)]
+    echoed = recorder.post("/anything", json={"k": "v"}).json()["json"]
+
+    player = _client(cfg, CassetteConfig(mode="replay", dir=str(tmp_path)), base_url="http://127.0.0.1:1")
+    assert [player.get("/uuid").json()["uuid"] for _ in range(2)] == recorded
+    assert player.post("/anything", json={"k": "v"}).json()["json"] == echoed
+    with pytest.raises(CassetteMissError):
+        player.get("/headers")
+
+
+@allure.story("Record / replay")
+@allure.title("QA Platform: Replay picks the recording made with the same Accept header")
+def test_replay_keyed_by_accept(cfg, tmp_path):
+    _require_live(cfg)
+    recorder = _client(cfg, CassetteConfig(mode="record", dir=str(tmp_path)))
+    for accept in ["application/json", "text/html"]:
+        recorder.get("/anything", headers={"Accept": accept})
+
+    player = _client(cfg, CassetteConfig(mode="replay", dir=str(tmp_path)), base_url="http://127.0.0.1:1")
+    for accept in ["text/html", "application/json"]:  # order no longer matters
+        assert player.get("/anything", headers={"Accept": accept}).json()["headers"]["Accept"] == accept
+
+
+@allure.story("Record / replay")
+@allure.title("QA Platform: Verify mode flags drift between cassette and live service")
+def test_verify_mode_detects_drift(cfg, tmp_path):
+    _require_live(cfg)
+    _client(cfg, CassetteConfig(mode="record", dir=str(tmp_path))).get("/anything", params={"q": "1"})
+    verifier = _client(cfg, CassetteConfig(mode="verify", dir=str(tmp_path), verify_ratio=1.0))
+    assert verifier.get("/anything", params={"q": "1"}).status_code == 200
+
+    (cassette_file,) = [p for p in tmp_path.rglob("*.json") if p.name != "cassette.json"]
+    doc = json.loads(cassette_file.read_text("utf-8"))
+    doc["responses"][0]["status"] = 418
+    cassette_file.write_text(json.dumps(doc), encoding="utf-8")
+
+    verifier = _client(cfg, CassetteConfig(mode="verify", dir=str(tmp_path), verify_ratio=1.0))
+    with pytest.raises(CassetteMismatchError):
+        verifier.get("/anything", params={"q": "1"})
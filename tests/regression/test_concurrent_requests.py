@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+
+import allure
+
+import pytest
+
+from framework.metrics import track_test_duration
+
+try:
+    from framework.async_http_client import AsyncHttpClient
+    from framework.api.async_httpbin_api import AsyncHttpBinApi
+    import httpx
+except Exception:  # pragma: no cover
+    httpx = None  # type: ignore[assignment]
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+@allure.story("Concurrent requests")
+@allure.title("HTTPBin: Concurrent /anything fan-out over a shared pool")
+def test_concurrent_anything_fan_out(cfg):
+    if httpx is None:
+        pytest.skip("httpx is not installed. Install requirements-async.txt to run async tests.")
+
+    n = 50
+
+    async def fan_out():
+        async with AsyncHttpClient(
+            service=cfg.service, retry_cfg=cfg.retry, max_connections=10, cassette=cfg.cassette
+        ) as client:
+            api = AsyncHttpBinApi(client=client)
+            return await asyncio.gather(*(api.anything_get(params={"i": str(i)}) for i in range(n)))
+
+    with track_test_duration("test_concurrent_anything_fan_out"):
+        with allure.step(f"GET /anything x{n} concurrently"):
+            responses = asyncio.run(fan_out())
+        assert [r.status_code for r in responses] == [200] * n
+        assert [r.json()["args"]["i"] for r in responses] == [str(i) for i in range(n)]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from urllib.parse import urlsplit
+
+import allure
+
+import pytest
+
+from framework.metrics import REGISTRY, track_test_duration
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+
+def _sample(name: str, host: str) -> float:
+    return REGISTRY.get_sample_value(name, {"host": host}) or 0.0
+
+
+@allure.story("Connection pool")
+@allure.title("QA Platform: Sequential requests reuse a keep-alive connection")
+def test_sequential_requests_reuse_connection(client, cfg):
+    if cfg.cassette.mode != "off":
+        pytest.skip("No connections are opened while replaying a cassette")
+    if cfg.service.http_version != "1.1":
+        pytest.skip("The urllib3 pool is not used by the HTTP/2 transport")
+    host = urlsplit(cfg.service.base_url).hostname
+    opened_before = _sample("http_pool_connections_opened_total", host)
+    reused_before = _sample("http_pool_connections_reused_total", host)
+
+    n = 5
+    with track_test_duration("test_sequential_requests_reuse_connection"):
+        with allure.step(f"GET /anything x{n}"):
+            for _ in range(n):
+                # no-cache: with the response cache enabled every call must still hit the pool.
+                assert client.get("/anything", headers={"Cache-Control": "no-cache"}).status_code == 200
+
+    opened = _sample("http_pool_connections_opened_total", host) - opened_before
+    reused = _sample("http_pool_connections_reused_total", host) - reused_before
+    assert opened <= 1, "At most one new connection should be opened for sequential requests"
+    assert reused >= n - 1
+    assert REGISTRY.get_sample_value("http_pool_connections_in_use", {"host": host}) == 0
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+
+import allure
+
+import pytest
+import requests
+
+from framework.config import RetryConfig, ServiceConfig
+from framework.http_client import HttpClient
+
+try:
+    import h2
+    import zstandard
+except Exception:  # pragma: no cover
+    h2 = zstandard = None  # type: ignore[assignment]
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+RETRY = RetryConfig(attempts=1, backoff_s=0, backoff_multiplier=1, retry_on_statuses=[])
+
+
+def _client(base_url: str, timeout_s: float = 5, **service) -> HttpClient:
+    if h2 is None or zstandard is None:
+        pytest.skip("httpx[http2] / zstandard are not installed. Install requirements-async.txt.")
+    return HttpClient(service=ServiceConfig(base_url=base_url, timeout_s=timeout_s, **service), retry_cfg=RETRY)
+
+
+@allure.story("HTTP/2")
+@allure.title("QA Platform: Concurrent requests multiplex over one HTTP/2 connection")
+def test_h2c_multiplexes_one_connection(local_httpbin):
+    client = _client(local_httpbin.url, http_version="h2c", pool_maxsize=8)
+    connections = local_httpbin.stats["h2_connections"]
+    streams = local_httpbin.stats["h2_streams"]
+
+    n, delay = 32, 0.3
+    started = time.perf_counter()
+    results = list(client.request_many([("GET", f"/delay/{delay}")] * n, concurrency=n))
+    elapsed = time.perf_counter() - started
+
+    assert {r.unwrap().status_code for r in results} == {200}
+    assert {r.value.http_version for r in results} == {"HTTP/2"}
+    assert local_httpbin.stats["h2_connections"] - connections == 1
+    assert local_httpbin.stats["h2_streams"] - streams == n
+    # One after another would take n * delay (9.6 s); the bound leaves room for busy CI hosts.
+    assert elapsed < delay * n / 4
+
+
+@allure.story("HTTP/2")
+@allure.title("QA Platform: HTTP/2 transport keeps streaming, redirects and timeouts")
+def test_h2c_transport_behaves_like_requests(local_httpbin):
+    client = _client(local_httpbin.url, http_version="h2c")
+
+    with client.stream("GET", "/stream-bytes/102400", params={"seed": 5, "chunk_size": 16384}) as resp:
+        assert sum(len(chunk) for chunk in resp.iter_content(8192)) == 102_400
+    assert client.get("/gzip").json()["gzipped"] is True
+    assert client.get("/status/418").status_code == 418
+
+    slow = _client(local_httpbin.url, http_version="h2c", timeout_s=0.2)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        slow.get("/delay/2")
+
+
+@allure.story("Compression")
+@allure.title("QA Platform: Large request bodies are sent compressed, small ones as-is")
+@pytest.mark.parametrize("encoding, http_version", [("gzip", "1.1"), ("zstd", "1.1"), ("zstd", "h2c")])
+def test_request_body_compression(local_httpbin, encoding, http_version):
+    client = _client(
+        local_httpbin.url, http_version=http_version, request_compression=encoding, compression_min_bytes=256
+    )
+    large = {"items": [{"id": i, "name": f"user-{i}"} for i in range(200)]}
+
+    resp = client.post("/anything", json=large)
+    echoed = resp.json()
+    assert echoed["json"] == large
+    assert echoed["headers"]["Content-Encoding"] == encoding
+    assert len(resp.request.body) < len(str(large)) / 2  # what went on the wire
+
+    small = client.post("/anything", json={"id": 1}).json()
+    assert small["json"] == {"id": 1}
+    assert "Content-Encoding" not in small["headers"]
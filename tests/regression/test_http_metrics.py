@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import dataclasses
+
+import allure
+
+import pytest
+
+from framework.config import ServiceConfig
+from framework.http_client import HttpClient
+from framework.metrics import REGISTRY
+
+
+pytestmark = [pytest.mark.regression, pytest.mark.usefixtures("scratch_metrics")]
+
+
+allure.dynamic.suite("Regression")
+
+
+def _count(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(f"{name}_count", labels) or 0.0
+
+
+@pytest.fixture
+def fresh_client(local_httpbin, cfg):
+    # Its own pool against the in-process server: the first request must open a connection.
+    client = HttpClient(
+        service=ServiceConfig(base_url=local_httpbin.url, timeout_s=cfg.service.timeout_s),
+        retry_cfg=dataclasses.replace(cfg.retry, attempts=1),
+    )
+    yield client
+    client.session.close()
+
+
+@allure.story("Observability")
+@allure.title("QA Platform: Each request is observed once with its method, path, status and attempt")
+def test_request_duration_labels(fresh_client):
+    labels = dict(method="GET", path_template="/anything/http-metrics", status_class="2xx", attempt="1")
+    teapot = dict(method="GET", path_template="/status/{n}", status_class="4xx", attempt="1")
+    # Other tests may already have observed /status/{n}: compare against the count before.
+    teapot_before = _count("http_request_duration_seconds", **teapot)
+
+    with allure.step("GET /anything/http-metrics x2, GET /status/418"):
+        for _ in range(2):
+            assert fresh_client.get("/anything/http-metrics").status_code == 200
+        assert fresh_client.get("/status/418").status_code == 418
+
+    assert _count("http_request_duration_seconds", **labels) == 2
+    assert _count("http_request_duration_seconds", **teapot) - teapot_before == 1
+    assert _count("http_request_duration_seconds", **dict(labels, method="get")) == 0
+
+
+@allure.story("Observability")
+@allure.title("QA Platform: Connect phase is observed only when a connection is opened")
+def test_request_phases(fresh_client):
+    def phase(name: str) -> float:
+        return _count(
+            "http_request_phase_duration_seconds", method="GET", path_template="/anything/phases", phase=name
+        )
+
+    with allure.step("GET /anything/phases on a fresh pool"):
+        assert fresh_client.get("/anything/phases").status_code == 200
+    assert (phase("connect"), phase("ttfb"), phase("download")) == (1, 1, 1)
+
+    with allure.step("GET /anything/phases over the kept-alive connection"):
+        assert fresh_client.get("/anything/phases").status_code == 200
+    assert (phase("connect"), phase("ttfb"), phase("download")) == (1, 2, 2)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import random
+
+import allure
+
+import pytest
+
+from framework.load.histogram import LatencyHistogram
+from framework.load.runner import LoadProfile, LoadRunner
+from framework.load.scenarios import parse_mix
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+
+@allure.story("Load runner")
+@allure.title("QA Platform: Latency histogram percentiles stay within its precision")
+def test_latency_histogram_precision():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(-4, 1.5) for _ in range(20_000))
+    hist, other = LatencyHistogram(significant_figures=2), LatencyHistogram(significant_figures=2)
+    for i, v in enumerate(values):
+        (hist if i % 2 else other).record(v)
+    hist.merge(other)
+
+    assert hist.count == len(values)
+    for q in (50, 90, 99, 99.9):
+        exact = values[max(0, int(q / 100 * len(values) + 0.5) - 1)]
+        assert hist.percentile(q) == pytest.approx(exact, rel=0.01, abs=2e-6)
+    assert hist.percentile(100) == pytest.approx(values[-1], abs=1e-6)
+
+
+@allure.story("Load runner")
+@allure.title("QA Platform: Open-loop run holds the target rate and reports every scenario")
+def test_open_loop_run(api):
+    profile = LoadProfile(duration_s=1.0, mix=parse_mix(["uuid:2", "headers"]), rps=20, concurrency=8, seed=1)
+    report = LoadRunner(api, profile).run()
+
+    total = report["total"]
+    assert abs(total["requests"] - 20) <= 1
+    assert total["errors"] == 0
+    assert set(report["scenarios"]) == {"uuid", "headers"}
+    assert total["latency_ms"]["p50"] <= total["latency_ms"]["p99"] <= total["latency_ms"]["max"]
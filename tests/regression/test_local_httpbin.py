@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import allure
+
+import pytest
+
+from framework.api.httpbin_api import HttpBinApi
+from framework.config import RetryConfig, ServiceConfig
+from framework.http_client import HttpClient
+from framework.local_httpbin import LocalHttpBin
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+
+@pytest.fixture(scope="module")
+def stub_api(local_httpbin: LocalHttpBin) -> HttpBinApi:
+    client = HttpClient(
+        service=ServiceConfig(base_url=local_httpbin.url, timeout_s=5, pool_maxsize=64),
+        retry_cfg=RetryConfig(attempts=1, backoff_s=0, backoff_multiplier=1, retry_on_statuses=[]),
+    )
+    return HttpBinApi(client=client)
+
+
+@allure.story("Local httpbin")
+@allure.title("QA Platform: Local httpbin answers with httpbin's response shapes")
+def test_local_httpbin_response_shapes(stub_api):
+    # The strict (extra="forbid") models fail on any key httpbin would not send.
+    echoed = stub_api.anything_post_json({"a": [1, 2]}, headers={"X-Trace-Id": "t-1"})
+    assert echoed.json == {"a": [1, 2]}
+    assert echoed.method == "POST"
+    assert echoed.headers["X-Trace-Id"] == "t-1"
+    assert stub_api.anything_post_form({"a": "1", "b": "2"}).form == {"a": "1", "b": "2"}
+    assert stub_api.uuid().uuid.version == 4
+    assert "User-Agent" in stub_api.headers().headers
+
+    args = stub_api.anything_get(params={"k": ["1", "2"], "one": "x"}).json()["args"]
+    assert args == {"k": ["1", "2"], "one": "x"}
+
+
+@allure.story("Local httpbin")
+@allure.title("QA Platform: Local httpbin status, html and streaming endpoints")
+def test_local_httpbin_endpoints(stub_api):
+    client = stub_api.client
+    assert client.get("/status/418").status_code == 418
+    assert client.get("/status/201,201").status_code == 201
+    html = client.get("/html")
+    assert html.headers["Content-Type"].startswith("text/html") and "<html" in html.text
+    assert client.get("/no-such-endpoint").status_code == 404
+
+    first = stub_api.stream_bytes(100_000, seed=3, chunk_size=4096)
+    assert first.size == 100_000
+    assert stub_api.stream_bytes(100_000, seed=3).hexdigest == first.hexdigest
+    assert stub_api.stream_bytes(3 * 1024 * 1024, seed=3).size == 100 * 1024  # httpbin's cap
+    assert len(client.get("/bytes/200000").content) == 100 * 1024
+    assert [line["id"] for line in stub_api.stream_json(5)] == list(range(5))
+
+
+@allure.story("Local httpbin")
+@allure.title("QA Platform: Local httpbin serves delays concurrently")
+def test_local_httpbin_concurrent_delays(stub_api):
+    n, delay = 64, 0.5
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        statuses = list(pool.map(lambda _: stub_api.client.get(f"/delay/{delay}").status_code, range(n)))
+    elapsed = time.perf_counter() - started
+
+    assert statuses == [200] * n
+    # A blocking server would need n * delay; the event loop overlaps them all.
+    assert elapsed < delay * 4
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import time
+
+import allure
+
+import pytest
+
+from framework.config import MessagingConfig
+from framework.load.messaging import STAMP, MessagingBenchmark, MessagingProfile, publish_report
+from framework.messaging import Message
+from framework.metrics import REGISTRY
+
+try:
+    import pika
+except Exception:  # pragma: no cover
+    pika = None
+
+
+pytestmark = [pytest.mark.regression, pytest.mark.usefixtures("scratch_metrics")]
+
+
+allure.dynamic.suite("Regression")
+
+
+@pytest.fixture
+def broker(request):
+    if pika is None:
+        pytest.skip("pika is not installed. Install requirements-messaging.txt.")
+    return request.getfixturevalue("local_amqp")
+
+
+def _drain(conn, deliveries, expected, timeout_s=2.0):
+    # process_data_events returns as soon as anything is dispatched, not after time_limit.
+    deadline = time.monotonic() + timeout_s
+    while len(deliveries) < expected and time.monotonic() < deadline:
+        conn.process_data_events(time_limit=deadline - time.monotonic())
+    conn.process_data_events(time_limit=0.2)  # anything past ``expected`` would show up now
+
+
+@allure.story("Messaging benchmark")
+@allure.title("QA Platform: Local AMQP broker honours prefetch, requeue and mandatory returns")
+def test_local_amqp_semantics(broker):
+    conn = pika.BlockingConnection(pika.URLParameters(broker.url))
+    try:
+        ch = conn.channel()
+        queue = ch.queue_declare("", exclusive=True).method.queue
+        returned = []
+        ch.add_on_return_callback(lambda *args: returned.append(args[1].routing_key))
+        for i in range(20):
+            ch.basic_publish("", queue, str(i).encode())
+        ch.basic_publish("", "no.such.queue", b"x", mandatory=True)
+
+        ch.basic_qos(prefetch_count=5)
+        deliveries = []
+        tag = ch.basic_consume(queue, lambda c, m, p, b: deliveries.append((m.delivery_tag, m.redelivered, b)))
+        _drain(conn, deliveries, 5)
+        assert [b for _, _, b in deliveries] == [str(i).encode() for i in range(5)]  # window full, no acks
+
+        ch.basic_nack(deliveries[0][0], requeue=True)
+        ch.basic_ack(deliveries[4][0], multiple=True)
+        _drain(conn, deliveries, 10)
+        redelivered = deliveries[5]
+        assert redelivered[1:] == (True, b"0")
+        assert len(deliveries) == 10
+        ch.basic_cancel(tag)
+        assert returned == ["no.such.queue"]
+
+        with pytest.raises(pika.exceptions.ChannelClosedByBroker) as exc:
+            ch.queue_declare("no.such.queue", passive=True)
+        assert exc.value.reply_code == 404
+    finally:
+        conn.close()
+
+
+@allure.story("Messaging benchmark")
+@allure.title("QA Platform: Messaging benchmark paces publishing and reports throughput and latency")
+def test_messaging_benchmark(broker):
+    cfg = MessagingConfig(amqp_url=broker.url, queue="bench.events", connect_attempts=1)
+    profile = MessagingProfile(count=600, rate=1000, message_bytes=512, drain_s=5)
+
+    report = MessagingBenchmark(cfg, profile).run()
+
+    assert report["published"] == report["consumed"] == 600
+    assert report["lost"] == report["nacked"] == report["foreign"] == 0
+    assert 0.5 <= report["publish"]["elapsed_s"] < 2  # 600 messages at 1000/s, not as fast as possible
+    assert report["publish"]["throughput_mps"] <= 1000 * 1.1
+    latency = report["latency_ms"]
+    assert 0 < latency["p50"] <= latency["p99"] <= latency["max"]
+    assert report["transit_ms"]["p50"] <= latency["p50"]
+    json.dumps(report)
+
+    publish_report(report)
+    consumed = REGISTRY.get_sample_value(
+        "messaging_throughput_messages_per_second", {"queue": "bench.events", "direction": "consume"}
+    )
+    assert consumed == pytest.approx(report["consume"]["throughput_mps"])
+    p99 = REGISTRY.get_sample_value("messaging_latency_seconds", {"queue": "bench.events", "quantile": "p99"})
+    assert p99 == latency["p99"] / 1000
+
+
+@allure.story("Messaging benchmark")
+@allure.title("QA Platform: Messaging benchmark counts short and other runs' messages as foreign")
+def test_messaging_benchmark_skips_foreign_messages():
+    bench = MessagingBenchmark(MessagingConfig(amqp_url="amqp://unused"), MessagingProfile(count=1))
+    ours = next(bench._bodies(range(1), time.time_ns()))
+    other_run = STAMP.pack(bytes(16), 0, 0, 0)
+
+    for body in (b"", b'{"event": "signup"}', other_run, ours):
+        bench._on_message(Message(body=body, routing_key="bench.events", properties=None))
+
+    assert bench._foreign == 3
+    assert bench._consumed == 1
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import allure
+
+import pytest
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from framework.metrics import (
+    OVERFLOW_LABEL,
+    REGISTRY,
+    SeriesBudget,
+    get_current_test_name,
+    inc_retry,
+    normalize_test_name,
+    path_template,
+)
+
+
+pytestmark = [pytest.mark.regression, pytest.mark.usefixtures("scratch_metrics")]
+
+
+allure.dynamic.suite("Regression")
+
+
+@allure.story("Observability")
+@allure.title("QA Platform: Parametrised cases share their test's metric series")
+@pytest.mark.parametrize("case", ["a", "b"])
+def test_parametrised_cases_share_series(case):
+    nodeid = get_current_test_name()
+    assert nodeid.endswith(f"[{case}]")
+    label = {"test_name": normalize_test_name(nodeid)}
+    # scratch_metrics removed the other case's fake retry when it ended.
+    assert REGISTRY.get_sample_value("test_retries_total", label) is None
+
+    inc_retry()
+
+    assert label["test_name"].endswith("::test_parametrised_cases_share_series")
+    assert REGISTRY.get_sample_value("test_retries_total", label) == 1
+    assert REGISTRY.get_sample_value("test_retries_total", {"test_name": nodeid}) is None
+
+
+@allure.story("Observability")
+@allure.title("QA Platform: URLs are labelled by path template, without host or query")
+def test_path_template_normalises_urls():
+    assert path_template("https://httpbin.org/status/503?x=1") == "/status/{n}"
+    assert path_template("/anything/6f1c2a9e-3b7d-4c1e-9a52-0d8e7f6b5a41") == "/anything/{uuid}"
+    assert path_template("/delay/0.5#frag") == "/delay/{n}"
+
+
+@allure.story("Observability")
+@allure.title("QA Platform: Series past the budget go to an overflow bucket and are counted")
+def test_series_budget_overflow():
+    registry = CollectorRegistry()
+    dropped = Counter("budget_dropped_series_total", "Dropped", ["metric"], registry=registry)
+    retries = Counter("budget_retries_total", "Retries", ["test_name"], registry=registry)
+    duration = Histogram(
+        "budget_request_seconds", "Duration", ["method", "path_template"], buckets=(1.0,), registry=registry
+    )
+    budget = SeriesBudget(max_series=2, dropped_counter=dropped)
+
+    for name in ["t1", "t2", "t3", "t4", "t3", "t1"]:
+        budget.labels(retries, test_name=name).inc()
+    for path in ["/get", "/post", "/status/{n}", "/delay/{n}"]:
+        budget.labels(duration, method="GET", path_template=path).observe(0.1)
+
+    assert registry.get_sample_value("budget_retries_total", {"test_name": "t1"}) == 2
+    assert registry.get_sample_value("budget_retries_total", {"test_name": "t3"}) is None
+    assert registry.get_sample_value("budget_retries_total", {"test_name": OVERFLOW_LABEL}) == 3
+    overflow = {"method": "GET", "path_template": OVERFLOW_LABEL}
+    assert registry.get_sample_value("budget_request_seconds_count", overflow) == 2
+    assert budget.dropped() == {"budget_retries_total": 2, "budget_request_seconds": 2}
+    assert registry.get_sample_value("budget_dropped_series_total", {"metric": "budget_retries_total"}) == 2
+    assert REGISTRY.get_sample_value("metrics_dropped_series_total", {"metric": "budget_retries_total"}) is None
+
+    budget.reset()
+    assert budget.dropped() == {}
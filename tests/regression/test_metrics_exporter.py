@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import allure
+
+import pytest
+from prometheus_client import CollectorRegistry, Counter, Gauge
+
+from framework.metrics_exporter import MetricsExporter, serve_metrics
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+
+class _Pushgateway(ThreadingHTTPServer):
+    """Records the body of every push; ``delay_s`` makes it answer slowly."""
+
+    daemon_threads = True
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.delay_s = delay_s
+        self.pushes: list[str] = []
+        gateway = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+                time.sleep(gateway.delay_s)
+                gateway.pushes.append(body)
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        super().__init__(("127.0.0.1", 0), Handler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+@pytest.fixture
+def pushgateway():
+    servers = []
+
+    def start(delay_s: float = 0.0) -> _Pushgateway:
+        server = _Pushgateway(delay_s)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _registry():
+    registry = CollectorRegistry()
+    counter = Counter("test_retries_total", "Retries", ["test_name"], registry=registry)
+    gauge = Gauge("http_pool_connections_in_use", "In use", registry=registry)
+    return registry, counter, gauge
+
+
+@allure.story("Observability")
+@allure.title("QA Platform: The exporter pushes only the metric families that changed")
+def test_exporter_pushes_changed_families(pushgateway, tmp_path):
+    gateway = pushgateway()
+    registry, counter, gauge = _registry()
+    exporter = MetricsExporter(
+        lambda: registry, interval_s=60, pushgateway_url=gateway.url, job_name="t", dump_path=tmp_path / "gw0.prom"
+    )
+
+    assert exporter.export()
+    assert "test_retries_total" in gateway.pushes[0] and "http_pool_connections_in_use" in gateway.pushes[0]
+
+    assert exporter.export()
+    assert len(gateway.pushes) == 1  # nothing changed, nothing sent
+
+    counter.labels(test_name="a").inc()
+    assert exporter.export()
+    assert "test_retries_total" in gateway.pushes[1]
+    assert "http_pool_connections_in_use" not in gateway.pushes[1]
+    assert 'test_retries_total{test_name="a"} 1.0' in (tmp_path / "gw0.prom").read_text()
+
+    exporter.start()
+    exporter.stop()  # final flush re-sends everything
+    assert "http_pool_connections_in_use" in gateway.pushes[2]
+    assert exporter.pushes == 3 and exporter.failures == 0
+
+
+@allure.story("Observability")
+@allure.title("QA Platform: A slow Pushgateway times out without losing the pending metrics")
+def test_exporter_push_timeout(pushgateway):
+    slow = pushgateway(delay_s=2.0)
+    registry, counter, _gauge = _registry()
+    counter.labels(test_name="a").inc()
+    exporter = MetricsExporter(lambda: registry, interval_s=0.05, pushgateway_url=slow.url, timeout_s=0.2)
+
+    exporter.start()
+    time.sleep(0.3)
+    started = time.monotonic()
+    exporter.stop(final=False)
+    assert time.monotonic() - started < 1.5
+    assert exporter.failures >= 1 and exporter.pushes == 0
+
+    # Not marked as pushed: the next successful export still carries the counter.
+    exporter.pushgateway_url = pushgateway().url
+    assert exporter.export()
+    assert exporter.pushes == 1
+
+
+@allure.story("Observability")
+@allure.title("QA Platform: serve_metrics exposes the live registry for scraping")
+def test_serve_metrics():
+    registry, counter, _gauge = _registry()
+    server = serve_metrics(0, lambda: registry, addr="127.0.0.1")
+    try:
+        counter.labels(test_name="live").inc(2)
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5) as resp:
+            text = resp.read().decode()
+        assert 'test_retries_total{test_name="live"} 2.0' in text
+    finally:
+        server.shutdown()
+        server.server_close()
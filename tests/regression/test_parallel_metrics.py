@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import allure
+
+import pytest
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest
+
+from framework.metrics import dump_metrics, merge_worker_metrics
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+
+def _worker_registry(retries: int, durations: list[float]) -> CollectorRegistry:
+    registry = CollectorRegistry()
+    counter = Counter("test_retries_total", "Retries", ["test_name"], registry=registry)
+    hist = Histogram("test_duration_seconds", "Duration", ["test_name"], buckets=(0.1, 1.0), registry=registry)
+    counter.labels(test_name="t").inc(retries)
+    for value in durations:
+        hist.labels(test_name="t").observe(value)
+    return registry
+
+
+@allure.story("Parallel execution")
+@allure.title("QA Platform: Worker metric dumps merge into one registry labelled by worker")
+def test_merge_worker_metrics(tmp_path):
+    dump_metrics(tmp_path / "gw0.prom", _worker_registry(2, [0.05]))
+    dump_metrics(tmp_path / "gw1.prom", _worker_registry(3, [0.5, 2.0]))
+
+    merged = merge_worker_metrics(sorted(tmp_path.glob("*.prom")))
+
+    assert merged.get_sample_value("test_retries_total", {"test_name": "t", "worker": "gw0"}) == 2
+    assert merged.get_sample_value("test_retries_total", {"test_name": "t", "worker": "gw1"}) == 3
+    assert merged.get_sample_value("test_duration_seconds_count", {"test_name": "t", "worker": "gw1"}) == 2
+    assert merged.get_sample_value("test_duration_seconds_bucket", {"test_name": "t", "worker": "gw1", "le": "1.0"}) == 1
+    text = generate_latest(merged).decode()
+    assert "_created" not in text
+    assert text.count("# TYPE test_retries_total counter") == 1
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import allure
+
+import pytest
+
+from framework.config import ResponseCacheConfig, RetryConfig, ServiceConfig
+from framework.fault_injection import Fault, FaultPlan
+from framework.http_client import HttpClient
+from framework.metrics import REGISTRY
+from framework.retry import SYSTEM_CLOCK, VirtualClock
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+RETRY = RetryConfig(attempts=1, backoff_s=0, backoff_multiplier=1, retry_on_statuses=[])
+
+
+def _client(base_url: str, clock=SYSTEM_CLOCK, faults=None, **cache) -> HttpClient:
+    return HttpClient(
+        service=ServiceConfig(base_url=base_url, timeout_s=5),
+        retry_cfg=RETRY,
+        response_cache=ResponseCacheConfig(enabled=True, **cache),
+        faults=faults,
+        clock=clock,
+    )
+
+
+def _count(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@allure.story("Response cache")
+@allure.title("QA Platform: Fresh GETs are served from cache until the TTL runs out")
+def test_cache_hit_until_ttl(local_httpbin):
+    clock = VirtualClock()
+    client = _client(local_httpbin.url, clock, ttl_s=10)
+    hits = _count("http_cache_requests_total", outcome="hit")
+
+    first = client.get("/headers", headers={"Accept": "application/json"})
+    second = client.get("/headers", headers={"Accept": "application/json"})
+    other_accept = client.get("/headers", headers={"Accept": "text/plain"})
+
+    assert not getattr(first, "from_cache", False)
+    assert second.from_cache and second.json() == first.json()
+    assert not getattr(other_accept, "from_cache", False)
+    assert _count("http_cache_requests_total", outcome="hit") == hits + 1
+
+    clock.advance(11)
+    assert not getattr(client.get("/headers", headers={"Accept": "application/json"}), "from_cache", False)
+
+
+@allure.story("Response cache")
+@allure.title("QA Platform: Stale entries are revalidated with If-None-Match")
+def test_cache_revalidates_etag(local_httpbin):
+    clock = VirtualClock()
+    plan = FaultPlan()
+    client = _client(local_httpbin.url, clock, faults=plan, ttl_s=5)
+    revalidated = _count("http_cache_requests_total", outcome="revalidated")
+
+    body = client.get("/etag/v1").json()
+    clock.advance(6)
+    again = client.get("/etag/v1")
+
+    assert again.status_code == 200 and again.from_cache
+    assert again.json() == body
+    assert plan.count("/etag/v1") == 2  # the second one was the conditional request
+    assert _count("http_cache_requests_total", outcome="revalidated") == revalidated + 1
+    assert client.get("/etag/v1").from_cache  # fresh again after the 304
+
+
+@allure.story("Response cache")
+@allure.title("QA Platform: Uncacheable paths and LRU eviction")
+def test_cache_scope_and_eviction(local_httpbin):
+    client = _client(local_httpbin.url, max_entries=2)
+    evicted = _count("http_cache_evictions_total", reason="capacity")
+
+    assert client.get("/uuid").json() != client.get("/uuid").json()
+    for path in ("/anything/a", "/anything/b", "/anything/c"):
+        client.get(path)
+
+    cache = client.session.get_adapter(local_httpbin.url).cache
+    assert len(cache) == 2
+    assert _count("http_cache_evictions_total", reason="capacity") == evicted + 1
+    assert client.get("/anything/c").from_cache
+    assert not getattr(client.get("/anything/a"), "from_cache", False)
+
+
+@allure.story("Response cache")
+@allure.title("QA Platform: Concurrent identical GETs share one network call")
+def test_single_flight(local_httpbin):
+    # Real latency on the first call keeps it in flight while the others arrive.
+    plan = FaultPlan().route("/anything", Fault.delay(0.3))
+    client = _client(local_httpbin.url, faults=plan)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(lambda _: client.get("/anything", params={"q": "same"}), range(8)))
+
+    assert plan.count("/anything") == 1
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import uuid
+from typing import Dict, List
+
+import allure
+
+import pytest
+from pydantic import ValidationError
+
+from framework.models import HttpBinAnythingResponse, HttpBinUuidResponse, type_adapter, validate_json
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+
+_BODY = json.dumps(
+    {"json": {"a": 1}, "method": "POST", "origin": "127.0.0.1", "url": "http://x/anything", "headers": {}}
+).encode()
+
+
+@allure.story("Response parsing")
+@allure.title("QA Platform: validate_json on raw bytes matches model_validate(resp.json())")
+def test_validate_json_matches_legacy_path():
+    assert validate_json(HttpBinAnythingResponse, _BODY) == HttpBinAnythingResponse.model_validate(json.loads(_BODY))
+    assert validate_json(List[Dict[str, int]], b'[{"a": 1}]') == [{"a": 1}]
+    assert type_adapter(List[Dict[str, int]]) is type_adapter(List[Dict[str, int]])
+
+
+@allure.story("Response parsing")
+@allure.title("QA Platform: Trusted mode skips validation, strict mode rejects drift")
+def test_trusted_mode_skips_validation():
+    drifted = json.dumps({"uuid": str(uuid.uuid4()), "extra": True}).encode()
+    with pytest.raises(ValidationError):
+        validate_json(HttpBinUuidResponse, drifted)
+    parsed = validate_json(HttpBinUuidResponse, drifted, trusted=True)
+    assert isinstance(parsed.uuid, str)
+
+    for not_an_object in (b"[1, 2]", b'"uuid"', b"null"):
+        with pytest.raises(ValidationError, match="HttpBinUuidResponse"):
+            validate_json(HttpBinUuidResponse, not_an_object, trusted=True)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import subprocess
+import sys
+
+import allure
+
+import pytest
+
+from framework import data_gen
+from framework.config import load_config
+
+
+pytestmark = pytest.mark.regression
+
+
+allure.dynamic.suite("Regression")
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+@allure.story("Startup")
+@allure.title("QA Platform: load_config is memoised until the YAML or the environment changes")
+def test_load_config_memoised(tmp_path, monkeypatch):
+    monkeypatch.delenv("TIMEOUT_S", raising=False)
+    path = tmp_path / "config.yaml"
+    path.write_text("service:\n  timeout_s: 3\n", encoding="utf-8")
+
+    first = load_config(str(path), env_path=None)
+    assert load_config(str(path), env_path=None) is first
+    assert first.service.timeout_s == 3
+
+    path.write_text("service:\n  timeout_s: 4\n", encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))  # coarse filesystem clocks
+    edited = load_config(str(path), env_path=None)
+    assert edited.service.timeout_s == 4
+
+    monkeypatch.setenv("TIMEOUT_S", "9")
+    assert load_config(str(path), env_path=None).service.timeout_s == 9
+
+
+@allure.story("Startup")
+@allure.title("QA Platform: Optional dependencies are imported on first use only")
+def test_heavy_imports_are_lazy():
+    probe = (
+        "import sys, framework.http_client, framework.data_gen, tests.conftest; "
+        "print(','.join(m for m in ('faker', 'httpx', 'h2', 'zstandard', 'pika') if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+@pytest.fixture
+def session_faker(test_seed):
+    """Puts the session seed and the shared Faker's stream position back after a reseed."""
+    fake = data_gen.get_fake()
+    rng = fake.random
+    state = rng.getstate()
+    yield fake
+    data_gen.seed_fake(test_seed)
+    fake.random = rng
+    rng.setstate(state)
+
+
+@allure.story("Startup")
+@allure.title("QA Platform: The session seed reaches Faker whenever it is first created")
+def test_faker_seeded_lazily(session_faker):
+    data_gen.seed_fake(1234)
+    first = [data_gen.get_fake().name() for _ in range(3)]
+    data_gen.seed_fake(1234)
+    assert [data_gen.fake.name() for _ in range(3)] == first
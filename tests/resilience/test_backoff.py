@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import allure
+
+import pytest
+
+from framework.retry import RetryableHttpError, RetryBudget, RetryPolicy, VirtualClock, make_backoff
+
+
+pytestmark = pytest.mark.resilience
+
+
+allure.dynamic.suite("Resilience")
+
+
+def _always_503():
+    raise RetryableHttpError(503, "http://backoff.test/status/503")
+
+
+@allure.story("Resilience & retry policy")
+@allure.title("QA Platform: Backoff strategies stay within their windows")
+@pytest.mark.parametrize("strategy", ["exponential", "full_jitter", "decorrelated_jitter"])
+def test_backoff_strategy_bounds(strategy):
+    backoff = make_backoff(strategy, base_s=0.1, multiplier=2.0, retries=6, cap_s=1.0)
+    prev = 0.0
+    for retry in range(1, 7):
+        delay = backoff.delay(retry, prev)
+        assert 0.0 <= delay <= 1.0
+        if strategy == "exponential":
+            assert delay == min(0.1 * 2 ** (retry - 1), 1.0)
+        elif strategy == "full_jitter":
+            assert delay <= 0.1 * 2 ** (retry - 1)
+        else:
+            assert delay >= 0.1
+        prev = delay
+
+
+@allure.story("Resilience & retry policy")
+@allure.title("QA Platform: Per-call retry budget stops retrying early")
+def test_call_budget_stops_retrying():
+    calls = {"n": 0}
+
+    def fn():
+        calls["n"] += 1
+        _always_503()
+
+    policy = RetryPolicy.build(
+        attempts=5,
+        backoff_s=0.05,
+        backoff_multiplier=2.0,
+        max_call_retry_s=0.1,
+        budget=RetryBudget(),
+        clock=VirtualClock(),
+    )
+    with pytest.raises(RetryableHttpError):
+        policy.call(fn)
+    # 0.05 s fits the budget, 0.05 + 0.1 s does not.
+    assert calls["n"] == 2
+
+
+@allure.story("Resilience & retry policy")
+@allure.title("QA Platform: Session retry ratio caps retries across calls")
+def test_session_retry_ratio():
+    budget = RetryBudget()
+    policy = RetryPolicy.build(
+        attempts=3,
+        backoff_s=0.0,
+        backoff_multiplier=1.0,
+        session_retry_ratio=0.5,
+        session_min_retries=0,
+        budget=budget,
+    )
+    for _ in range(4):
+        with pytest.raises(RetryableHttpError):
+            policy.call(_always_503)
+    assert budget.calls == 4
+    assert budget.retries <= 0.5 * budget.calls + 1
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import dataclasses
+
+import allure
+
+import pytest
+
+from framework.cassette import CassetteMissError
+from framework.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, get_breaker
+from framework.clock import VirtualClock
+from framework.config import CassetteConfig, CircuitBreakerConfig
+from framework.http_client import HttpClient
+from framework.metrics import REGISTRY
+
+
+pytestmark = [pytest.mark.resilience, pytest.mark.usefixtures("scratch_metrics")]
+
+
+allure.dynamic.suite("Resilience")
+
+CFG = CircuitBreakerConfig(enabled=True, failure_rate_threshold=0.5, min_calls=4, window_size=4, open_duration_s=0.05)
+
+
+@allure.story("Resilience & circuit breaker")
+@allure.title("QA Platform: Circuit opens on failure rate and fails fast")
+def test_circuit_opens_and_fails_fast():
+    breaker = CircuitBreaker("breaker.test", "/status/{n}", CFG)
+    for ok in (True, False, True, False):
+        breaker.before_call()
+        breaker.record(ok)
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert REGISTRY.get_sample_value(
+        "http_circuit_state", {"host": "breaker.test", "endpoint": "/status/{n}"}
+    ) == 2
+
+
+@allure.story("Resilience & circuit breaker")
+@allure.title("QA Platform: Half-open probe closes or re-opens the circuit")
+def test_half_open_probe():
+    clock = VirtualClock()
+    breaker = CircuitBreaker("breaker.test", "/delay/{n}", CFG, clock)
+    for _ in range(4):
+        breaker.record(False)
+    assert breaker.state == OPEN
+
+    clock.advance(CFG.open_duration_s / 2)
+    with pytest.raises(CircuitOpenError) as err:
+        breaker.before_call()
+    assert err.value.retry_in_s == pytest.approx(CFG.open_duration_s / 2)
+
+    clock.advance(CFG.open_duration_s / 2)
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record(False)
+    assert breaker.state == OPEN
+
+    clock.advance(CFG.open_duration_s)
+    breaker.before_call()
+    breaker.record(True)
+    assert breaker.state == CLOSED
+
+
+@allure.story("Resilience & circuit breaker")
+@allure.title("QA Platform: A half-open probe that raises without an answer gives its slot back")
+def test_unanswered_probe_is_released(cfg, tmp_path):
+    breaker_cfg = dataclasses.replace(CFG, exclude_paths=())
+    clock = VirtualClock()
+    client = HttpClient(
+        service=dataclasses.replace(cfg.service, base_url="http://probe.breaker.test"),
+        retry_cfg=cfg.retry,
+        circuit_breaker=breaker_cfg,
+        cassette=CassetteConfig(mode="replay", dir=str(tmp_path)),  # empty: every request misses
+        clock=clock,
+    )
+    breaker = get_breaker("probe.breaker.test", "/delay/{n}", breaker_cfg, clock)
+    for _ in range(4):
+        breaker.record(False)
+    clock.advance(CFG.open_duration_s)
+
+    for _ in range(3):
+        with pytest.raises(CassetteMissError):
+            client.get("/delay/1")  # a probe each time, not CircuitOpenError from a leaked slot
+    assert breaker.state == HALF_OPEN
+
+    probe = breaker.before_call()
+    breaker.record(True)
+    breaker.release(probe)  # after record: must not touch the closed circuit
+    assert breaker.state == CLOSED
+
+
+@allure.story("Resilience & circuit breaker")
+@allure.title("QA Platform: Status-echo endpoints have no circuit breaker")
+def test_status_endpoint_excluded():
+    breaker_cfg = CircuitBreakerConfig(enabled=True)
+    assert get_breaker("breaker.test", "/status/{n}", breaker_cfg) is None
+    assert get_breaker("breaker.test", "/delay/{n}", breaker_cfg) is not None
+
+
+@allure.story("Resilience & circuit breaker")
+@allure.title("QA Platform: Clients share a breaker only with the same settings and clock")
+def test_breaker_shared_per_settings_and_clock():
+    host, endpoint = "shared.breaker.test", "/delay/{n}"
+    clock = VirtualClock()
+    breaker = get_breaker(host, endpoint, CFG, clock)
+
+    assert get_breaker(host, endpoint, dataclasses.replace(CFG, on_open="skip"), clock) is breaker
+    assert get_breaker(host, endpoint, dataclasses.replace(CFG, open_duration_s=60.0), clock) is not breaker
+    assert get_breaker(host, endpoint, dataclasses.replace(CFG, min_calls=10), clock) is not breaker
+    assert get_breaker(host, endpoint, CFG, VirtualClock()) is not breaker
+    assert get_breaker(host, endpoint, CFG).clock is not clock
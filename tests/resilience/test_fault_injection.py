@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import allure
+
+import pytest
+import requests
+
+from framework.config import RetryConfig, ServiceConfig
+from framework.fault_injection import Fault, FaultPlan
+from framework.http_client import HttpClient
+from framework.retry import RetryableHttpError, VirtualClock
+
+
+pytestmark = pytest.mark.resilience
+
+
+allure.dynamic.suite("Resilience")
+
+RETRY = RetryConfig(attempts=3, backoff_s=0.4, backoff_multiplier=2.0, retry_on_statuses=[429, 502, 503])
+
+
+def _client(plan: FaultPlan, clock: VirtualClock, retry_cfg: RetryConfig = RETRY, timeout_s: float = 2.0) -> HttpClient:
+    service = ServiceConfig(base_url="http://faults.test", timeout_s=timeout_s)
+    return HttpClient(service=service, retry_cfg=retry_cfg, faults=plan, clock=clock)
+
+
+@allure.story("Resilience & fault injection")
+@allure.title("QA Platform: Status sequence is retried until it recovers")
+def test_status_sequence_recovers():
+    plan = FaultPlan().statuses("/anything", 503, 502, then=200)
+    clock = VirtualClock()
+
+    r = _client(plan, clock).get("/anything")
+
+    assert r.status_code == 200
+    assert plan.count("/anything") == 3
+    assert clock.sleeps == [0.4, 0.8]
+
+
+@allure.story("Resilience & fault injection")
+@allure.title("QA Platform: Connection reset is retried as a transport error")
+def test_connection_reset_is_retried():
+    plan = FaultPlan().route("/uuid", Fault.reset(), then=Fault.respond(200, json_body={"uuid": "x"}))
+    plan.route("/headers", method="GET", then=Fault.reset())
+    clock = VirtualClock()
+    client = _client(plan, clock)
+
+    assert client.get("/uuid").json() == {"uuid": "x"}
+    assert plan.count("/uuid") == 2
+
+    with pytest.raises(requests.ConnectionError, match="reset"):
+        client.get("/headers")
+    assert plan.count("/headers", method="GET") == RETRY.attempts
+
+
+@allure.story("Resilience & fault injection")
+@allure.title("QA Platform: Injected Retry-After overrides a shorter backoff")
+def test_retry_after_is_honoured():
+    plan = FaultPlan().route("/status/429", Fault.respond(429, retry_after=7), then=Fault.respond(200))
+    clock = VirtualClock()
+
+    assert _client(plan, clock).get("/status/429").status_code == 200
+    assert clock.sleeps == [7.0]
+
+
+@allure.story("Resilience & fault injection")
+@allure.title("QA Platform: Injected latency counts against the per-call retry budget")
+def test_latency_counts_against_call_budget():
+    plan = FaultPlan().route("/anything", then=Fault.respond(503, latency_s=0.6))
+    clock = VirtualClock()
+    retry_cfg = RetryConfig(
+        attempts=5, backoff_s=0.4, backoff_multiplier=2.0, retry_on_statuses=[503], max_call_retry_s=1.0
+    )
+
+    with pytest.raises(RetryableHttpError):
+        _client(plan, clock, retry_cfg).get("/anything")
+
+    # 0.6 latency + 0.4 backoff fits 1 s; a second 0.6 + 0.8 does not.
+    assert plan.count("/anything") == 2
+    assert clock.now() == pytest.approx(1.6)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import allure
+
+import pytest
+
+from framework.clock import VirtualClock
+from framework.rate_limit import TokenBucket, parse_retry_after
+
+
+pytestmark = [pytest.mark.resilience, pytest.mark.usefixtures("scratch_metrics")]
+
+
+allure.dynamic.suite("Resilience")
+
+@allure.story("Resilience & rate limiting")
+@allure.title("QA Platform: Token bucket allows a burst, then paces callers")
+def test_token_bucket_paces_after_burst():
+    bucket = TokenBucket("limiter.test", rate_per_s=100, burst=5)
+    waits = [bucket.reserve() for _ in range(8)]
+    assert waits[:5] == [0.0] * 5
+    assert waits[5:] == sorted(waits[5:]) and waits[-1] == pytest.approx(0.03, abs=0.005)
+
+
+@allure.story("Resilience & rate limiting")
+@allure.title("QA Platform: 429 with Retry-After lowers the rate and blocks callers")
+def test_token_bucket_adapts_to_429_retry_after():
+    bucket = TokenBucket("limiter.test", rate_per_s=40, burst=10, min_rate_per_s=5)
+    bucket.on_response(429, retry_after="2")
+    assert bucket.rate == 20
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+    for _ in range(10):
+        bucket.on_response(429)
+    assert bucket.rate == 5, "Rate must not drop below min_rate_per_s"
+
+    for _ in range(200):
+        bucket.on_response(200)
+    assert bucket.rate == 40, "Rate recovers to the configured maximum on success"
+
+
+@allure.story("Resilience & rate limiting")
+@allure.title("QA Platform: Retry-After accepts seconds and HTTP dates")
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("inf") is None and parse_retry_after("nan") is None
+    assert parse_retry_after(None) is None
+
+
+@allure.story("Resilience & rate limiting")
+@allure.title("QA Platform: Retry-After blocks the host for at most max_retry_after_s")
+def test_retry_after_is_capped():
+    clock = VirtualClock()
+    bucket = TokenBucket("limiter.test", rate_per_s=10, burst=1, max_retry_after_s=5, clock=clock)
+    bucket.on_response(503, retry_after="86400")
+    bucket.on_response(429, retry_after="1e308")
+
+    assert bucket.acquire() == pytest.approx(5.0)
+    assert clock.sleeps == [pytest.approx(5.0)]
+    clock.advance(1.0)
+    assert bucket.acquire() == 0.0, "Pacing and blocking follow the injected clock"
@@ -4,6 +4,7 @@ import allure
 
 import pytest
 
+from framework.fault_injection import Fault
 from framework.retry import RetryableHttpError
 
 
@@ -14,55 +15,38 @@ allure.dynamic.suite("Resilience")
 
 @allure.story("Resilience & retry policy")
 @allure.title("QA Platform: Retry on 503 respects attempts")
-def test_retry_on_503_respects_attempts(client, cfg, monkeypatch):
-    calls = {"n": 0}
-    real = client.session.request
-
-    def spy(*args, **kwargs):
-        calls["n"] += 1
-        return real(*args, **kwargs)
-
-    monkeypatch.setattr(client.session, "request", spy)
+def test_retry_on_503_respects_attempts(faulty_client, fault_plan, virtual_clock, cfg):
+    fault_plan.route("/status/503", then=Fault.respond(503))
 
     with pytest.raises(RetryableHttpError):
         with allure.step("GET /status/503"):
-            client.get("/status/503")
+            faulty_client.get("/status/503")
 
-    assert calls["n"] == cfg.retry.attempts, "Should retry exactly configured attempts for retryable status"
+    assert fault_plan.count("/status/503") == cfg.retry.attempts, (
+        "Should retry exactly configured attempts for retryable status"
+    )
+    assert len(virtual_clock.sleeps) == cfg.retry.attempts - 1
 
 
 @allure.story("Resilience & retry policy")
 @allure.title("QA Platform: No retry on 404")
-def test_no_retry_on_404(client, monkeypatch):
-    calls = {"n": 0}
-    real = client.session.request
-
-    def spy(*args, **kwargs):
-        calls["n"] += 1
-        return real(*args, **kwargs)
-
-    monkeypatch.setattr(client.session, "request", spy)
+def test_no_retry_on_404(faulty_client, fault_plan, virtual_clock):
+    fault_plan.route("/status/404", then=Fault.respond(404))
 
     with allure.step("GET /status/404"):
-        r = client.get("/status/404")
+        r = faulty_client.get("/status/404")
     assert r.status_code == 404
-    assert calls["n"] == 1, "404 must not be retried"
+    assert fault_plan.count("/status/404") == 1, "404 must not be retried"
+    assert virtual_clock.sleeps == []
 
 
 @allure.story("Resilience & retry policy")
 @allure.title("QA Platform: Retry on 429 respects attempts")
-def test_retry_on_429_respects_attempts(client, cfg, monkeypatch):
-    calls = {"n": 0}
-    real = client.session.request
-
-    def spy(*args, **kwargs):
-        calls["n"] += 1
-        return real(*args, **kwargs)
-
-    monkeypatch.setattr(client.session, "request", spy)
+def test_retry_on_429_respects_attempts(faulty_client, fault_plan, cfg):
+    fault_plan.route("/status/429", then=Fault.respond(429))
 
     with pytest.raises(RetryableHttpError):
         with allure.step("GET /status/429"):
-            client.get("/status/429")
+            faulty_client.get("/status/429")
 
-    assert calls["n"] == cfg.retry.attempts
+    assert fault_plan.count("/status/429") == cfg.retry.attempts
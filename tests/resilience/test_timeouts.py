@@ -5,8 +5,10 @@ import allure
 import pytest
 import requests
 
+from framework.fault_injection import Fault, FaultPlan
 from framework.http_client import HttpClient
 from framework.config import ServiceConfig, RetryConfig
+from framework.retry import VirtualClock
 
 
 pytestmark = pytest.mark.resilience
@@ -16,7 +18,7 @@ allure.dynamic.suite("Resilience")
 
 @allure.story("Resilience & timeouts")
 @allure.title("QA Platform: Timeout is raised and retried")
-def test_timeout_is_raised_and_retried(monkeypatch, cfg):
+def test_timeout_is_raised_and_retried(cfg):
     """QA check: network exceptions (timeouts) are retried and finally surfaced."""
     service = ServiceConfig(base_url=cfg.service.base_url, timeout_s=0.5)
     retry_cfg = RetryConfig(
@@ -25,19 +27,14 @@ def test_timeout_is_raised_and_retried(monkeypatch, cfg):
         backoff_multiplier=1.0,
         retry_on_statuses=cfg.retry.retry_on_statuses,
     )
-    c = HttpClient(service=service, retry_cfg=retry_cfg)
-
-    calls = {"n": 0}
-    real = c.session.request
-
-    def spy(*args, **kwargs):
-        calls["n"] += 1
-        return real(*args, **kwargs)
-
-    monkeypatch.setattr(c.session, "request", spy)
+    # /delay/3 against a 0.5 s timeout, on a virtual clock: same exceptions, no waiting.
+    plan = FaultPlan().route("/delay/*", then=Fault.delay(3))
+    clock = VirtualClock()
+    c = HttpClient(service=service, retry_cfg=retry_cfg, faults=plan, clock=clock)
 
     with pytest.raises(requests.RequestException):
         with allure.step("GET /delay/3 (timeout)"):
             c.get("/delay/3")
 
-    assert calls["n"] == retry_cfg.attempts
+    assert plan.count("/delay/3") == retry_cfg.attempts
+    assert clock.sleeps == [0.5, 0.1, 0.5, 0.1, 0.5]